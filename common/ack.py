@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Cumulative acknowledgement between PMU and PDC.
+
+Instead of answering every data frame PDC sends one binary ACK per PMU every
+``every_frames`` frames or ``every_ms`` milliseconds. ACK is cumulative - it
+carries total number of frames received from IDCODE and timestamp of newest
+one, so lost ACKs are repaired by the next one.
+
+    +-------+---------+--------+-----+--------+-------+
+    | MAGIC | VERSION | IDCODE | SOC | FRASEC | COUNT |
+    |  1 B  |   1 B   |  2 B   | 4 B |  4 B   |  4 B  |
+    +-------+---------+--------+-----+--------+-------+
+
+PMU keeps frames sent but not covered by ACK in ``AckWindow``. It never waits
+for ACK - when window is full oldest frame expires and is accounted as
+unacknowledged.
+"""
+from collections import deque
+from struct import Struct
+from time import monotonic
+
+ACK_MAGIC = 0xAC
+ACK_VERSION = 1
+ACK_FORMAT = Struct("!BBHIII")  # MAGIC, VERSION, IDCODE, SOC, FRASEC, COUNT
+
+
+def encode_ack(pmu_id_code, soc, frasec, count):
+    """Pack cumulative ACK.
+    `pmu_id_code`   - IDCODE of acknowledged data stream
+    `soc`, `frasec` - timestamp of newest frame received
+    `count`         - total frames received from IDCODE
+    """
+    return ACK_FORMAT.pack(ACK_MAGIC, ACK_VERSION, pmu_id_code, soc, frasec & 0xffffffff, count & 0xffffffff)
+
+
+def decode_ack(byte_data):
+    """Unpack cumulative ACK, returns (pmu_id_code, soc, frasec, count) or None
+    if `byte_data` is not ACK (e.g. legacy text response).
+    """
+    if len(byte_data) != ACK_FORMAT.size or byte_data[0] != ACK_MAGIC:
+        return None
+
+    _, version, pmu_id_code, soc, frasec, count = ACK_FORMAT.unpack(byte_data)
+    if version != ACK_VERSION:
+        return None
+
+    return pmu_id_code, soc, frasec, count
+
+
+class CumulativeAck(object):
+    """PDC side - counts frames per IDCODE and decides when to acknowledge.
+    `every_frames`  - ACK after this many frames from IDCODE
+    `every_ms`      - or when this much time passed since last ACK of IDCODE
+    """
+
+    def __init__(self, every_frames=10, every_ms=100):
+        self.every_frames = every_frames
+        self.every_s = every_ms / 1000.0
+
+        # IDCODE -> [count, soc, frasec, unacked frames, last ack time, addr]
+        self._streams = {}
+
+    def on_frame(self, pmu_id_code, soc, frasec, addr, now=None):
+        """Account received frame, returns ACK bytes when it's due else None."""
+        now = monotonic() if now is None else now
+        stream = self._streams.get(pmu_id_code)
+
+        if stream is None:
+            stream = self._streams[pmu_id_code] = [0, soc, frasec, 0, now, addr]
+
+        stream[0] += 1
+        if (soc, frasec & 0xffffff) >= (stream[1], stream[2] & 0xffffff):  # Ignore time quality byte
+            stream[1] = soc
+            stream[2] = frasec
+        stream[3] += 1
+        stream[5] = addr
+
+        if stream[3] >= self.every_frames or now - stream[4] >= self.every_s:
+            return self._ack(pmu_id_code, stream, now)
+
+        return None
+
+    def _ack(self, pmu_id_code, stream, now):
+        stream[3] = 0
+        stream[4] = now
+        return encode_ack(pmu_id_code, stream[1], stream[2], stream[0])
+
+    def due(self, now=None):
+        """ACKs of streams with unacknowledged frames older than `every_ms`,
+        returns list of (addr, ACK bytes). Call periodically so last frames
+        before PMU goes silent are acknowledged too.
+        """
+        now = monotonic() if now is None else now
+
+        return [(stream[5], self._ack(pmu_id_code, stream, now)) for pmu_id_code, stream in self._streams.items()
+                if stream[3] and now - stream[4] >= self.every_s]
+
+    def get_count(self, pmu_id_code):
+        stream = self._streams.get(pmu_id_code)
+        return stream[0] if stream else 0
+
+
+class AckWindow(object):
+    """PMU side - window of frames in flight and delivery accounting.
+    `window`        - frames kept until ACK, oldest expires when full
+    """
+
+    def __init__(self, window=64):
+        self.window = window
+
+        self.sent = 0           # Frames sent
+        self.acked = 0          # Frames PDC confirmed (cumulative COUNT)
+        self.lost = 0           # Frames sent before newest ACKed one which PDC never counted
+        self.expired = 0        # Frames pushed out of full window before any ACK covered them
+        self.acks = 0           # ACKs received
+        self.rtt = None         # Round trip of last exactly matched frame in seconds
+
+        self._in_flight = deque()  # (soc, frasec, send time)
+        self._expired = deque()    # (soc, frasec) of expired frames which may still be covered by ACK
+        self._sent_through = 0     # Frames sent up to newest ACKed timestamp
+
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def on_send(self, soc, frasec, now=None):
+        """Account sent frame, never blocks."""
+        self.sent += 1
+        self._in_flight.append((soc, frasec & 0xffffff, monotonic() if now is None else now))
+
+        if len(self._in_flight) > self.window:
+            self._expired.append(self._in_flight.popleft()[:2])
+            self.expired += 1
+
+            # PDC is silent for long - stop remembering, frames count as sent before next ACK
+            if len(self._expired) > 16 * self.window:
+                self._expired.popleft()
+                self._sent_through += 1
+
+    def on_ack(self, ack, now=None, measure_rtt=True):
+        """Account received ACK (bytes or decoded tuple), returns False if it's not ACK.
+        `measure_rtt` - False for ACKs read long after they arrived (e.g. after drain sleep),
+                        their delivery is accounted but round trip is not
+        """
+        if not isinstance(ack, tuple):
+            ack = decode_ack(ack)
+            if ack is None:
+                return False
+
+        _, soc, frasec, count = ack
+        acked_time = (soc, frasec & 0xffffff)
+        now = monotonic() if now is None else now
+
+        # Release every frame up to acknowledged timestamp
+        while self._expired and self._expired[0] <= acked_time:
+            self._expired.popleft()
+            self._sent_through += 1
+
+        while self._in_flight and self._in_flight[0][:2] <= acked_time:
+            sent_soc, sent_frasec, send_time = self._in_flight.popleft()
+            self._sent_through += 1
+            if measure_rtt and (sent_soc, sent_frasec) == acked_time:
+                self.rtt = now - send_time
+
+        self.acks += 1
+        self.acked = max(self.acked, count)
+        self.lost = max(0, self._sent_through - self.acked)
+
+        return True
+
+    def get_stats(self):
+        return {
+            'sent': self.sent,
+            'acked': self.acked,
+            'lost': self.lost,
+            'expired': self.expired,
+            'in_flight': len(self._in_flight),
+            'acks': self.acks,
+            'rtt_ms': None if self.rtt is None else round(self.rtt * 1000, 3),
+        }
@@ -16,6 +16,10 @@ from utils import check_sudo
 from utils import run_cmd
 from utils import get_ifaces
 from utils import ptp_time_sync
+from sock_telemetry import SocketTelemetry
+
+#non-blocking flag for single recv call , 0 where not supported
+MSG_DONTWAIT = getattr(socket , 'MSG_DONTWAIT' , 0)
 #classes
 class base(object):
     def __init__(   self
@@ -326,6 +330,27 @@ class Pmu_Client( log_trans , ptp_syncer):
             self.logger_transaction.debug("msg , addr -> {} , {}".format(data_recvd,server_addr))
         return data_recvd
 
+    def poll_frm_PDC(self) -> list:
+        '''
+        returns list of all datagrams already queued , never blocks
+        '''
+        responses = []
+        #socket timeout would make recv wait even with MSG_DONTWAIT , poll in non-blocking mode
+        timeout = self.cl_sock.gettimeout()
+        self.cl_sock.settimeout(0.0)
+        try:
+            while True:
+                try:
+                    data_recvd , server_addr = self.cl_sock.recvfrom(self.BUFFER_SIZE)
+                except BlockingIOError:
+                    break
+                responses.append(data_recvd)
+        finally:
+            self.cl_sock.settimeout(timeout)
+        if (self.to_log_trans and responses):
+            self.logger_transaction.debug("polled msgs -> {}".format(len(responses)))
+        return responses
+
     def comm_debug(self):
         '''
         send recv in that order
@@ -342,6 +367,10 @@ class PDC_server(log_trans ,ptp_syncer):
                     ip_server_is_binding  : str   = '127.0.0.1' , 
                     port_opening          : int   = 12345       , 
                     buffer_size           : int   = 1024        ,
+                    max_batch             : int   = 64          ,
+                    rcvbuf                : int   = None        ,
+                    sndbuf                : int   = None        ,
+                    drop_telemetry        : bool  = False       ,
                     trans_logging_level   : str   = 'DEBUG'     ,
                     to_log_trans          : bool  = True        ,
                     ntp_server_sync       : bool  = True        , 
@@ -372,6 +401,14 @@ class PDC_server(log_trans ,ptp_syncer):
         self.ip_server_is_binding   = ip_server_is_binding
         self.port_opening           = port_opening
         self.buffer_size            = buffer_size
+        #preallocated buffer for recv_view
+        self._recv_buffer           = bytearray(buffer_size)
+        self._recv_view             = memoryview(self._recv_buffer)
+        #pool of preallocated buffers for recv_batch
+        self.max_batch              = max_batch
+        self._batch_buffer          = bytearray(buffer_size * max_batch)
+        self._batch_views           = [ memoryview(self._batch_buffer)[i * buffer_size : (i + 1) * buffer_size]
+                                        for i in range(max_batch) ]
        
         self.server_sock            = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
 
@@ -381,10 +418,15 @@ class PDC_server(log_trans ,ptp_syncer):
             self.logger_transaction.info( "server_sock bind error {}".format( (self.ip_server_is_binding,self.port_opening) ) )
             print("bind error " , str(err) )
             exit(-2)
+        #buffer sizing , kernel drop counters (SO_RXQ_OVFL needs recvmsg)
+        self.telemetry              = SocketTelemetry(self.server_sock , rcvbuf , sndbuf , rxq_ovfl=drop_telemetry)
+        self._ancbufsize            = self.telemetry.ancbufsize
         #logs
         self.logger_transaction.info( "ip_server_is_binding -> {}".format( self.ip_server_is_binding ) )
         self.logger_transaction.info( "port_opening -> {}".format( port_opening ) )
         self.logger_transaction.info( "buffer_size -> {}".format( buffer_size ) )
+        self.logger_transaction.info( "socket buffers -> rcvbuf {} sndbuf {} rxq_ovfl {}".format(
+                                        self.telemetry.rcvbuf , self.telemetry.sndbuf , self.telemetry.rxq_ovfl ) )
         self.logger_transaction.info( "server_sock bind -> {}".format( (self.ip_server_is_binding,self.port_opening) ) )
         self.logger_transaction.info( "begin time -> {}".format(time()))
 
@@ -394,23 +436,83 @@ class PDC_server(log_trans ,ptp_syncer):
         self.logger_transaction.info( "server_sock close -> {}".format( (self.ip_server_is_binding,self.port_opening) ) )
         self.server_sock.close()
 
+    def _recv_into(self , view , flags : int = 0):
+        '''
+            recvfrom_into , or recvmsg_into accounting SO_RXQ_OVFL drop counter
+        '''
+        if not self._ancbufsize:
+            return self.server_sock.recvfrom_into(view , 0 , flags)
+        nbytes , ancdata , _ , addr_of_client = self.server_sock.recvmsg_into([view] , self._ancbufsize , flags)
+        if ancdata:
+            self.telemetry.on_ancdata(ancdata)
+        return nbytes , addr_of_client
+
     def recv(self) -> bytes:
         ''' 
             returns data recvd in byes
         '''
-        data_recvd , addr_of_client = self.server_sock.recvfrom(self.buffer_size)
+        if self._ancbufsize:
+            nbytes , addr_of_client = self._recv_into(self._recv_buffer)
+            data_recvd = bytes(self._recv_view[:nbytes])
+        else:
+            data_recvd , addr_of_client = self.server_sock.recvfrom(self.buffer_size)
         
         self.addr_of_client = addr_of_client
         if(self.to_log_trans):
             self.logger_transaction.debug(' msg recv -> {} - {}'.format(data_recvd,addr_of_client) )
         return data_recvd , addr_of_client
 
+    def recv_view(self):
+        '''
+            returns memoryview over data recvd in preallocated buffer
+            view is valid only until next call
+        '''
+        nbytes , addr_of_client = self._recv_into(self._recv_buffer)
+
+        self.addr_of_client = addr_of_client
+        data_recvd = self._recv_view[:nbytes]
+        if(self.to_log_trans):
+            self.logger_transaction.debug(' msg recv -> {} - {}'.format(bytes(data_recvd),addr_of_client) )
+        return data_recvd , addr_of_client
+
+    def recv_batch(self):
+        '''
+            waits for first datagram then drains all queued datagrams without blocking
+            returns list of (memoryview , addr) , at most max_batch entries
+            views are valid only until next call
+        '''
+        views = self._batch_views
+        nbytes , addr_of_client = self._recv_into(views[0])
+        batch = [ (views[0][:nbytes] , addr_of_client) ]
+
+        for view in views[1:] if MSG_DONTWAIT else ():
+            try:
+                nbytes , addr_of_client = self._recv_into(view , MSG_DONTWAIT)
+            except BlockingIOError:
+                break
+            batch.append( (view[:nbytes] , addr_of_client) )
+
+        self.addr_of_client = addr_of_client
+        if(self.to_log_trans):
+            self.logger_transaction.debug(' batch recv -> {} msgs'.format(len(batch)) )
+        return batch
+
     def send_to( self , payload  : bytes  , pmu_IP = '127.0.0.1',  pmu_port : int = 12345 ):
         '''sends bytes type data'''
         self.server_sock.sendto(payload,(pmu_IP , pmu_port))
         if(self.to_log_trans):
             self.logger_transaction.debug(' msg send_to -> {}'.format(payload) )
 
+    def get_socket_stats(self) -> dict:
+        '''
+            socket buffer sizes , datagrams dropped by kernel before recv
+            (SO_RXQ_OVFL and /proc/net/udp , None where not available)
+        '''
+        stats = self.telemetry.get_stats()
+        if(self.to_log_trans):
+            self.logger_transaction.info(' socket stats -> {}'.format(stats) )
+        return stats
+
     def base_comm(self):
         #recv
         #send
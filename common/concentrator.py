@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Timestamp-aligned concentration of PMU data streams.
+
+Frames of member PMUs are placed into slots of the concentrator reporting
+grid by their (SOC, FRASEC). Slot is emitted as one multi-stream data frame
+when all members reported or ``wait_ms`` after its first frame arrived,
+whichever comes first. Slots are emitted strictly in time order.
+
+Member measurement blocks (STAT .. DIGITAL, between FRASEC and CHK) are
+copied into the slot as they arrived on the wire - nothing is decoded or
+re-encoded. Concentrated CFG-2 is built the same way from PMU blocks of
+member CFG-2 frames:
+
+    +--------+------+----------+---------+-----+---------+-----------+-----+
+    | SYNC.. | SOC  | FRASEC   | PMU 1   | ... | PMU n   | (CFG-2:   | CHK |
+    | IDCODE |      |          | block   |     | block   | DATA_RATE)|     |
+    +--------+------+----------+---------+-----+---------+-----------+-----+
+
+STAT of member in emitted frame:
+
+* as sent by PMU, ``0x0400`` (configuration change) is added for
+  ``cfg_change_sec`` after membership changed,
+* ``0x8000`` (data error: absent data inserted, do not use values) and
+  zeroed values when member frame did not arrive in time,
+* ``0x1000`` (sorted by arrival) on late frame emitted on its own when
+  ``late_policy`` is ``'emit'`` - all other members are absent in it.
+
+Slots live in a ring of ``max_slots`` preallocated frame buffers indexed by
+tick, so slot lookup is O(1) and memory is bounded. When a frame arrives
+``max_slots`` ahead of oldest open slot, oldest slots are emitted early.
+"""
+from struct import Struct, pack_into
+from time import monotonic
+
+from frame import COMMON_HEADER, CommonFrame, ConfigFrame2, FrameError, crc16xmodem
+
+STAT_ABSENT = 0x8000    # Data error 10 - absent data tags inserted
+STAT_ARRIVAL = 0x1000   # Data sorting by arrival
+STAT_CFG_CHANGE = 0x0400
+
+HEADER_FORMAT = Struct("!HII")          # IDCODE, SOC, FRASEC - from offset 4 of frame
+CFG_HEADER_FORMAT = Struct("!HHHIIIH")  # SYNC, FRAMESIZE, IDCODE, SOC, FRASEC, TIME_BASE, NUM_PMU
+MAX_FRAME_SIZE = 65535
+
+
+class Concentrator(object):
+    """PDC side - aligns data frames of member PMUs into multi-stream frames.
+    `pdc_id_code`       - IDCODE of concentrated stream
+    `data_rate`         - DATA_RATE of concentrated stream, frames off this grid are dropped
+    `wait_ms`           - how long slot waits for missing members after its first frame
+    `max_slots`         - slots open at once, bounds memory to max_slots concentrated frames
+    `late_policy`       - 'drop' frames of emitted slots or 'emit' them in frame of their own
+    `time_base`         - TIME_BASE of concentrated stream
+    `cfg_change_sec`    - how long STAT announces configuration change after membership change
+    """
+
+    def __init__(self, pdc_id_code=1, data_rate=30, wait_ms=100, max_slots=64, late_policy='drop',
+                 time_base=1000000, cfg_change_sec=60.0):
+        if late_policy not in ('drop', 'emit'):
+            raise ValueError("late_policy should be 'drop' or 'emit'")
+        if data_rate == 0:
+            raise ValueError("DATA_RATE must not be 0")
+
+        self.pdc_id_code = pdc_id_code
+        self.data_rate = data_rate
+        self.wait = wait_ms / 1000.0
+        self.max_slots = max_slots
+        self.late_policy = late_policy
+        self.time_base = time_base
+        self.cfg_change_sec = cfg_change_sec
+
+        # Grid point k is at k * num / den seconds
+        self._num, self._den = (1, data_rate) if data_rate > 0 else (-data_rate, 1)
+
+        # IDCODE -> member index, per member: [IDCODE, CFG-2 PMU block bytes, data block offset, data block
+        # size, absent block bytes, STAT offsets in data block, time base]
+        self._index = {}
+        self.members = []
+        self.cfg = None
+        self.config_bytes = None
+        self.frame_size = 0
+        self._changed_at = None
+
+        # Ring of slots: [tick, frame buffer, bitmask of members present, members present, first arrival]
+        self._slots = []
+        self._next = None       # Oldest tick not emitted yet
+        self._newest = None     # Newest tick seen
+        self._open = 0          # Slots holding frames
+
+        self.stats = {'frames': 0, 'emitted': 0, 'complete': 0, 'partial': 0, 'forced': 0, 'absent': 0,
+                      'late': 0, 'late_emitted': 0, 'duplicate': 0, 'off_grid': 0, 'not_member': 0,
+                      'size_mismatch': 0, 'rejected_members': 0}
+
+    def set_member(self, cfg, now=None):
+        """Add PMU with its CFG-2 or replace its configuration.
+        Open slots are emitted in old layout first and returned as list of frames.
+        Returns None if concentrated frame would exceed maximum frame size - PMU is not added.
+        """
+        if not isinstance(cfg, ConfigFrame2):
+            raise FrameError("CFG should describe current data stream (ConfigurationFrame2)")
+
+        # PMU blocks follow TIME_BASE and NUM_PMU, data blocks follow FRASEC
+        cfg_bytes = cfg.convert2bytes()
+        decoder = cfg.get_data_decoder()
+        header_size = COMMON_HEADER.size
+
+        member = [cfg.get_id_code(), bytes(cfg_bytes[header_size + 6:-4]), 0, decoder.size - header_size - 2,
+                  None, [offset - header_size for offset in decoder.stat_offsets], cfg.get_time_base()]
+
+        members = list(self.members)
+        index = self._index.get(member[0])
+        if index is None:
+            members.append(member)
+        else:
+            members[index] = member
+
+        frame_size = 16 + sum(m[3] for m in members)
+        config_size = CFG_HEADER_FORMAT.size + sum(len(m[1]) for m in members) + 4
+        if frame_size > MAX_FRAME_SIZE or config_size > MAX_FRAME_SIZE:
+            self.stats['rejected_members'] += 1
+            return None
+
+        flushed = self.flush()
+        self._layout(members, now)
+        return flushed
+
+    def _layout(self, members, now=None):
+        offset = COMMON_HEADER.size
+        for member in members:
+            member[2] = offset
+            absent = bytearray(member[3])
+            for stat_offset in member[5]:
+                pack_into("!H", absent, stat_offset, STAT_ABSENT)
+            member[4] = bytes(absent)
+            offset += member[3]
+
+        self.members = members
+        self._index = {member[0]: i for i, member in enumerate(members)}
+        self.frame_size = offset + 2
+
+        # Concentrated CFG-2 - PMU blocks of members between common header and DATA_RATE
+        num_pmu = sum(len(member[5]) for member in members)
+        body = b"".join(member[1] for member in members)
+        size = CFG_HEADER_FORMAT.size + len(body) + 4
+        config = bytearray(size)
+        sync = (0xaa << 8) | (CommonFrame.FRAME_TYPES["cfg2"] << 4) | 1
+        CFG_HEADER_FORMAT.pack_into(config, 0, sync, size, self.pdc_id_code, 0, 0, self.time_base, num_pmu)
+        config[CFG_HEADER_FORMAT.size:size - 4] = body
+        pack_into("!h", config, size - 4, self.data_rate)
+        pack_into("!H", config, size - 2, crc16xmodem(memoryview(config)[:-2], 0xffff))
+
+        self.config_bytes = bytes(config)
+        self.cfg = ConfigFrame2.convert2frame(self.config_bytes)
+
+        self._slots = [[None, bytearray(self.frame_size), 0, 0, 0.0] for _ in range(self.max_slots)]
+        self._changed_at = monotonic() if now is None else now
+
+        sync = (0xaa << 8) | (CommonFrame.FRAME_TYPES["data"] << 4) | 1
+        for slot in self._slots:
+            pack_into("!HHH", slot[1], 0, sync, self.frame_size, self.pdc_id_code)
+
+    def _tick(self, soc, frasec, time_base):
+        """Grid point of timestamp, None if it's not on grid (more than quarter of period off)."""
+        t = soc * time_base + (frasec & 0xffffff)
+        den = self._num * time_base
+        tick = (2 * t * self._den + den) // (2 * den)
+        if 4 * abs(t * self._den - tick * den) > den:
+            return None
+        return tick
+
+    def timestamp(self, tick):
+        """(SOC, FRASEC) of grid point `tick`."""
+        soc, remainder = divmod(tick * self._num, self._den)
+        return soc, (2 * remainder * self.time_base + self._den) // (2 * self._den)
+
+    def add(self, byte_data, now=None):
+        """Place member data frame (CRC already checked) into its slot.
+        Returns list of concentrated frames emitted because of it.
+        """
+        now = monotonic() if now is None else now
+        self.stats['frames'] += 1
+
+        pmu_id_code, soc, frasec = HEADER_FORMAT.unpack_from(byte_data, 4)
+        index = self._index.get(pmu_id_code)
+        if index is None:
+            self.stats['not_member'] += 1
+            return []
+
+        member = self.members[index]
+        if len(byte_data) != member[3] + 16:
+            self.stats['size_mismatch'] += 1
+            return []
+
+        tick = self._tick(soc, frasec, member[6])
+        if tick is None:
+            self.stats['off_grid'] += 1
+            return []
+
+        if self._next is None:
+            self._next = self._newest = tick
+
+        if tick < self._next:
+            self.stats['late'] += 1
+            if self.late_policy == 'emit':
+                return [self._emit_late(tick, member, byte_data)]
+            return []
+
+        emitted = []
+        if tick >= self._next + self.max_slots:
+            # Ring is full - emit oldest slots early, skip straight to new tick when none is open
+            while self._open and tick >= self._next + self.max_slots:
+                emitted.extend(self._drain(now, force=True))
+            if tick >= self._next + self.max_slots:
+                self._next = tick - self.max_slots + 1
+
+        slot = self._slots[tick % self.max_slots]
+        if slot[0] != tick:
+            slot[0], slot[2], slot[3], slot[4] = tick, 0, 0, now
+            self._open += 1
+        elif slot[2] >> index & 1:
+            self.stats['duplicate'] += 1
+            return emitted
+
+        offset = member[2]
+        slot[1][offset:offset + member[3]] = byte_data[14:-2]
+        slot[2] |= 1 << index
+        slot[3] += 1
+
+        if tick > self._newest:
+            self._newest = tick
+
+        if slot[3] == len(self.members) and tick == self._next:
+            emitted.extend(self._drain(now))
+
+        return emitted
+
+    def poll(self, now=None):
+        """Emit slots which are complete or waited long enough, returns list of frames."""
+        return self._drain(monotonic() if now is None else now) if self._open else []
+
+    def flush(self):
+        """Emit all open slots regardless of wait window."""
+        emitted = []
+        now = monotonic()
+        while self._open:
+            emitted.extend(self._drain(now, force=True))
+        return emitted
+
+    def _drain(self, now, force=False):
+        """Emit open slots from oldest while they are due, `force` emits at least oldest open slot."""
+        emitted = []
+        num_members = len(self.members)
+
+        while self._open:
+            slot = self._slots[self._next % self.max_slots]
+            if slot[0] != self._next:
+                # Nothing arrived for this grid point
+                self._next += 1
+                continue
+
+            if slot[3] == num_members:
+                self.stats['complete'] += 1
+            elif force:
+                self.stats['forced'] += 1
+            elif now - slot[4] >= self.wait:
+                self.stats['partial'] += 1
+            else:
+                break
+
+            emitted.append(self._emit(slot, now))
+            force = False
+
+        return emitted
+
+    def _emit(self, slot, now):
+        tick = slot[0]
+        buffer = slot[1]
+
+        if slot[3] != len(self.members):
+            present = slot[2]
+            for i, member in enumerate(self.members):
+                if not present >> i & 1:
+                    buffer[member[2]:member[2] + member[3]] = member[4]
+                    self.stats['absent'] += 1
+
+        frame = self._finish(buffer, tick, now)
+
+        slot[0] = None
+        self._open -= 1
+        self._next = tick + 1
+        self.stats['emitted'] += 1
+        return frame
+
+    def _emit_late(self, tick, member, byte_data):
+        buffer = bytearray(self._slots[0][1])
+        for other in self.members:
+            buffer[other[2]:other[2] + other[3]] = other[4]
+
+        offset = member[2]
+        buffer[offset:offset + member[3]] = byte_data[14:-2]
+        for stat_offset in member[5]:
+            stat_offset += offset
+            pack_into("!H", buffer, stat_offset, int.from_bytes(buffer[stat_offset:stat_offset + 2], "big") |
+                      STAT_ARRIVAL)
+
+        self.stats['late_emitted'] += 1
+        return self._finish(buffer, tick, None)
+
+    def _finish(self, buffer, tick, now):
+        soc, frasec = self.timestamp(tick)
+        pack_into("!II", buffer, 6, soc, frasec)
+
+        now = monotonic() if now is None else now
+        if now - self._changed_at < self.cfg_change_sec:
+            for member in self.members:
+                for stat_offset in member[5]:
+                    stat_offset += member[2]
+                    buffer[stat_offset] |= STAT_CFG_CHANGE >> 8
+
+        pack_into("!H", buffer, self.frame_size - 2, crc16xmodem(memoryview(buffer)[:-2], 0xffff))
+        return bytes(buffer)
+
+    def __len__(self):
+        """Slots open - waiting for members or wait window."""
+        return self._open
+
+    def get_stats(self):
+        return dict(self.stats, members=len(self.members), open_slots=self._open, frame_size=self.frame_size)
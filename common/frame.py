@@ -15,10 +15,16 @@ Data Transfer for Power Systems.
 #ri
 import collections.abc as collections
 from abc import ABCMeta, abstractmethod
-from struct import pack, unpack
+from binascii import crc_hqx
+from struct import pack, pack_into, unpack, unpack_from, calcsize, Struct
 from time import time
 from math import sqrt, atan2
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch decoding (DataFrame.convert2array)
+    np = None
+
 # table for calculating CRC
 # this particular table was generated using pycrc v0.7.6, http://www.tty1.net/pycrc/
 # using the configuration:
@@ -82,11 +88,71 @@ def _crc16(data, crc, table):
 
 def crc16xmodem(data, crc=0):
     """Calculate CRC-CCITT (XModem) variant of CRC16.
-    `data`      - data for calculating CRC, must be bytes
-    `crc`       - initial value
+    Uses C implementation from binascii (same polynomial and no reflection as
+    CRC16_XMODEM_TABLE), _crc16 is kept as reference implementation.
+    `data`      - data for calculating CRC, bytes-like object (bytes, bytearray, memoryview)
+    `crc`       - initial value, CRC of previous chunk when calculating incrementally
     Return calculated value of CRC
     """
-    return _crc16(data, crc, CRC16_XMODEM_TABLE)
+    return crc_hqx(data, crc)
+
+
+def check_crc_batch(frames, frame_size=None):
+    """Validate CHK word of many frames in one call.
+    `frames`     - list of frames, or single buffer with frames of `frame_size` bytes
+                   placed back to back
+    `frame_size` - size of each frame when `frames` is single buffer
+    Return list of bool, True for each frame with valid CHK
+    """
+    if frame_size is None:
+        return [len(frame) >= 2 and crc_hqx(memoryview(frame)[:-2], 0xffff) == ((frame[-2] << 8) | frame[-1])
+                for frame in frames]
+
+    if frame_size < 2:
+        raise FrameError("Frame size must include CHK word.")
+
+    view = memoryview(frames)
+    end = len(view) - len(view) % frame_size
+
+    return [crc_hqx(view[start:start + frame_size - 2], 0xffff) ==
+            ((view[start + frame_size - 2] << 8) | view[start + frame_size - 1])
+            for start in range(0, end, frame_size)]
+
+
+class Crc16Xmodem(object):
+    """Incremental CRC-CCITT (XModem) for frames received in chunks.
+    Feed chunks with update() as they arrive, CRC is never recalculated from
+    the beginning of frame.
+    `crc`       - initial value, 0xffff for IEEE C37.118 frames
+    """
+
+    def __init__(self, crc=0xffff):
+        self._init = crc
+        self.crc = crc
+
+    def update(self, data):
+        """Add next chunk of frame.
+        `data`      - bytes-like object
+        Return CRC of all data added so far
+        """
+        self.crc = crc_hqx(data, self.crc)
+        return self.crc
+
+    def reset(self):
+        self.crc = self._init
+
+    def check(self, chk):
+        """Compare CRC of data added so far with received CHK word.
+        `chk`       - CHK word as int or 2 bytes
+        Return True if CRC matches
+        """
+        if not isinstance(chk, int):
+            chk = (chk[0] << 8) | chk[1]
+        return self.crc == chk
+
+
+# SYNC, FRAMESIZE, IDCODE, SOC and FRASEC words common to all frame types
+COMMON_HEADER = Struct("!HHHII")
 
 
 def list2bytes(int_list, byte_size):
@@ -137,6 +203,9 @@ class CommonFrame(metaclass=ABCMeta):
     When it's not possible to create valid frame, usually due invalid parameter value.
     """
 
+    # Frames are created for each received datagram, slots keep them small
+    __slots__ = ("_frame_type", "_version", "_pmu_id_code", "_soc", "_frasec", "_data_format", "_data_decoder")
+
     FRAME_TYPES = { "data": 0, "header": 1, "cfg1": 2, "cfg2": 3, "cfg3": 5, "cmd": 4 }
 
     # Invert FRAME_TYPES codes to get FRAME_TYPE_WORDS
@@ -215,16 +284,16 @@ class CommonFrame(metaclass=ABCMeta):
         return CommonFrame.FRAME_TYPES_WORDS[self._frame_type]
 
 
-    def extract_frame_type(byte_data):
+    def extract_frame_type(byte_data, offset=0):
         """This method will only return type of the frame. It shall be used for stream splitter
         since there is no need to create instance of specific frame which will cause lower performance."""
 
         # Check if frame is valid
-        if not CommandFrame._check_crc(byte_data):
+        if not CommandFrame._check_crc(byte_data, offset, CommonFrame._get_frame_size(byte_data, offset)):
             raise FrameError("CRC failed. Frame not valid.")
 
         # Get second byte and determine frame type by shifting right to get higher 4 bits
-        frame_type = int.from_bytes([byte_data[1]], byteorder="big", signed=False) >> 4
+        frame_type = byte_data[offset + 1] >> 4
 
         return CommonFrame.FRAME_TYPES_WORDS[frame_type]
 
@@ -605,6 +674,8 @@ class CommonFrame(metaclass=ABCMeta):
                     raise FrameError("Format Type out of range. 0 <= FORMAT <= 15")
                 self._data_format = data_format
 
+        self._data_decoder = None  # Data frame layout depends on data format
+
 
     def get_data_format(self):
 
@@ -673,14 +744,61 @@ class CommonFrame(metaclass=ABCMeta):
 
 
     @staticmethod
-    def _check_crc(byte_data):
+    def _get_frame_size(byte_data, offset=0):
+        """
+        ### get_frame_size() ###
+
+        Read FRAMESIZE word of frame starting at ``offset``.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding frame.
+        * ``offset`` **(int)** - Position of SYNC word. Default value: ``0``.
+
+        **Returns:**
+
+        * ``int`` frame size in bytes or ``0`` if buffer is too short to hold header.
+
+        """
+
+        if len(byte_data) - offset < 4:
+            return 0
+
+        return unpack_from("!H", byte_data, offset + 2)[0]
+
+
+    @staticmethod
+    def _check_crc(byte_data, offset=0, frame_size=None):
+        """
+        ### check_crc() ###
+
+        Check CHK word of frame starting at ``offset``. CRC is calculated in place,
+        frame is never copied out of ``byte_data``.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding frame.
+        * ``offset`` **(int)** - Position of SYNC word. Default value: ``0``.
+        * ``frame_size`` **(int)** - Size of frame. If not provided frame spans to the
+          end of ``byte_data``.
+
+        **Returns:**
+
+        * ``bool`` ``True`` if CRC is valid.
+
+        """
 
-        crc_calculated = crc16xmodem(byte_data[0:-2], 0xffff).to_bytes(2, "big")  # Calculate CRC
+        if frame_size is None:
+            frame_size = len(byte_data) - offset
 
-        if byte_data[-2:] != crc_calculated:
+        chk_start = offset + frame_size - 2
+
+        if frame_size < 2 or chk_start + 2 > len(byte_data):
             return False
 
-        return True
+        crc_calculated = crc16xmodem(memoryview(byte_data)[offset:chk_start], 0xffff)  # Calculate CRC
+
+        return crc_calculated == unpack_from("!H", byte_data, chk_start)[0]
 
 
     @abstractmethod
@@ -715,7 +833,7 @@ class CommonFrame(metaclass=ABCMeta):
 
 
     @abstractmethod
-    def convert2frame(byte_data, cfg=None):
+    def convert2frame(byte_data, cfg=None, offset=0):
 
         convert_method = {
             0: DataFrame.convert2frame,
@@ -726,16 +844,17 @@ class CommonFrame(metaclass=ABCMeta):
             5: ConfigFrame3.convert2frame,
         }
 
-        if not CommonFrame._check_crc(byte_data):
+        if not CommonFrame._check_crc(byte_data, offset, CommonFrame._get_frame_size(byte_data, offset)):
             raise FrameError("CRC failed. Frame not valid.")
 
         # Get second byte and determine frame type by shifting right to get higher 4 bits
-        frame_type = int.from_bytes([byte_data[1]], byteorder="big", signed=False) >> 4
+        frame_type = byte_data[offset + 1] >> 4
 
+        # CRC is already checked, specific frame decoder should not check it again
         if frame_type == 0:  # DataFrame pass Configuration to decode message
-            return convert_method[frame_type](byte_data, cfg)
+            return convert_method[frame_type](byte_data, cfg, offset, False)
 
-        return convert_method[frame_type](byte_data)
+        return convert_method[frame_type](byte_data, offset, False)
 
 
 class ConfigFrame1(CommonFrame):
@@ -787,6 +906,10 @@ class ConfigFrame1(CommonFrame):
     When it's not possible to create valid frame, usually due invalid parameter value.
     """
 
+    __slots__ = ("_time_base", "_num_pmu", "_multistreaming", "_station_name", "_id_code", "_phasor_num",
+                 "_analog_num", "_digital_num", "_channel_names", "_ph_units", "_an_units", "_dig_units", "_f_nom",
+                 "_cfg_count", "_data_rate")
+
     def __init__(self, pmu_id_code, time_base, num_pmu, station_name, id_code, data_format, phasor_num, analog_num,
                  digital_num, channel_names, ph_units, an_units, dig_units, f_nom, cfg_count, data_rate,
                  soc=None, frasec=None, version=1):
@@ -868,6 +991,7 @@ class ConfigFrame1(CommonFrame):
         else:
             self._num_pmu = num_pmu
             self._multistreaming = True if num_pmu > 1 else False
+            self._data_decoder = None
 
 
     def get_num_pmu(self):
@@ -990,6 +1114,7 @@ class ConfigFrame1(CommonFrame):
                 raise FrameError("Number of phasors out of range. 0 <= PHNMR <= 65535")
 
         self._phasor_num = phasor_num
+        self._data_decoder = None
 
 
     def get_phasor_num(self):
@@ -1031,6 +1156,7 @@ class ConfigFrame1(CommonFrame):
                 raise FrameError("Number of phasors out of range. 0 <= ANNMR <= 65535")
 
         self._analog_num = analog_num
+        self._data_decoder = None
 
 
     def get_analog_num(self):
@@ -1071,6 +1197,7 @@ class ConfigFrame1(CommonFrame):
                 raise FrameError("Number of phasors out of range. 0 <= DGNMR <= 65535")
 
         self._digital_num = digital_num
+        self._data_decoder = None
 
 
     def get_digital_num(self):
@@ -1622,6 +1749,36 @@ class ConfigFrame1(CommonFrame):
         return self._data_rate
 
 
+    def get_data_decoder(self):
+        """
+        ### get_data_decoder() ###
+
+        Getter for compiled data frame decoder. Decoder is built on first call and
+        cached until number of PMUs, data format or number of phasors, analogs or
+        digitals changes.
+
+        **Returns:**
+
+        * ``DataFrameDecoder`` for data frames described by this configuration.
+
+        """
+
+        if self._data_decoder is None:
+            self._data_decoder = DataFrameDecoder(self)
+
+        return self._data_decoder
+
+
+    def __getstate__(self):
+
+        # Compiled decoder holds Struct objects which cannot be pickled, it's rebuilt on demand
+        state = { name: getattr(self, name) for cls in type(self).__mro__ for name in getattr(cls, "__slots__", ())
+                  if hasattr(self, name) }
+        state["_data_decoder"] = None
+
+        return None, state
+
+
     def convert2bytes(self):
 
         if not self._multistreaming:
@@ -1655,23 +1812,24 @@ class ConfigFrame1(CommonFrame):
 
 
     @staticmethod
-    def convert2frame(byte_data):
+    def convert2frame(byte_data, offset=0, check_crc=True):
 
         try:
 
-            if not CommonFrame._check_crc(byte_data):
+            _, frame_size, pmu_code, soc, frasec_int = COMMON_HEADER.unpack_from(byte_data, offset)
+
+            if check_crc and not CommonFrame._check_crc(byte_data, offset, frame_size):
                 raise FrameError("CRC failed. Configuration frame not valid.")
 
-            pmu_code = int.from_bytes(byte_data[4:6], byteorder="big", signed=False)
-            soc = int.from_bytes(byte_data[6:10], byteorder="big", signed=False)
-            frasec = CommonFrame._int2frasec(int.from_bytes(byte_data[10:14], byteorder="big", signed=False))
+            frasec = CommonFrame._int2frasec(frasec_int)
 
-            time_base_int = int.from_bytes(byte_data[14:18], byteorder="big", signed=False)
+            time_base_int, num_pmu = unpack_from("!IH", byte_data, offset + 14)
             time_base = time_base_int & 0x00ffffff  # take only first 24 LSB bits
 
-            num_pmu = int.from_bytes(byte_data[18:20], byteorder="big", signed=False)
+            # Names are decoded directly from buffer without slicing bytes out of it
+            view = memoryview(byte_data)
 
-            start_byte = 20
+            start_byte = offset + 20
 
             if num_pmu > 1:  # Loop through configurations for each
 
@@ -1680,115 +1838,75 @@ class ConfigFrame1(CommonFrame):
 
                 for i in range(num_pmu):
 
-                    station_name.append(byte_data[start_byte:start_byte+16].decode("ascii"))
+                    station_name.append(str(view[start_byte:start_byte+16], "ascii"))
                     start_byte += 16
 
-                    id_code.append(int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False))
-                    start_byte += 2
-
-                    data_format.append(int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                                       & 0x000f)
-                    start_byte += 2
+                    stream_id, data_format_int, phnmr, annmr, dgnmr = unpack_from("!5H", byte_data, start_byte)
+                    start_byte += 10
 
-                    phasor_num.append(int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False))
-                    start_byte += 2
-
-                    analog_num.append(int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False))
-                    start_byte += 2
-
-                    digital_num.append(int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False))
-                    start_byte += 2
+                    id_code.append(stream_id)
+                    data_format.append(data_format_int & 0x000f)
+                    phasor_num.append(phnmr)
+                    analog_num.append(annmr)
+                    digital_num.append(dgnmr)
 
                     stream_channel_names = []
-                    for _ in range(phasor_num[i] + analog_num[i] + 16*digital_num[i]):
-                        stream_channel_names.append(byte_data[start_byte:start_byte+16].decode("ascii"))
+                    for _ in range(phnmr + annmr + 16*dgnmr):
+                        stream_channel_names.append(str(view[start_byte:start_byte+16], "ascii"))
                         start_byte += 16
 
                     channel_names.append(stream_channel_names)
 
-                    stream_ph_units = []
-                    for _ in range(phasor_num[i]):
-                        ph_unit = int.from_bytes(byte_data[start_byte:start_byte+4], byteorder="big", signed=False)
-                        stream_ph_units.append(ConfigFrame1._int2phunit(ph_unit))
-                        start_byte += 4
-
-                    ph_units.append(stream_ph_units)
-
-                    stream_an_units = []
-                    for _ in range(analog_num[i]):
-                        an_unit = int.from_bytes(byte_data[start_byte:start_byte+4], byteorder="big", signed=True)
-                        stream_an_units.append(ConfigFrame1._int2anunit(an_unit))
-                        start_byte += 4
+                    ph_units.append([ConfigFrame1._int2phunit(ph_unit)
+                                     for ph_unit in unpack_from("!{}I".format(phnmr), byte_data, start_byte)])
+                    start_byte += 4*phnmr
 
-                    an_units.append(stream_an_units)
+                    an_units.append([ConfigFrame1._int2anunit(an_unit)
+                                     for an_unit in unpack_from("!{}i".format(annmr), byte_data, start_byte)])
+                    start_byte += 4*annmr
 
-                    stream_dig_units = []
-                    for _ in range(digital_num[i]):
-                        stream_dig_units.append(ConfigFrame1._int2digunit(
-                                int.from_bytes(byte_data[start_byte:start_byte+4], byteorder="big", signed=False)))
-                        start_byte += 4
+                    dig_units.append([ConfigFrame1._int2digunit(dig_unit)
+                                      for dig_unit in unpack_from("!{}I".format(dgnmr), byte_data, start_byte)])
+                    start_byte += 4*dgnmr
 
-                    dig_units.append(stream_dig_units)
-
-                    fnom.append(ConfigFrame1._int2fnom(int.from_bytes(byte_data[start_byte:start_byte + 2],
-                                                                      byteorder="big", signed=False)))
-                    start_byte += 2
+                    fnom_int, cfgcnt = unpack_from("!HH", byte_data, start_byte)
+                    start_byte += 4
 
-                    cfg_count.append(int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False))
-                    start_byte += 2
+                    fnom.append(ConfigFrame1._int2fnom(fnom_int))
+                    cfg_count.append(cfgcnt)
 
             else:
 
-                station_name = byte_data[start_byte:start_byte+16].decode("ascii")
+                station_name = str(view[start_byte:start_byte+16], "ascii")
                 start_byte += 16
 
-                id_code = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                start_byte += 2
-
-                data_format_int = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
+                id_code, data_format_int, phasor_num, analog_num, digital_num = unpack_from("!5H", byte_data,
+                                                                                            start_byte)
                 data_format = data_format_int & 0x000f  # Take only first 4 LSB bits
-                start_byte += 2
-
-                phasor_num = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                start_byte += 2
-
-                analog_num = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                start_byte += 2
-
-                digital_num = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                start_byte += 2
+                start_byte += 10
 
                 channel_names = []
                 for _ in range(phasor_num + analog_num + 16*digital_num):
-                    channel_names.append(byte_data[start_byte:start_byte+16].decode("ascii"))
+                    channel_names.append(str(view[start_byte:start_byte+16], "ascii"))
                     start_byte += 16
 
-                ph_units = []
-                for _ in range(phasor_num):
-                    ph_unit_int = int.from_bytes(byte_data[start_byte:start_byte+4], byteorder="big", signed=False)
-                    ph_units.append(ConfigFrame1._int2phunit(ph_unit_int))
-                    start_byte += 4
-
-                an_units = []
-                for _ in range(analog_num):
-                    an_unit = int.from_bytes(byte_data[start_byte:start_byte+4], byteorder="big", signed=False)
-                    an_units.append(ConfigFrame1._int2anunit(an_unit))
-                    start_byte += 4
+                ph_units = [ConfigFrame1._int2phunit(ph_unit)
+                            for ph_unit in unpack_from("!{}I".format(phasor_num), byte_data, start_byte)]
+                start_byte += 4*phasor_num
 
-                dig_units = []
-                for _ in range(digital_num):
-                    dig_units.append(ConfigFrame1._int2digunit(
-                                int.from_bytes(byte_data[start_byte:start_byte+4], byteorder="big", signed=False)))
-                    start_byte += 4
+                an_units = [ConfigFrame1._int2anunit(an_unit)
+                            for an_unit in unpack_from("!{}I".format(analog_num), byte_data, start_byte)]
+                start_byte += 4*analog_num
 
-                fnom = ConfigFrame1._int2fnom(int.from_bytes(byte_data[start_byte:start_byte + 2],
-                                                             byteorder="big", signed=False))
-                start_byte += 2
+                dig_units = [ConfigFrame1._int2digunit(dig_unit)
+                             for dig_unit in unpack_from("!{}I".format(digital_num), byte_data, start_byte)]
+                start_byte += 4*digital_num
 
-                cfg_count = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                start_byte += 2
+                fnom_int, cfg_count = unpack_from("!HH", byte_data, start_byte)
+                fnom = ConfigFrame1._int2fnom(fnom_int)
+                start_byte += 4
 
-            data_rate = int.from_bytes(byte_data[-4:-2], byteorder="big", signed=True)
+            data_rate = unpack_from("!h", byte_data, offset + frame_size - 4)[0]
 
             return ConfigFrame1(pmu_code, time_base, num_pmu, station_name, id_code, data_format, phasor_num,
                                 analog_num, digital_num, channel_names, ph_units, an_units, dig_units, fnom, cfg_count,
@@ -1846,6 +1964,8 @@ class ConfigFrame2(ConfigFrame1):
     When it's not possible to create valid frame, usually due invalid parameter value.
     """
 
+    __slots__ = ()
+
     def __init__(self, pmu_id_code, time_base, num_pmu, station_name, id_code, data_format, phasor_num, analog_num,
                  digital_num, channel_names, ph_units, an_units, dig_units, f_nom, cfg_count, data_rate,
                  soc=None, frasec=None, version=1):
@@ -1857,9 +1977,9 @@ class ConfigFrame2(ConfigFrame1):
 
 
     @staticmethod
-    def convert2frame(byte_data):
+    def convert2frame(byte_data, offset=0, check_crc=True):
 
-        cfg = ConfigFrame1.convert2frame(byte_data)
+        cfg = ConfigFrame1.convert2frame(byte_data, offset, check_crc)
         cfg.set_frame_type("cfg2")
         cfg.__class__ = ConfigFrame2  # Casting to derived class
 
@@ -1912,11 +2032,14 @@ class ConfigFrame3(CommonFrame):
         FrameError
     When it's not possible to create valid frame, usually due invalid parameter value.
     """
-    pass  # TODO: Implement Configuration Frame v3
+
+    __slots__ = ()  # TODO: Implement Configuration Frame v3
 
 
 class DataFrame(CommonFrame):
 
+    __slots__ = ("_stat", "_phasors", "_freq", "_dfreq", "_analog", "_digital", "cfg")
+
     MEASUREMENT_STATUS = { "ok": 0, "error": 1, "test": 2, "verror": 3 }
     MEASUREMENT_STATUS_WORDS = { code: word for word, code in MEASUREMENT_STATUS.items() }
 
@@ -2003,7 +2126,7 @@ class DataFrame(CommonFrame):
         if isinstance(trigger_reason, str):
             trigger_reason = DataFrame.TRIGGER_REASON[trigger_reason]
 
-        stat = measurement_status << 2
+        stat = measurement_status << 1  # Bits 15-14, sync is bit 13
         if not sync:
             stat |= 1
 
@@ -2038,8 +2161,8 @@ class DataFrame(CommonFrame):
     @staticmethod
     def _int2stat(stat):
 
-        measurement_status = DataFrame.MEASUREMENT_STATUS_WORDS[stat >> 15]
-        sync = bool(stat & 0x2000)
+        measurement_status = DataFrame.MEASUREMENT_STATUS_WORDS[(stat >> 14) & 0x3]  # Bits 15-14
+        sync = not stat & 0x2000  # Bit 13 is set when PMU is NOT in sync (see _stat2int)
 
         if stat & 0x1000:
             sorting = "arrival"
@@ -2050,8 +2173,8 @@ class DataFrame(CommonFrame):
         cfg_change = bool(stat & 0x400)
         modified = bool(stat & 0x200)
 
-        time_quality = DataFrame.TIME_QUALITY_WORDS[stat & 0x1c0]
-        unlocked = DataFrame.UNLOCKED_TIME_WORDS[stat & 0x30]
+        time_quality = DataFrame.TIME_QUALITY_WORDS[(stat >> 6) & 0x7]
+        unlocked = DataFrame.UNLOCKED_TIME_WORDS[(stat >> 4) & 0x3]
         trigger_reason = DataFrame.TRIGGER_REASON_WORDS[stat & 0xf]
 
         return measurement_status, sync, sorting, trigger, cfg_change, modified, time_quality, unlocked, trigger_reason
@@ -2499,253 +2622,1417 @@ class DataFrame(CommonFrame):
 
 
     @staticmethod
-    def convert2frame(byte_data, cfg):
+    def convert2frame(byte_data, cfg, offset=0, check_crc=True):
 
         try:
 
-            if not CommonFrame._check_crc(byte_data):
-                raise FrameError("CRC failed. Configuration frame not valid.")
+            # Layout of data frame is fixed by configuration so decoding plan is compiled
+            # once per ConfigFrame2 and whole frame is unpacked with single call.
+            return cfg.get_data_decoder().decode(byte_data, offset, check_crc)
+
+        except Exception as error:
+            raise FrameError("Error while creating Data frame: " + str(error))
+
 
-            num_pmu = cfg.get_num_pmu()
-            data_format = cfg.get_data_format()
-            phasor_num = cfg.get_phasor_num()
-            analog_num = cfg.get_analog_num()
-            digital_num = cfg.get_digital_num()
+    @staticmethod
+    def convert2array(frames, cfg):
+        """
+        ### convert2array() ###
 
-            pmu_code = int.from_bytes(byte_data[4:6], byteorder="big", signed=False)
-            soc = int.from_bytes(byte_data[6:10], byteorder="big", signed=False)
-            frasec = CommonFrame._int2frasec(int.from_bytes(byte_data[10:14], byteorder="big", signed=False))
+        Batch version of ``convert2frame()``. Decodes list of data frames or buffer
+        with concatenated data frames straight to NumPy structured array without
+        creating ``DataFrame`` for each frame. See ``DataFrameDecoder.decode_batch()``.
 
-            start_byte = 14
+        **Returns:**
 
-            if num_pmu > 1:
+        * ``tuple`` ``(records, crc_valid)``.
 
-                stat, phasors, freq, dfreq, analog, digital = [[] for _ in range(6)]
+        """
 
-                for i in range(num_pmu):
+        return cfg.get_data_decoder().decode_batch(frames)
 
-                    st = DataFrame._int2stat(int.from_bytes(byte_data[start_byte:start_byte+2],
-                                                            byteorder="big", signed=False))
-                    stat.append(st)
-                    start_byte += 2
-
-                    phasor_size = 8 if data_format[i][1] else 4
-                    stream_phasors = []
-                    for _ in range(phasor_num[i]):
-                        phasor = DataFrame._int2phasor(int.from_bytes(byte_data[start_byte:start_byte+phasor_size],
-                                                                      byteorder="big", signed=False), data_format[i])
-                        stream_phasors.append(phasor)
-                        start_byte += phasor_size
-                    phasors.append(stream_phasors)
-
-                    freq_size = 4 if data_format[i][3] else 2
-                    stream_freq = DataFrame._int2freq(int.from_bytes(byte_data[start_byte:start_byte+freq_size],
-                                                                     byteorder="big", signed=False), data_format[i])
-                    start_byte += freq_size
-                    freq.append(stream_freq)
-
-                    stream_dfreq = DataFrame._int2dfreq(int.from_bytes(byte_data[start_byte:start_byte+freq_size],
-                                                                       byteorder="big", signed=False), data_format[i])
-                    start_byte += freq_size
-                    dfreq.append(stream_dfreq)
-
-                    analog_size = 4 if data_format[i][2] else 2
-                    stream_analog = []
-                    for _ in range(analog_num[i]):
-                        an = DataFrame._int2analog(int.from_bytes(byte_data[start_byte:start_byte+analog_size],
-                                                                  byteorder="big", signed=False), data_format[i])
-                        stream_analog.append(an)
-                        start_byte += analog_size
-                    analog.append(stream_analog)
-
-                    stream_digital = []
-                    for _ in range(digital_num[i]):
-                        dig = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                        stream_digital.append(dig)
-                        start_byte += 2
-                    digital.append(stream_digital)
-            else:
 
-                stat = DataFrame._int2stat(int.from_bytes(byte_data[start_byte:start_byte+2],
-                                                          byteorder="big", signed=False))
-                start_byte += 2
-
-                phasor_size = 8 if data_format[1] else 4
-                phasors = []
-                for _ in range(phasor_num):
-                    phasor = DataFrame._int2phasor(int.from_bytes(byte_data[start_byte:start_byte+phasor_size],
-                                                                  byteorder="big", signed=False), data_format)
-                    phasors.append(phasor)
-                    start_byte += phasor_size
-
-                freq_size = 4 if data_format[3] else 2
-                freq = DataFrame._int2freq(int.from_bytes(byte_data[start_byte:start_byte+freq_size],
-                                                          byteorder="big", signed=False), data_format)
-                start_byte += freq_size
-
-                dfreq = DataFrame._int2dfreq(int.from_bytes(byte_data[start_byte:start_byte+freq_size], byteorder="big",
-                                                            signed=False), data_format)
-                start_byte += freq_size
-
-                analog_size = 4 if data_format[2] else 2
-                analog = []
-                for _ in range(analog_num):
-                    an = DataFrame._int2analog(int.from_bytes(byte_data[start_byte:start_byte+analog_size],
-                                                                  byteorder="big", signed=False), data_format)
-                    analog.append(an)
-                    start_byte += analog_size
-
-                digital = []
-                for _ in range(digital_num):
-                    dig = int.from_bytes(byte_data[start_byte:start_byte+2], byteorder="big", signed=False)
-                    digital.append(dig)
-                    start_byte += 2
-
-            return DataFrame(pmu_code, stat, phasors, freq, dfreq, analog, digital, cfg, soc, frasec)
+class LazyDataFrame(DataFrame):
+    """
+    ## LazyDataFrame ##
+
+    LazyDataFrame is ``DataFrame`` which decodes only IDCODE, SOC, FRASEC and
+    STAT words when it is created. That is enough for routing, time alignment
+    and quality filtering. Phasors, FREQ, DFREQ, analogs and digitals are
+    decoded together the first time any of them is accessed and cached, so
+    frames dropped by filters never pay for measurement decoding.
+
+    Instances are created with ``LazyDataFrame.convert2frame()`` or
+    ``DataFrameDecoder.decode_lazy()``. Apart from decoding, LazyDataFrame
+    behaves as ``DataFrame``.
+    """
+
+    __slots__ = ("_decoder", "_frame_bytes")
+
+    LAZY_FIELDS = frozenset(("_phasors", "_freq", "_dfreq", "_analog", "_digital"))
+
+
+    def __getattr__(self, name):
+
+        # Called only for attributes which are not set yet
+        if name not in LazyDataFrame.LAZY_FIELDS or self._frame_bytes is None:
+            raise AttributeError(name)
+
+        self._decode_measurements()
+
+        return getattr(self, name)
+
+
+    def _decode_measurements(self):
+
+        fields = self._decoder.raw.unpack_from(self._frame_bytes)
+        self._frame_bytes = None  # From now on unset measurement is AttributeError
+
+        # Measurements set with setters before first access are kept
+        for name, value in zip(("_phasors", "_freq", "_dfreq", "_analog", "_digital"),
+                               self._decoder._measurements(fields)):
+            if not hasattr(self, name):
+                setattr(self, name, value)
+
+
+    def is_decoded(self):
+
+        return self._frame_bytes is None
+
+
+    @staticmethod
+    def convert2frame(byte_data, cfg, offset=0, check_crc=True):
+
+        try:
+
+            return cfg.get_data_decoder().decode_lazy(byte_data, offset, check_crc)
 
         except Exception as error:
             raise FrameError("Error while creating Data frame: " + str(error))
 
 
-class CommandFrame(CommonFrame):
+class DataFrameDecoder(object):
+    """
+    ## DataFrameDecoder ##
 
-    COMMANDS = { "stop": 1, "start": 2, "header": 3, "cfg1": 4, "cfg2": 5, "cfg3": 6, "extended": 8 }
+    DataFrameDecoder is compiled decoding plan for data frames described by
+    single ``ConfigFrame2``. Size and position of every word in data frame is
+    fixed by configuration (``num_pmu``, ``data_format``, ``phasor_num``,
+    ``analog_num`` and ``digital_num``) so whole frame, from SYNC to CHK, is
+    described by one ``struct.Struct`` which is built once and reused.
 
-    # Invert CommandFrame.COMMANDS to get COMMAND_WORDS
-    COMMAND_WORDS = { code: word for word, code in COMMANDS.items() }
+    Two layouts are compiled:
 
+    * ``raw`` - measurements as unsigned words, same representation ``DataFrame``
+      keeps internally. Used by ``decode()``.
+    * ``values`` - measurements as signed integers or floats as defined by
+      ``data_format``. Used by ``unpack_values()``.
 
-    def __init__(self, pmu_id_code, command, extended_frame=None, soc=None, frasec=None):
+    Instances should be obtained with ``ConfigFrame2.get_data_decoder()``.
 
-        super().__init__("cmd", pmu_id_code, soc, frasec)
+    **Raises:**
 
-        self.set_command(command)
-        self.set_extended_frame(extended_frame)
+        FrameError
+    When frame size or CRC does not match configuration.
+    """
 
+    # SYNC, FRAMESIZE, IDCODE, SOC, FRASEC
+    HEADER_FORMAT = "HHHII"
+    HEADER_FIELDS = 5
 
-    def set_command(self, command):
+    def __init__(self, cfg):
 
-        if command in CommandFrame.COMMANDS:
-            self._command = CommandFrame.COMMANDS[command]
+        self.cfg = cfg
+        self.multistreaming = cfg._num_pmu > 1
+
+        if self.multistreaming:
+            streams = zip(cfg._data_format, cfg._phasor_num, cfg._analog_num, cfg._digital_num)
         else:
-            self._command = CommandFrame._command2int(command)
+            streams = [(cfg._data_format, cfg._phasor_num, cfg._analog_num, cfg._digital_num)]
 
+        raw_format = ""
+        values_format = ""
 
-    def get_command(self):
-        return CommandFrame.COMMAND_WORDS[self._command]
+        raw_start = values_start = DataFrameDecoder.HEADER_FIELDS
 
+        # For each stream keep (stat, phasors, freq, dfreq, analog, digital) positions in unpacked tuple
+        self.raw_streams = []
+        self.stat_offsets = []  # Byte offset of STAT word of each stream
+        self.values_streams = []
+        streams_dtype = []
 
-    @staticmethod
-    def _command2int(command):
+        for data_format, phasor_num, analog_num, digital_num in streams:
 
-        if not 0 <= command <= 65535:
-            raise ValueError("Undesignated command code must be 16bit word. 0 <= COMMAND <= 65535")
-        else:
-            return command
+            self.stat_offsets.append(COMMON_HEADER.size + calcsize("!" + raw_format))
 
+            phasor_float, analog_float, freq_float = data_format & 2, data_format & 4, data_format & 8
 
-    def set_extended_frame(self, extended_frame):
+            if phasor_float:
+                phasor_raw, phasor_values = "Q", "ff"
+            elif data_format & 1:  # Polar integer
+                phasor_raw, phasor_values = "I", "Hh"
+            else:  # Rectangular integer
+                phasor_raw, phasor_values = "I", "hh"
 
-        if extended_frame is not None:
-            self._extended_frame = CommandFrame._extended2int(extended_frame)
+            freq_raw, freq_values = ("I", "f") if freq_float else ("H", "h")
+            analog_raw, analog_values = ("I", "f") if analog_float else ("H", "h")
 
+            streams_dtype.append(DataFrameDecoder._stream_dtype(data_format, phasor_num, analog_num, digital_num))
 
-    @staticmethod
-    def _extended2int(extended_frame):
+            raw_format += "H" + phasor_raw * phasor_num + freq_raw * 2 + analog_raw * analog_num + "H" * digital_num
+            values_format += "H" + phasor_values * phasor_num + freq_values * 2 + analog_values * analog_num + \
+                             "H" * digital_num
 
-        if len(extended_frame) > 65518:
-            raise ValueError("Extended frame size to large. len(EXTENDED_FRAME) < 65518")
-        else:
-            return extended_frame
+            self.raw_streams.append(DataFrameDecoder._stream_layout(raw_start, phasor_num, 1, analog_num,
+                                                                     digital_num))
+            self.values_streams.append(DataFrameDecoder._stream_layout(values_start, phasor_num, 2, analog_num,
+                                                                        digital_num))
 
+            raw_start = self.raw_streams[-1][-1][1]
+            values_start = self.values_streams[-1][-1][1]
 
-    def convert2bytes(self):
+        # Measurement words of all streams (between FRASEC and CHK) as signed integers or floats
+        self.measurements_format = values_format
 
-        if self._command == 8:
-            cmd_b = self._command.to_bytes(2, "big") + self._extended_frame
-        else:
-            cmd_b = self._command.to_bytes(2, "big")
+        # Header + measurements + CHK
+        self.raw = Struct("!" + DataFrameDecoder.HEADER_FORMAT + raw_format + "H")
+        self.values = Struct("!" + DataFrameDecoder.HEADER_FORMAT + values_format + "H")
 
-        return super().convert2bytes(cmd_b)
+        self.size = self.raw.size
+
+        # NumPy dtype is built on first batch decode
+        self._streams_dtype = streams_dtype
+        self._dtype = None
 
 
     @staticmethod
-    def convert2frame(byte_data):
+    def _stream_layout(start, phasor_num, phasor_width, analog_num, digital_num):
 
-        try:
+        stat = start
+        phasors = (stat + 1, stat + 1 + phasor_num * phasor_width)
+        freq = phasors[1]
+        dfreq = freq + 1
+        analog = (dfreq + 1, dfreq + 1 + analog_num)
+        digital = (analog[1], analog[1] + digital_num)
 
-            if not CommonFrame._check_crc(byte_data):
-                raise FrameError("CRC failed. Command frame not valid.")
+        return stat, phasors, freq, dfreq, analog, digital
 
-            pmu_code = int.from_bytes(byte_data[4:6], byteorder="big", signed=False)
-            soc = int.from_bytes(byte_data[6:10], byteorder="big", signed=False)
-            frasec = CommonFrame._int2frasec(int.from_bytes(byte_data[10:14], byteorder="big", signed=False))
 
-            command_int = int.from_bytes(byte_data[14:16], byteorder="big", signed=False)
-            command = [command for command, code in CommandFrame.COMMANDS.items() if code == command_int]
+    @staticmethod
+    def _stream_dtype(data_format, phasor_num, analog_num, digital_num):
 
-            # Should match only one Command
-            if len(command) == 1:
-                # Convert list to string
-                command = "".join(command)
-            else:
-                # User defined command
-                command = command_int
+        if data_format & 2:  # Floating point
+            phasor = [("mag", ">f4"), ("angle", ">f4")] if data_format & 1 else [("re", ">f4"), ("im", ">f4")]
+        elif data_format & 1:  # Polar integer
+            phasor = [("mag", ">u2"), ("angle", ">i2")]
+        else:  # Rectangular integer
+            phasor = [("re", ">i2"), ("im", ">i2")]
 
-            # Check if extended frame
-            if command == "extended":
-                extended_frame = byte_data[16:-2]
+        freq = ">f4" if data_format & 8 else ">i2"
+        analog = ">f4" if data_format & 4 else ">i2"
+
+        return [("stat", ">u2"), ("phasors", phasor, (phasor_num,)), ("freq", freq), ("dfreq", freq),
+                ("analog", analog, (analog_num,)), ("digital", ">u2", (digital_num,))]
+
+
+    def get_dtype(self):
+        """
+        ### get_dtype() ###
+
+        Getter for NumPy structured dtype of data frame. All fields are big-endian
+        so frames received from network can be viewed without copying.
+
+        Header fields are ``sync``, ``framesize``, ``idcode``, ``soc`` and ``frasec``
+        followed by ``stat``, ``phasors``, ``freq``, ``dfreq``, ``analog`` and
+        ``digital`` and ``chk`` at the end. Phasors are sub-arrays with ``mag`` and
+        ``angle`` (polar) or ``re`` and ``im`` (rectangular) fields. If
+        ``multistreaming``, measurement fields of each stream are nested under
+        ``stream_0``, ``stream_1``...
+
+        **Returns:**
+
+        * ``numpy.dtype`` with ``itemsize`` equal to data frame size.
+
+        **Raises:**
+
+            FrameError
+        When NumPy is not installed.
+
+        """
+
+        if self._dtype is None:
+
+            if np is None:
+                raise FrameError("NumPy is required for batch decoding of data frames.")
+
+            header = [("sync", ">u2"), ("framesize", ">u2"), ("idcode", ">u2"), ("soc", ">u4"), ("frasec", ">u4")]
+
+            if self.multistreaming:
+                measurements = [("stream_{}".format(i), stream) for i, stream in enumerate(self._streams_dtype)]
             else:
-                extended_frame = None
+                measurements = self._streams_dtype[0]
 
-            return CommandFrame(pmu_code, command, extended_frame, soc, frasec)
+            self._dtype = np.dtype(header + measurements + [("chk", ">u2")])
 
-        except Exception as error:
-            raise FrameError("Error while creating Command frame: " + str(error))
+        return self._dtype
 
 
-class HeaderFrame(CommonFrame):
+    def decode_batch(self, frames):
+        """
+        ### decode_batch() ###
 
-    def __init__(self, pmu_id_code, header, soc=None, frasec=None):
+        Decode many data frames sharing this configuration into one NumPy
+        structured array.
 
-        super().__init__("header", pmu_id_code, soc, frasec)
-        self.set_header(header)
+        **Params:**
 
+        * ``frames`` **(mixed)** - List of data frames or single buffer with
+          frames concatenated back to back (``bytes``, ``bytearray`` or ``memoryview``).
 
-    def set_header(self, header):
+        **Returns:**
 
-        self._header = header
+        * ``tuple`` ``(records, crc_valid)`` where ``records`` is structured array
+          with ``get_dtype()`` and ``crc_valid`` boolean array. Frames from list which
+          size does not match configuration are left zeroed and marked as not valid.
 
+        **Raises:**
 
-    def get_header(self):
+            FrameError
+        When NumPy is not installed or buffer size is not multiple of frame size.
 
-        return self._header
+        """
 
+        dtype = self.get_dtype()
 
-    def convert2bytes(self):
+        if isinstance(frames, (bytes, bytearray, memoryview)):
 
-        header_b = str.encode(self._header)
-        return super().convert2bytes(header_b)
+            if len(frames) % self.size:
+                raise FrameError("Buffer size is not multiple of data frame size ({} bytes).".format(self.size))
 
+            records = np.frombuffer(frames, dtype=dtype)
+            crc_valid = np.array(check_crc_batch(frames, self.size), dtype=bool)
+        else:
 
-    @staticmethod
-    def convert2frame(byte_data):
-        try:
+            sized = [len(frame) == self.size for frame in frames]
+            buffer = b"".join(frame if ok else bytes(self.size) for frame, ok in zip(frames, sized))
 
-            if not CommonFrame._check_crc(byte_data):
-                raise FrameError("CRC failed. Header frame not valid.")
+            records = np.frombuffer(buffer, dtype=dtype)
+            crc_valid = np.array(check_crc_batch(frames), dtype=bool) & np.array(sized, dtype=bool)
 
-            pmu_code = int.from_bytes(byte_data[4:6], byteorder="big", signed=False)
-            soc = int.from_bytes(byte_data[6:10], byteorder="big", signed=False)
-            frasec = CommonFrame._int2frasec(int.from_bytes(byte_data[10:14], byteorder="big", signed=False))
+        return records, crc_valid
 
-            header_message = byte_data[14:-2]
-            header_message = str(header_message)
 
-            return HeaderFrame(pmu_code, header_message, soc, frasec)
+    def _check_frame(self, byte_data, offset, check_crc):
 
-        except Exception as error:
-            raise FrameError("Error while creating Header frame: " + str(error))
+        frame_size = CommonFrame._get_frame_size(byte_data, offset)
+
+        if frame_size != self.size or len(byte_data) - offset < self.size:
+            raise FrameError("Data frame size does not match configuration. "
+                             "Expected {} bytes, got {}.".format(self.size, frame_size))
+
+        if check_crc and not CommonFrame._check_crc(byte_data, offset, self.size):
+            raise FrameError("CRC failed. Data frame not valid.")
+
+
+    def decode(self, byte_data, offset=0, check_crc=True, frame=None):
+        """
+        ### decode() ###
+
+        Decode data frame with single ``unpack_from``. Measurements are stored as
+        received so range checks done by ``DataFrame`` setters are skipped.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding
+          complete data frame including CHK.
+        * ``offset`` **(int)** - Position of SYNC word in ``byte_data``. Default value: ``0``.
+        * ``check_crc`` **(bool)** - ``False`` if CRC was already checked by caller.
+          Default value: ``True``.
+        * ``frame`` **(DataFrame)** - Existing instance to refill instead of creating
+          new one. See ``DataFramePool``. Default value: ``None``.
+
+        **Returns:**
+
+        * ``DataFrame`` bound to configuration of this decoder.
+
+        **Raises:**
+
+            FrameError
+        When frame size does not match configuration or CRC is not valid.
+
+        """
+
+        self._check_frame(byte_data, offset, check_crc)
+
+        fields = self.raw.unpack_from(byte_data, offset)
+
+        if frame is None:
+            frame = DataFrame.__new__(DataFrame)
+
+        frame._frame_type = CommonFrame.FRAME_TYPES["data"]
+        frame._version = fields[0] & 0x000f
+        frame._pmu_id_code = fields[2]
+        frame._soc = fields[3]
+        frame._frasec = fields[4]
+        frame.cfg = self.cfg
+
+        if self.multistreaming:
+            frame._stat = [fields[stat] for stat, _, _, _, _, _ in self.raw_streams]
+        else:
+            frame._stat = fields[self.raw_streams[0][0]]
+
+        frame._phasors, frame._freq, frame._dfreq, frame._analog, frame._digital = self._measurements(fields)
+
+        return frame
+
+
+    def _measurements(self, fields):
+
+        if self.multistreaming:
+            return ([list(fields[ph[0]:ph[1]]) for _, ph, _, _, _, _ in self.raw_streams],
+                    [fields[freq] for _, _, freq, _, _, _ in self.raw_streams],
+                    [fields[dfreq] for _, _, _, dfreq, _, _ in self.raw_streams],
+                    [list(fields[an[0]:an[1]]) for _, _, _, _, an, _ in self.raw_streams],
+                    [list(fields[dig[0]:dig[1]]) for _, _, _, _, _, dig in self.raw_streams])
+
+        _, ph, freq, dfreq, an, dig = self.raw_streams[0]
+
+        return (list(fields[ph[0]:ph[1]]), fields[freq], fields[dfreq], list(fields[an[0]:an[1]]),
+                list(fields[dig[0]:dig[1]]))
+
+
+    def decode_lazy(self, byte_data, offset=0, check_crc=True):
+        """
+        ### decode_lazy() ###
+
+        Decode only header and STAT words of data frame. Measurements are decoded
+        when they are accessed for the first time. See ``LazyDataFrame``.
+
+        Frame is copied out of ``byte_data`` so receive buffer may be reused.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding
+          complete data frame including CHK.
+        * ``offset`` **(int)** - Position of SYNC word in ``byte_data``. Default value: ``0``.
+        * ``check_crc`` **(bool)** - ``False`` if CRC was already checked by caller.
+          Default value: ``True``.
+
+        **Returns:**
+
+        * ``LazyDataFrame`` bound to configuration of this decoder.
+
+        **Raises:**
+
+            FrameError
+        When frame size does not match configuration or CRC is not valid.
+
+        """
+
+        self._check_frame(byte_data, offset, check_crc)
+
+        sync, _, pmu_code, soc, frasec = COMMON_HEADER.unpack_from(byte_data, offset)
+
+        frame = LazyDataFrame.__new__(LazyDataFrame)
+        frame._frame_type = CommonFrame.FRAME_TYPES["data"]
+        frame._version = sync & 0x000f
+        frame._pmu_id_code = pmu_code
+        frame._soc = soc
+        frame._frasec = frasec
+        frame.cfg = self.cfg
+
+        if self.multistreaming:
+            frame._stat = [unpack_from("!H", byte_data, offset + stat_offset)[0] for stat_offset in self.stat_offsets]
+        else:
+            frame._stat = unpack_from("!H", byte_data, offset + self.stat_offsets[0])[0]
+
+        frame._decoder = self
+        frame._frame_bytes = bytes(memoryview(byte_data)[offset:offset + self.size])
+
+        return frame
+
+
+    def unpack_values(self, byte_data, offset=0, check_crc=True):
+        """
+        ### unpack_values() ###
+
+        Decode data frame straight to measurement values without creating
+        ``DataFrame``. Phasors are returned as received (not scaled and not
+        converted to polar representation).
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding
+          complete data frame including CHK.
+        * ``offset`` **(int)** - Position of SYNC word in ``byte_data``. Default value: ``0``.
+        * ``check_crc`` **(bool)** - ``False`` if CRC was already checked by caller.
+          Default value: ``True``.
+
+        **Returns:**
+
+        * ``tuple`` ``(pmu_id_code, soc, frasec, streams)`` where ``streams`` is list
+          with ``(stat, phasors, freq, dfreq, analog, digital)`` tuple for each
+          measurement stream.
+
+        **Raises:**
+
+            FrameError
+        When frame size does not match configuration or CRC is not valid.
+
+        """
+
+        self._check_frame(byte_data, offset, check_crc)
+
+        fields = self.values.unpack_from(byte_data, offset)
+
+        streams = []
+        for stat, ph, freq, dfreq, an, dig in self.values_streams:
+            phasors = list(zip(fields[ph[0]:ph[1]:2], fields[ph[0] + 1:ph[1]:2]))
+            streams.append((fields[stat], phasors, fields[freq], fields[dfreq], list(fields[an[0]:an[1]]),
+                            list(fields[dig[0]:dig[1]])))
+
+        return fields[2], fields[3], fields[4], streams
+
+
+class DataFramePool(object):
+    """
+    ## DataFramePool ##
+
+    Pool of reusable ``DataFrame`` instances for receive loops. Instead of
+    creating new ``DataFrame`` for each datagram, ``decode()`` refills free
+    instance from the pool. When frame is processed it should be given back with
+    ``release()``. Frame must not be used after it was released.
+
+    When pool is empty new instance is created, so pool never blocks. At most
+    ``size`` released frames are kept.
+
+    **Attributes:**
+
+    * ``decoder`` **(mixed)** - ``DataFrameDecoder`` or ``ConfigRegistry`` which refills frames.
+    * ``size`` **(int)** - Maximal number of free frames kept in the pool.
+    """
+
+    __slots__ = ("decoder", "size", "_free")
+
+    def __init__(self, cfg, size=64):
+
+        if isinstance(cfg, ConfigFrame2):
+            self.decoder = cfg.get_data_decoder()
+        elif isinstance(cfg, ConfigRegistry):
+            self.decoder = cfg  # Decoder is chosen per IDCODE
+        else:
+            raise FrameError("CFG should describe current data stream (ConfigurationFrame2 or ConfigRegistry)")
+
+        if size < 1:
+            raise FrameError("Pool size should be positive.")
+
+        self.size = size
+        self._free = [DataFrame.__new__(DataFrame) for _ in range(size)]
+
+
+    def decode(self, byte_data, offset=0, check_crc=True):
+        """
+        ### decode() ###
+
+        Decode data frame into free frame from the pool.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding
+          complete data frame including CHK.
+        * ``offset`` **(int)** - Position of SYNC word in ``byte_data``. Default value: ``0``.
+        * ``check_crc`` **(bool)** - ``False`` if CRC was already checked by caller.
+          Default value: ``True``.
+
+        **Returns:**
+
+        * ``DataFrame`` which should be given back with ``release()``.
+
+        **Raises:**
+
+            FrameError
+        When frame size does not match configuration or CRC is not valid.
+
+        """
+
+        frame = self._free.pop() if self._free else DataFrame.__new__(DataFrame)
+
+        try:
+            return self.decoder.decode(byte_data, offset, check_crc, frame)
+        except FrameError:
+            self._free.append(frame)
+            raise
+
+
+    def release(self, frame):
+
+        if len(self._free) < self.size:
+            self._free.append(frame)
+
+
+    def __len__(self):
+
+        return len(self._free)
+
+
+class ConfigRegistry(object):
+    """
+    ## ConfigRegistry ##
+
+    ConfigRegistry holds configurations of all data streams received by PDC,
+    keyed by ``(IDCODE, CFG_CNT)``. It is filled from received ``ConfigFrame2``
+    frames and each entry keeps its compiled ``DataFrameDecoder``, so data frame
+    decoding costs one dictionary lookup by IDCODE.
+
+    First configuration received for IDCODE is activated immediately. Later
+    configuration with different CFG_CNT is kept pending until data frame of
+    that IDCODE arrives with configuration change bit set in STAT (``0x0400``).
+    Then decoders are swapped. If change bit is set and new configuration was
+    not received yet IDCODE is added to ``config_changed`` so PDC can request
+    CFG-2 from PMU. PMU keeps the bit set for a while after the change, so bit
+    is ignored once configuration was activated after bit was first seen, until
+    data frame without the bit ends the change.
+
+    Data frames with IDCODE without configuration are decoded with
+    ``default_cfg`` if provided.
+
+    **Attributes:**
+
+    * ``configs`` **(dict)** - All received configurations ``{(IDCODE, CFG_CNT): ConfigFrame2}``.
+    * ``config_changed`` **(set)** - IDCODEs which announced configuration change
+      without new configuration received.
+    * ``default_cfg`` **(ConfigFrame2)** - Configuration for unknown IDCODEs. Default value: ``None``.
+
+    **Raises:**
+
+        FrameError
+    When data frame can not be decoded with configuration of its IDCODE.
+    """
+
+    CFG_CHANGE = 0x0400  # STAT bit 10
+
+    def __init__(self, default_cfg=None):
+
+        if default_cfg is not None and not isinstance(default_cfg, ConfigFrame2):
+            raise FrameError("Default CFG should be ConfigurationFrame2")
+
+        self.configs = {}
+        self.config_changed = set()
+        self.default_cfg = default_cfg
+
+        self._active = {}  # IDCODE -> (CFG_CNT, DataFrameDecoder)
+        self._pending = {}  # IDCODE -> CFG_CNT waiting for configuration change bit
+        self._serial = 0  # Orders activations and first sightings of configuration change bit
+        self._activated = {}  # IDCODE -> serial of activation of active configuration
+        self._change_seen = {}  # IDCODE -> serial when configuration change bit was first seen
+        self._default = (None, default_cfg.get_data_decoder()) if default_cfg is not None else None
+
+
+    @staticmethod
+    def _cfg_count(cfg):
+
+        cfg_count = cfg.get_cfg_count()
+
+        return tuple(cfg_count) if isinstance(cfg_count, list) else cfg_count
+
+
+    def register(self, cfg):
+        """
+        ### register() ###
+
+        Add received configuration and compile its data frame decoder.
+
+        **Params:**
+
+        * ``cfg`` **(ConfigFrame2)** - Configuration of data stream.
+
+        **Returns:**
+
+        * ``tuple`` ``(IDCODE, CFG_CNT)`` under which configuration is stored.
+
+        """
+
+        if not isinstance(cfg, ConfigFrame2):
+            raise FrameError("CFG should describe current data stream (ConfigurationFrame2)")
+
+        pmu_id_code = cfg.get_id_code()
+        cfg_count = self._cfg_count(cfg)
+
+        self.configs[(pmu_id_code, cfg_count)] = cfg
+        decoder = cfg.get_data_decoder()
+
+        active = self._active.get(pmu_id_code)
+
+        if active is None or active[0] == cfg_count:
+            # First configuration or resent active one - announced change, if any, is answered
+            self._activate(pmu_id_code, cfg_count, decoder)
+        elif pmu_id_code in self.config_changed:
+            # Change was already announced, PMU is waiting for us
+            self._activate(pmu_id_code, cfg_count, decoder)
+            self._pending.pop(pmu_id_code, None)
+        else:
+            self._pending[pmu_id_code] = cfg_count
+
+        return pmu_id_code, cfg_count
+
+
+    def register_frame(self, byte_data, offset=0, check_crc=True):
+        """
+        ### register_frame() ###
+
+        Convert received CFG-2 frame and add it to registry.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding CFG-2 frame.
+        * ``offset`` **(int)** - Position of SYNC word in ``byte_data``. Default value: ``0``.
+        * ``check_crc`` **(bool)** - ``False`` if CRC was already checked by caller.
+          Default value: ``True``.
+
+        **Returns:**
+
+        * ``tuple`` ``(IDCODE, CFG_CNT)`` under which configuration is stored.
+
+        """
+
+        return self.register(ConfigFrame2.convert2frame(byte_data, offset, check_crc))
+
+
+    def get_config(self, pmu_id_code):
+
+        active = self._active.get(pmu_id_code)
+
+        if active is None:
+            return self.default_cfg
+
+        return self.configs[(pmu_id_code, active[0])]
+
+
+    def get_decoder(self, pmu_id_code):
+
+        return self._active.get(pmu_id_code, self._default or (None, None))[1]
+
+
+    def needs_config(self, pmu_id_code):
+        """
+        ### needs_config() ###
+
+        Check if PDC should request CFG-2 from PMU - IDCODE never sent its own
+        configuration (data is decoded with ``default_cfg``) or announced
+        configuration change which was not received yet.
+
+        **Params:**
+
+        * ``pmu_id_code`` **(int)** - Data stream ID number.
+
+        **Returns:**
+
+        * ``bool``
+
+        """
+
+        return pmu_id_code not in self._active or pmu_id_code in self.config_changed
+
+
+    def _activate(self, pmu_id_code, cfg_count, decoder):
+
+        self._serial += 1
+        self._active[pmu_id_code] = (cfg_count, decoder)
+        self._activated[pmu_id_code] = self._serial
+        self.config_changed.discard(pmu_id_code)
+
+
+    def _config_change(self, pmu_id_code):
+
+        seen = self._change_seen.get(pmu_id_code)
+        if seen is None:
+            self._serial += 1
+            seen = self._change_seen[pmu_id_code] = self._serial
+        elif self._activated.get(pmu_id_code, 0) > seen:
+            # Bit still set after change was answered
+            return self._active[pmu_id_code]
+
+        cfg_count = self._pending.pop(pmu_id_code, None)
+
+        if cfg_count is None:
+            self.config_changed.add(pmu_id_code)
+        else:
+            self._activate(pmu_id_code, cfg_count, self.configs[(pmu_id_code, cfg_count)].get_data_decoder())
+
+        return self._active.get(pmu_id_code, self._default)
+
+
+    def decode(self, byte_data, offset=0, check_crc=True, frame=None):
+        """
+        ### decode() ###
+
+        Decode data frame with decoder of its IDCODE.
+
+        **Params:**
+
+        * ``byte_data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview`` holding
+          complete data frame including CHK.
+        * ``offset`` **(int)** - Position of SYNC word in ``byte_data``. Default value: ``0``.
+        * ``check_crc`` **(bool)** - ``False`` if CRC was already checked by caller.
+          Default value: ``True``.
+        * ``frame`` **(DataFrame)** - Existing instance to refill. Default value: ``None``.
+
+        **Returns:**
+
+        * ``DataFrame`` bound to configuration of its IDCODE.
+
+        **Raises:**
+
+            FrameError
+        When there is no configuration for IDCODE or frame does not match it.
+
+        """
+
+        if len(byte_data) - offset < 6:
+            raise FrameError("Data frame too short.")
+
+        pmu_id_code = (byte_data[offset + 4] << 8) | byte_data[offset + 5]
+        active = self._active.get(pmu_id_code, self._default)
+
+        if active is None:
+            raise FrameError("No configuration received for IDCODE {:d}.".format(pmu_id_code))
+
+        decoder = active[1]
+
+        if len(byte_data) - offset >= decoder.size:
+            for stat_offset in decoder.stat_offsets:
+                if byte_data[offset + stat_offset] << 8 & ConfigRegistry.CFG_CHANGE:
+                    decoder = self._config_change(pmu_id_code)[1]
+                    break
+            else:
+                if self._change_seen:
+                    self._change_seen.pop(pmu_id_code, None)
+
+        return decoder.decode(byte_data, offset, check_crc, frame)
+
+
+    def __len__(self):
+
+        return len(self.configs)
+
+
+    def __contains__(self, key):
+
+        return key in self.configs
+
+
+class DataFrameEncoder(object):
+    """
+    ## DataFrameEncoder ##
+
+    DataFrameEncoder is pre-built data frame template for PMU senders. Frame
+    layout is fixed by ``ConfigFrame2`` so frame is kept in preallocated
+    ``bytearray`` with SYNC, FRAMESIZE and IDCODE written once. Each call to
+    ``encode()`` fills SOC, FRASEC and measurements with single ``pack_into``
+    and patches CHK.
+
+    Unlike ``DataFrame`` setters, measurements are not range checked one by one.
+    Values which do not fit word size defined by ``data_format`` are rejected
+    by ``struct`` and reported as ``FrameError``.
+
+    **Attributes:**
+
+    * ``cfg`` **(ConfigFrame2)** - Configuration describing data stream.
+    * ``pmu_id_code`` **(int)** - Data stream ID number written to IDCODE.
+    * ``time_quality`` **(int)** - Message Time Quality written to FRASEC. See
+      ``CommonFrame.set_frasec()``. Default value: ``0``.
+
+    **Raises:**
+
+        FrameError
+    When ``pmu_id_code`` or ``time_quality`` is out of range.
+    """
+
+    def __init__(self, cfg, pmu_id_code=None, time_quality=0, version=1):
+
+        if not isinstance(cfg, ConfigFrame2):
+            raise FrameError("CFG should describe current data stream (ConfigurationFrame2)")
+
+        if pmu_id_code is None:
+            pmu_id_code = cfg.get_id_code()
+
+        if not 1 <= pmu_id_code <= 65534:
+            raise FrameError("ID CODE out of range. 1 <= ID_CODE <= 65534")
+
+        if (not 0 <= time_quality <= 15) or (time_quality in [12, 13, 14]):
+            raise FrameError("Time quality flag out of range. 0 <= MSG_TQ <= 15")
+
+        if not 1 <= version <= 15:
+            raise FrameError("VERSION number out of range. 1<= VERSION <= 15")
+
+        decoder = cfg.get_data_decoder()
+
+        self.cfg = cfg
+        self.pmu_id_code = pmu_id_code
+        self.time_quality = time_quality
+        self.multistreaming = decoder.multistreaming
+        self.size = decoder.size
+
+        # SOC, FRASEC and measurements packed right after IDCODE
+        self._body = Struct("!II" + decoder.measurements_format)
+        self._frasec_flags = time_quality << 24
+
+        self._buffer = bytearray(self.size)
+        self._view = memoryview(self._buffer)
+
+        sync = (0xaa << 8) | (CommonFrame.FRAME_TYPES["data"] << 4) | version
+        pack_into("!HHH", self._buffer, 0, sync, self.size, pmu_id_code)
+
+
+    @staticmethod
+    def _stream_words(stat, phasors, freq, dfreq, analog, digital):
+
+        if isinstance(stat, tuple):
+            stat = DataFrame._stat2int(*stat)
+
+        words = [stat]
+        for phasor in phasors:
+            words.extend(phasor)
+        words.append(freq)
+        words.append(dfreq)
+        words.extend(analog)
+        words.extend(digital)
+
+        return words
+
+
+    def encode(self, soc, frasec, stat, phasors, freq, dfreq, analog, digital):
+        """
+        ### encode() ###
+
+        Fill frame template with timestamp and measurements.
+
+        **Params:**
+
+        * ``soc`` **(int)** - UNIX timestamp.
+        * ``frasec`` **(int)** - Fraction of second. Time quality flags are taken from
+          template.
+        * ``stat`` **(mixed)** - STAT word as ``int`` or ``tuple`` (see ``DataFrame.set_stat()``).
+        * ``phasors`` **(list)** - Phasor tuples as they should appear on the wire
+          (``(Re, Im)`` or ``(Mg, An)``), integers or floats by ``data_format``.
+        * ``freq`` **(mixed)** - FREQ word, ``int`` or ``float`` by ``data_format``.
+        * ``dfreq`` **(mixed)** - DFREQ word, ``int`` or ``float`` by ``data_format``.
+        * ``analog`` **(list)** - Analog values.
+        * ``digital`` **(list)** - Digital status words.
+
+        If ``multistreaming`` each measurement argument should be list with
+        ``num_pmu`` elements.
+
+        **Returns:**
+
+        * ``bytearray`` with complete frame. Buffer is reused by next ``encode()`` call.
+
+        **Raises:**
+
+            FrameError
+        When measurement does not fit word defined by ``data_format``.
+
+        """
+
+        try:
+
+            if self.multistreaming:
+                words = []
+                for stream in zip(stat, phasors, freq, dfreq, analog, digital):
+                    words.extend(DataFrameEncoder._stream_words(*stream))
+            else:
+                words = DataFrameEncoder._stream_words(stat, phasors, freq, dfreq, analog, digital)
+
+            self._body.pack_into(self._buffer, 6, soc, self._frasec_flags | frasec, *words)
+
+        except Exception as error:
+            raise FrameError("Error while encoding Data frame: " + str(error))
+
+        pack_into("!H", self._buffer, self.size - 2, crc16xmodem(self._view[:-2], 0xffff))
+
+        return self._buffer
+
+
+class DataFrameBatchEncoder(object):
+    """
+    ## DataFrameBatchEncoder ##
+
+    DataFrameBatchEncoder builds data frames of many data streams sharing one
+    layout (e.g. fleet of simulated PMUs with same channels but different
+    IDCODEs) in one NumPy structured array with ``DataFrameDecoder.get_dtype()``.
+    SYNC, FRAMESIZE and IDCODE are written once, ``encode()`` fills timestamp
+    and measurements of all frames with vectorized assignments and patches CHK
+    of each frame.
+
+    Measurements are cast by NumPy assignment rules. Values are not range checked,
+    integer words out of range wrap around.
+
+    **Attributes:**
+
+    * ``cfg`` **(ConfigFrame2)** - Configuration describing layout of data streams.
+    * ``pmu_id_codes`` **(list)** - IDCODE of each frame.
+    * ``records`` **(numpy.ndarray)** - Frames as structured array, measurement
+      fields can be filled in place (required if ``multistreaming``).
+    * ``frames`` **(list)** - ``memoryview`` of each complete frame. Views are
+      valid as long as encoder and refilled by every ``encode()`` call.
+
+    **Raises:**
+
+        FrameError
+    When NumPy is not installed, IDCODE or ``time_quality`` is out of range.
+    """
+
+    def __init__(self, cfg, pmu_id_codes, time_quality=0, version=1):
+
+        if np is None:
+            raise FrameError("NumPy is required for batch encoding of data frames.")
+
+        if not isinstance(cfg, ConfigFrame2):
+            raise FrameError("CFG should describe current data stream (ConfigurationFrame2)")
+
+        if not all(1 <= pmu_id_code <= 65534 for pmu_id_code in pmu_id_codes):
+            raise FrameError("ID CODE out of range. 1 <= ID_CODE <= 65534")
+
+        if (not 0 <= time_quality <= 15) or (time_quality in [12, 13, 14]):
+            raise FrameError("Time quality flag out of range. 0 <= MSG_TQ <= 15")
+
+        if not 1 <= version <= 15:
+            raise FrameError("VERSION number out of range. 1<= VERSION <= 15")
+
+        decoder = cfg.get_data_decoder()
+
+        self.cfg = cfg
+        self.pmu_id_codes = list(pmu_id_codes)
+        self.time_quality = time_quality
+        self.multistreaming = decoder.multistreaming
+        self.size = decoder.size
+
+        self.records = np.zeros(len(self.pmu_id_codes), dtype=decoder.get_dtype())
+        self.records["sync"] = (0xaa << 8) | (CommonFrame.FRAME_TYPES["data"] << 4) | version
+        self.records["framesize"] = self.size
+        self.records["idcode"] = self.pmu_id_codes
+
+        self._frasec_flags = time_quality << 24
+
+        view = memoryview(self.records.view(np.uint8))
+        self.frames = [view[start:start + self.size] for start in range(0, len(view), self.size)]
+        self._bodies = [frame[:-2] for frame in self.frames]
+
+        if not self.multistreaming:
+            self._phasor_fields = self.records.dtype["phasors"].base.names
+
+
+    def __len__(self):
+
+        return len(self.frames)
+
+
+    def encode(self, soc, frasec, stat=None, phasors=None, freq=None, dfreq=None, analog=None, digital=None):
+        """
+        ### encode() ###
+
+        Fill timestamp and measurements of all frames and calculate CHK.
+
+        **Params:**
+
+        * ``soc`` **(mixed)** - UNIX timestamp, ``int`` for all frames or array.
+        * ``frasec`` **(mixed)** - Fraction of second, ``int`` or array. Time quality
+          flags are taken from encoder.
+        * ``stat`` **(mixed)** - STAT words, scalar or array with one value per frame.
+        * ``phasors`` **(numpy.ndarray)** - Array of shape ``(frames, phasor_num, 2)``
+          with phasors as they should appear on the wire (``(Re, Im)`` or ``(Mg, An)``).
+        * ``freq`` **(mixed)** - FREQ words, scalar or array.
+        * ``dfreq`` **(mixed)** - DFREQ words, scalar or array.
+        * ``analog`` **(numpy.ndarray)** - Array of shape ``(frames, analog_num)``.
+        * ``digital`` **(numpy.ndarray)** - Array of shape ``(frames, digital_num)``.
+
+        Measurements which are ``None`` keep values from previous call. If
+        ``multistreaming`` measurements must be filled in ``records`` before call.
+
+        **Returns:**
+
+        * ``list`` of ``memoryview`` - ``frames``.
+
+        **Raises:**
+
+            FrameError
+        When measurements are passed for multistreaming layout or don't match
+        number of frames.
+
+        """
+
+        records = self.records
+
+        try:
+
+            records["soc"] = soc
+            records["frasec"] = np.bitwise_or(frasec, self._frasec_flags)
+
+            measurements = (stat, phasors, freq, dfreq, analog, digital)
+
+            if self.multistreaming:
+                if any(value is not None for value in measurements):
+                    raise FrameError("Multistreaming measurements should be filled in records.")
+            else:
+                for field, value in zip(("stat", None, "freq", "dfreq", "analog", "digital"), measurements):
+                    if value is None:
+                        continue
+                    if field is None:
+                        records["phasors"][self._phasor_fields[0]] = phasors[..., 0]
+                        records["phasors"][self._phasor_fields[1]] = phasors[..., 1]
+                    else:
+                        records[field] = value
+
+        except FrameError:
+            raise
+        except Exception as error:
+            raise FrameError("Error while encoding Data frames: " + str(error))
+
+        records["chk"] = [crc16xmodem(body, 0xffff) for body in self._bodies]
+
+        return self.frames
+
+
+class CommandFrame(CommonFrame):
+
+    __slots__ = ("_command", "_extended_frame")
+
+    COMMANDS = { "stop": 1, "start": 2, "header": 3, "cfg1": 4, "cfg2": 5, "cfg3": 6, "extended": 8 }
+
+    # Invert CommandFrame.COMMANDS to get COMMAND_WORDS
+    COMMAND_WORDS = { code: word for word, code in COMMANDS.items() }
+
+
+    def __init__(self, pmu_id_code, command, extended_frame=None, soc=None, frasec=None):
+
+        super().__init__("cmd", pmu_id_code, soc, frasec)
+
+        self.set_command(command)
+        self.set_extended_frame(extended_frame)
+
+
+    def set_command(self, command):
+
+        if command in CommandFrame.COMMANDS:
+            self._command = CommandFrame.COMMANDS[command]
+        else:
+            self._command = CommandFrame._command2int(command)
+
+
+    def get_command(self):
+        return CommandFrame.COMMAND_WORDS[self._command]
+
+
+    @staticmethod
+    def _command2int(command):
+
+        if not 0 <= command <= 65535:
+            raise ValueError("Undesignated command code must be 16bit word. 0 <= COMMAND <= 65535")
+        else:
+            return command
+
+
+    def set_extended_frame(self, extended_frame):
+
+        if extended_frame is not None:
+            self._extended_frame = CommandFrame._extended2int(extended_frame)
+
+
+    def get_extended_frame(self):
+
+        return self._extended_frame if self._command == 8 else None
+
+
+    @staticmethod
+    def _extended2int(extended_frame):
+
+        if len(extended_frame) > 65518:
+            raise ValueError("Extended frame size to large. len(EXTENDED_FRAME) < 65518")
+        else:
+            return extended_frame
+
+
+    def convert2bytes(self):
+
+        if self._command == 8:
+            cmd_b = self._command.to_bytes(2, "big") + self._extended_frame
+        else:
+            cmd_b = self._command.to_bytes(2, "big")
+
+        return super().convert2bytes(cmd_b)
+
+
+    @staticmethod
+    def convert2frame(byte_data, offset=0, check_crc=True):
+
+        try:
+
+            _, frame_size, pmu_code, soc, frasec_int = COMMON_HEADER.unpack_from(byte_data, offset)
+
+            if check_crc and not CommonFrame._check_crc(byte_data, offset, frame_size):
+                raise FrameError("CRC failed. Command frame not valid.")
+
+            frasec = CommonFrame._int2frasec(frasec_int)
+
+            command_int = unpack_from("!H", byte_data, offset + 14)[0]
+            command = [command for command, code in CommandFrame.COMMANDS.items() if code == command_int]
+
+            # Should match only one Command
+            if len(command) == 1:
+                # Convert list to string
+                command = "".join(command)
+            else:
+                # User defined command
+                command = command_int
+
+            # Check if extended frame
+            if command == "extended":
+                # Copied since frame keeps it after receive buffer is reused
+                extended_frame = bytes(memoryview(byte_data)[offset + 16:offset + frame_size - 2])
+            else:
+                extended_frame = None
+
+            return CommandFrame(pmu_code, command, extended_frame, soc, frasec)
+
+        except Exception as error:
+            raise FrameError("Error while creating Command frame: " + str(error))
+
+
+class HeaderFrame(CommonFrame):
+
+    __slots__ = ("_header",)
+
+    def __init__(self, pmu_id_code, header, soc=None, frasec=None):
+
+        super().__init__("header", pmu_id_code, soc, frasec)
+        self.set_header(header)
+
+
+    def set_header(self, header):
+
+        self._header = header
+
+
+    def get_header(self):
+
+        return self._header
+
+
+    def convert2bytes(self):
+
+        header_b = str.encode(self._header)
+        return super().convert2bytes(header_b)
+
+
+    @staticmethod
+    def convert2frame(byte_data, offset=0, check_crc=True):
+        try:
+
+            _, frame_size, pmu_code, soc, frasec_int = COMMON_HEADER.unpack_from(byte_data, offset)
+
+            if check_crc and not CommonFrame._check_crc(byte_data, offset, frame_size):
+                raise FrameError("CRC failed. Header frame not valid.")
+
+            frasec = CommonFrame._int2frasec(frasec_int)
+
+            header_message = bytes(memoryview(byte_data)[offset + 14:offset + frame_size - 2])
+            header_message = str(header_message)
+
+            return HeaderFrame(pmu_code, header_message, soc, frasec)
+
+        except Exception as error:
+            raise FrameError("Error while creating Header frame: " + str(error))
+
+
+class StreamFramer(object):
+    """
+    ## StreamFramer ##
+
+    StreamFramer splits byte stream (TCP) into complete C37.118 frames. Chunks
+    of any size may be added with ``feed()`` or received straight into internal
+    buffer with ``recv_into()``. Complete frames are returned as ``memoryview``
+    slices of that buffer, so frames are never copied. Returned views are valid
+    until next ``feed()`` or ``recv_into()``.
+
+    Frame starts with ``0xAA`` SYNC byte followed by valid frame type and
+    version, FRAMESIZE tells where it ends. Bytes which can not start frame are
+    skipped, so framer resynchronizes after garbage or frame with invalid CRC.
+    Incomplete frame stays in the buffer and is moved to its beginning before
+    next read. Buffer is allocated once and reused.
+
+    **Attributes:**
+
+    * ``capacity`` **(int)** - Buffer size. Largest frame which can be received.
+    * ``check_crc`` **(bool)** - Drop frames with invalid CRC. Default value: ``True``.
+    * ``skipped`` **(int)** - Number of bytes discarded while searching for SYNC.
+    * ``crc_errors`` **(int)** - Number of frames dropped due invalid CRC.
+
+    **Raises:**
+
+        FrameError
+    When capacity can't hold largest C37.118 frame header.
+    """
+
+    MIN_FRAME_SIZE = 16  # SYNC, FRAMESIZE, IDCODE, SOC, FRASEC and CHK
+
+    def __init__(self, capacity=65536, check_crc=True):
+
+        if capacity < StreamFramer.MIN_FRAME_SIZE:
+            raise FrameError("Capacity should be at least {:d} bytes.".format(StreamFramer.MIN_FRAME_SIZE))
+
+        self.capacity = capacity
+        self.check_crc = check_crc
+        self.skipped = 0
+        self.crc_errors = 0
+
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # First byte not returned yet
+        self._end = 0  # End of received bytes
+
+
+    def __len__(self):
+
+        return self._end - self._start
+
+
+    def _compact(self):
+
+        # Move incomplete frame to the beginning, it's always shorter than one frame
+        pending = self._end - self._start
+
+        if pending and self._start:
+            self._buffer[:pending] = bytes(self._view[self._start:self._end])
+
+        self._start = 0
+        self._end = pending
+
+
+    def reset(self):
+
+        self._start = 0
+        self._end = 0
+
+
+    def feed(self, data):
+        """
+        ### feed() ###
+
+        Append chunk of stream to the buffer.
+
+        **Params:**
+
+        * ``data`` **(mixed)** - ``bytes``, ``bytearray`` or ``memoryview``.
+
+        **Raises:**
+
+            FrameError
+        When chunk does not fit into free space of the buffer.
+
+        """
+
+        self._compact()
+
+        size = len(data)
+
+        if size > self.capacity - self._end:
+            raise FrameError("Stream buffer overflow. {:d} bytes free, got {:d}.".format(
+                self.capacity - self._end, size))
+
+        self._view[self._end:self._end + size] = data
+        self._end += size
+
+
+    def recv_into(self, sock):
+        """
+        ### recv_into() ###
+
+        Receive from stream socket directly into free space of the buffer.
+
+        **Params:**
+
+        * ``sock`` **(socket)** - Connected stream socket.
+
+        **Returns:**
+
+        * ``int`` number of bytes received, ``0`` when peer closed connection.
+
+        **Raises:**
+
+            FrameError
+        When buffer is full.
+
+        """
+
+        self._compact()
+
+        if self._end == self.capacity:
+            raise FrameError("Stream buffer overflow. Read frames before receiving more.")
+
+        nbytes = sock.recv_into(self._view[self._end:])
+        self._end += nbytes
+
+        return nbytes
+
+
+    def next_frame(self):
+        """
+        ### next_frame() ###
+
+        Get next complete frame from the buffer.
+
+        **Returns:**
+
+        * ``memoryview`` of complete frame or ``None`` when more bytes are needed.
+
+        """
+
+        buffer = self._buffer
+
+        while self._end - self._start >= 4:
+
+            start = self._start
+
+            if buffer[start] != 0xAA:
+                sync = buffer.find(b"\xaa", start + 1, self._end)
+                if sync < 0:
+                    sync = self._end
+                self.skipped += sync - start
+                self._start = sync
+                continue
+
+            frame_size = (buffer[start + 2] << 8) | buffer[start + 3]
+
+            if buffer[start + 1] >> 4 not in CommonFrame.FRAME_TYPES_WORDS or \
+                    not StreamFramer.MIN_FRAME_SIZE <= frame_size <= self.capacity:
+                # Not SYNC word, keep searching from next byte
+                self.skipped += 1
+                self._start = start + 1
+                continue
+
+            if self._end - start < frame_size:
+                return None  # Incomplete frame, fits into buffer once it's compacted
+
+            if self.check_crc and not CommonFrame._check_crc(self._view, start, frame_size):
+                self.crc_errors += 1
+                self.skipped += 1
+                self._start = start + 1
+                continue
+
+            self._start = start + frame_size
+
+            return self._view[start:self._start]
+
+        return None
+
+
+    def __iter__(self):
+
+        frame = self.next_frame()
+
+        while frame is not None:
+            yield frame
+            frame = self.next_frame()
 
 
 class FrameError(BaseException):
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Staged processing with bounded queues.
+
+Every stage is a worker thread draining its own bounded queue, producers only
+ever touch the queue:
+
+    receive --> [decode] --> [align] --> [publish]
+                    |
+                    +------> [store]
+                    +------> [analyze]
+
+What happens when stage queue is full is policy of that stage:
+
+* ``drop``        - new item is discarded and counted, producer never waits,
+* ``drop_oldest`` - oldest queued item is discarded to make room (latest
+                    state matters more than complete history),
+* ``block``       - producer waits for room, backpressure to stage upstream.
+
+Thread reading the socket only puts into non-blocking stages, so slow stage
+costs its own items (or items of stages feeding it), never socket reads.
+
+Errors raised by handler are counted and the worker carries on with the next
+batch. Handler of stage gets list of items - everything queued up to ``batch`` - so
+stage behind its producer catches up with bigger batches (e.g. fewer SQLite
+transactions). Handler is also called with empty list after ``idle_sec``
+without items, for timers of stage (timeouts, periodic flushes).
+"""
+from queue import Queue, Empty, Full
+from threading import Thread, Event
+from time import monotonic
+
+from frame import FrameError
+
+DROP = 'drop'
+DROP_OLDEST = 'drop_oldest'
+BLOCK = 'block'
+POLICIES = (DROP, DROP_OLDEST, BLOCK)
+
+
+class Stage(object):
+    """Bounded queue with worker thread.
+    `name`      - stage name in statistics
+    `handler`   - called in worker thread with list of queued items
+    `maxsize`   - queue capacity in items
+    `policy`    - 'drop', 'drop_oldest' or 'block' when queue is full
+    `batch`     - items passed to handler at most
+    `idle_sec`  - handler is called with [] after this long without items
+    """
+
+    def __init__(self, name, handler, maxsize=1024, policy=DROP, batch=64, idle_sec=0.5):
+        if policy not in POLICIES:
+            raise ValueError("Unknown queue policy {}, expected one of {}".format(policy, POLICIES))
+
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch = batch
+        self.idle_sec = idle_sec
+
+        self._queue = Queue(maxsize)
+        self._stopping = Event()
+        self._thread = Thread(target=self._run, name="stage-" + name, daemon=True)
+
+        self.stats = {
+            'put': 0,           # Items accepted into queue
+            'processed': 0,     # Items handled by worker
+            'dropped': 0,       # Items discarded by policy (new ones for 'drop', oldest for 'drop_oldest')
+            'blocked': 0,       # Puts which waited for room
+            'blocked_sec': 0.0, # Time producers spent waiting
+            'batches': 0,
+            'errors': 0,        # Handler calls which raised
+            'max_depth': 0,
+        }
+        self.last_error = None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def put(self, item):
+        """Queue item according to policy, returns False when it was dropped."""
+        try:
+            self._queue.put_nowait(item)
+        except Full:
+            if self.policy == DROP:
+                self.stats['dropped'] += 1
+                return False
+
+            if self.policy == DROP_OLDEST:
+                while True:
+                    try:
+                        self._queue.get_nowait()
+                        self.stats['dropped'] += 1
+                    except Empty:
+                        pass
+                    try:
+                        self._queue.put_nowait(item)
+                        break
+                    except Full:
+                        continue
+            else:
+                waiting_since = monotonic()
+                self._queue.put(item)
+                self.stats['blocked'] += 1
+                self.stats['blocked_sec'] += monotonic() - waiting_since
+
+        self.stats['put'] += 1
+        depth = self._queue.qsize()
+        if depth > self.stats['max_depth']:
+            self.stats['max_depth'] = depth
+        return True
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def fill(self):
+        """Queue depth as fraction of capacity."""
+        return self._queue.qsize() / self.maxsize if self.maxsize > 0 else 0.0
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            try:
+                items = [queue.get(timeout=self.idle_sec)]
+            except Empty:
+                if self._stopping.is_set():
+                    break
+                items = []
+
+            # Everything already queued goes to handler in one call
+            while items and len(items) < self.batch:
+                try:
+                    items.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            # Bad item costs its own batch only - worker dying would leave queue undrained and
+            # 'block' producers waiting forever (FrameError derives from BaseException)
+            try:
+                self.handler(items)
+            except (FrameError, Exception) as e:
+                self.stats['errors'] += 1
+                self.last_error = "{}: {}".format(type(e).__name__, e)
+
+            if items:
+                self.stats['processed'] += len(items)
+                self.stats['batches'] += 1
+
+    def stop(self, timeout=5.0):
+        """Handle what is queued, then stop worker."""
+        self._stopping.set()
+        self._thread.join(timeout)
+
+    def get_stats(self):
+        return dict(self.stats, name=self.name, policy=self.policy, depth=self._queue.qsize(),
+                    maxsize=self.maxsize, fill=round(self.fill(), 3), blocked_sec=round(self.stats['blocked_sec'], 3),
+                    last_error=self.last_error)
+
+
+class Pipeline(object):
+    """Stages started together and stopped upstream first, so every stage drains
+    into stages which still run.
+    `stages`    - Stage instances in upstream to downstream order
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self._by_name = {stage.name: stage for stage in self.stages}
+
+    def __getitem__(self, name):
+        return self._by_name[name]
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        for stage in self.stages:
+            stage.stop(timeout)
+
+    def max_fill(self, policies=None, names=()):
+        """Fill of fullest queue - load signal for rate control.
+        `policies`  - only stages with one of these policies, None for all
+        `names`     - stages counted whatever their policy
+        """
+        fills = [stage.fill() for stage in self.stages
+                 if policies is None or stage.policy in policies or stage.name in names]
+        return max(fills) if fills else 0.0
+
+    def get_stats(self):
+        return [stage.get_stats() for stage in self.stages]
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Command frame backpressure between PDC and PMUs.
+
+PDC watches its own load - how full receive batches are, how late frames are
+processed behind their timestamp and kernel receive drops - and throttles PMUs
+at the source with C37.118 command frames instead of letting kernel drop
+datagrams:
+
+* ``extended`` with rate change - steps DATA_RATE of every stream down
+  (``rate_steps``, never above stream's own nominal rate) when overloaded
+  and back up when load is low again,
+* ``stop`` / ``start`` - at lowest rate PDC sheds newest streams,
+  restarts them first when load drops,
+* ``cfg2`` - requests configuration from PMUs PDC has no CFG-2 for.
+
+Rate change is extended command with 4 byte payload:
+
+    +------------+-----------+
+    | RATE_TAG   | DATA_RATE |
+    |  2 B (RC)  |  2 B int  |
+    +------------+-----------+
+
+PMU applies new rate and sends CFG-2 with new DATA_RATE, which PDC takes as
+confirmation. Commands which were not confirmed are repeated every
+``hold_sec``.
+"""
+from struct import Struct
+from time import monotonic
+
+from frame import CommandFrame
+
+RATE_TAG = 0x5243  # "RC"
+RATE_FORMAT = Struct("!Hh")  # RATE_TAG, DATA_RATE
+
+
+def rate_command(pmu_id_code, data_rate):
+    """Extended command frame asking PMU to send with `data_rate`."""
+    return CommandFrame(pmu_id_code, "extended", RATE_FORMAT.pack(RATE_TAG, data_rate)).convert2bytes()
+
+
+def command_rate(command_frame):
+    """DATA_RATE requested by command frame, None if it's not rate change."""
+    extended_frame = command_frame.get_extended_frame()
+    if extended_frame is None or len(extended_frame) != RATE_FORMAT.size:
+        return None
+
+    tag, data_rate = RATE_FORMAT.unpack(extended_frame)
+    return data_rate if tag == RATE_TAG and data_rate != 0 else None
+
+
+def frames_per_sec(data_rate):
+    """DATA_RATE > 0 is frames per second, < 0 is seconds per frame."""
+    return data_rate if data_rate > 0 else 1.0 / -data_rate
+
+
+def is_command(byte_data):
+    """True if datagram is C37.118 command frame (not ACK or text response)."""
+    return len(byte_data) >= 18 and byte_data[0] == 0xAA and (byte_data[1] >> 4) & 0x7 == 4
+
+
+class StreamState(object):
+    """Command state of one PMU stream kept by LoadController."""
+    __slots__ = ('addr', 'rate', 'stopped', 'last_command', 'config_requested', 'nominal', 'started')
+
+    def __init__(self, addr, rate, nominal):
+        self.addr = addr                    # Where commands are sent
+        self.rate = rate                    # DATA_RATE confirmed by CFG-2, None if unknown
+        self.stopped = False                # Shed by stop command
+        self.last_command = None            # Time of last stop/start/rate command
+        self.config_requested = None        # Time of last CFG-2 request
+        self.nominal = nominal              # DATA_RATE of first CFG-2, first rate step without one
+        self.started = None                 # Time start was sent, None once frames arrive
+
+
+class LoadController(object):
+    """PDC side - decides commands from load observed in receive loop.
+    `rate_steps`        - DATA_RATE cap per load level, first is nominal for
+                          streams which never sent CFG-2
+    `high_lateness_ms`  - processing lateness (receive time - frame timestamp)
+                          above which PDC is overloaded
+    `low_lateness_ms`   - lateness below which PDC has spare capacity
+    `high_depth`        - receive batch fill (batch size / max batch) for overload
+    `low_depth`         - batch fill for spare capacity
+    `hold_sec`          - minimum time between load level changes and command repeats
+    `shed_fraction`     - part of active streams stopped per step at lowest rate
+    `alpha`             - EWMA weight of new lateness/depth sample
+    """
+
+    def __init__(self, rate_steps=(30, 15, 10), high_lateness_ms=100, low_lateness_ms=20, high_depth=0.75,
+                 low_depth=0.25, hold_sec=2.0, shed_fraction=0.25, alpha=0.2):
+        self.rate_steps = tuple(rate_steps)
+        self.high_lateness = high_lateness_ms / 1000.0
+        self.low_lateness = low_lateness_ms / 1000.0
+        self.high_depth = high_depth
+        self.low_depth = low_depth
+        self.hold_sec = hold_sec
+        self.shed_fraction = shed_fraction
+        self.alpha = alpha
+
+        self.level = 0          # Index to rate_steps
+        self.lateness = 0.0     # EWMA in seconds
+        self.depth = 0.0        # EWMA of batch fill
+        self.kernel_drops = None
+        self._new_drops = False
+        self._frames = 0        # Frames since last load evaluation
+        self._last_change = monotonic()
+
+        self._streams = {}  # IDCODE -> StreamState
+        self._queued = []
+
+        self.commands_sent = {'rate': 0, 'stop': 0, 'start': 0, 'cfg2': 0}
+
+    def target_rate(self, nominal=None):
+        """DATA_RATE of current level for stream with `nominal` rate."""
+        step = self.rate_steps[self.level]
+        if nominal is None or self.level == 0 or frames_per_sec(nominal) < frames_per_sec(step):
+            return nominal if nominal is not None else step
+        return step
+
+    def _stream(self, pmu_id_code, addr, data_rate=None):
+        stream = self._streams.get(pmu_id_code)
+        if stream is None:
+            nominal = self.rate_steps[0] if data_rate is None else data_rate
+            stream = self._streams[pmu_id_code] = StreamState(addr, data_rate, nominal)
+        if addr is not None:
+            stream.addr = addr
+        return stream
+
+    def on_frame(self, pmu_id_code, addr, lateness, needs_config=False, now=None):
+        """Account decoded data frame, `lateness` in seconds."""
+        now = monotonic() if now is None else now
+        self.lateness += self.alpha * (lateness - self.lateness)
+        self._frames += 1
+
+        stream = self._stream(pmu_id_code, addr)
+        stream.started = None
+
+        if needs_config and (stream.config_requested is None or now - stream.config_requested >= self.hold_sec):
+            stream.config_requested = now
+            self._queue(pmu_id_code, 'cfg2')
+
+        # Stopped stream still sending - stop command was lost
+        if stream.stopped and now - stream.last_command >= self.hold_sec:
+            self._queue(pmu_id_code, 'stop', now)
+
+    def on_config(self, pmu_id_code, addr, data_rate):
+        """Account CFG-2 received from PMU - first one gives nominal rate, later ones confirm rate change."""
+        stream = self._stream(pmu_id_code, addr, data_rate)
+        stream.rate = data_rate
+        stream.config_requested = None
+
+    def on_batch(self, depth, kernel_drops=None):
+        """Account receive batch, `depth` is batch size / max batch size."""
+        self.depth += self.alpha * (depth - self.depth)
+
+        if kernel_drops is not None:
+            if self.kernel_drops is not None and kernel_drops > self.kernel_drops:
+                self._new_drops = True
+            self.kernel_drops = kernel_drops
+
+    def _queue(self, pmu_id_code, command, now=None):
+        stream = self._streams[pmu_id_code]
+        if command == 'rate':
+            payload = rate_command(pmu_id_code, self.target_rate(stream.nominal))
+        else:
+            payload = CommandFrame(pmu_id_code, command).convert2bytes()
+
+        if now is not None:
+            stream.last_command = now
+        self._queued.append((stream.addr, payload))
+        self.commands_sent[command] += 1
+
+    def commands(self, now=None):
+        """Commands due, returns list of (addr, command frame bytes)."""
+        now = monotonic() if now is None else now
+
+        if now - self._last_change >= self.hold_sec:
+            # Nothing received (e.g. all streams stopped) - load samples decay instead of staying stale
+            if not self._frames:
+                self.lateness *= 1 - self.alpha
+                self.depth *= 1 - self.alpha
+            self._frames = 0
+
+            overloaded = self.lateness > self.high_lateness or self.depth > self.high_depth or self._new_drops
+            relaxed = self.lateness < self.low_lateness and self.depth < self.low_depth
+            self._new_drops = False
+
+            if overloaded:
+                self._step_down(now)
+            elif relaxed:
+                self._step_up(now)
+
+            self._repeat(now)
+
+        queued, self._queued = self._queued, []
+        return queued
+
+    def _step_down(self, now):
+        self._last_change = now
+
+        if self.level < len(self.rate_steps) - 1:
+            self.level += 1
+            return
+
+        # Lowest rate and still overloaded - shed newest streams
+        active = [pmu_id_code for pmu_id_code, stream in self._streams.items() if not stream.stopped]
+        count = max(1, int(len(active) * self.shed_fraction)) if len(active) > 1 else 0
+        for pmu_id_code in active[len(active) - count:]:
+            self._streams[pmu_id_code].stopped = True
+            self._queue(pmu_id_code, 'stop', now)
+
+    def _step_up(self, now):
+        stopped = [pmu_id_code for pmu_id_code, stream in self._streams.items() if stream.stopped]
+
+        if stopped:
+            # Restart shed streams before raising rate, oldest first
+            self._last_change = now
+            count = max(1, int(len(self._streams) * self.shed_fraction))
+            for pmu_id_code in stopped[:count]:
+                self._streams[pmu_id_code].stopped = False
+                self._streams[pmu_id_code].started = now
+                self._queue(pmu_id_code, 'start', now)
+        elif self.level > 0:
+            self._last_change = now
+            self.level -= 1
+
+    def _repeat(self, now):
+        for pmu_id_code, stream in self._streams.items():
+            if stream.stopped:
+                continue
+
+            # Started stream still silent - start command was lost
+            if stream.started is not None and now - stream.started >= self.hold_sec:
+                stream.started = now
+                self._queue(pmu_id_code, 'start', now)
+                continue
+
+            # Rate change not confirmed by CFG-2 yet - (re)send. Streams with unknown rate are left alone at nominal level
+            if stream.rate is None and self.level == 0:
+                continue
+            if stream.rate != self.target_rate(stream.nominal) and \
+                    (stream.last_command is None or now - stream.last_command >= self.hold_sec):
+                self._queue(pmu_id_code, 'rate', now)
+
+    def get_stats(self):
+        return {
+            'level': self.level,
+            'rate_cap': self.rate_steps[self.level],
+            'lateness_ms': round(self.lateness * 1000, 1),
+            'depth': round(self.depth, 2),
+            'streams': len(self._streams),
+            'stopped': sum(stream.stopped for stream in self._streams.values()),
+            'commands': dict(self.commands_sent),
+        }
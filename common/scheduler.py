@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Deadline scheduler for PMU data frames.
+
+Frames are sent on the reporting grid defined by DATA_RATE - for 30 fps at
+SOC + 0, 1/30, 2/30 ... seconds - which is the grid PDC aligns streams on.
+Every frame has an absolute deadline on the monotonic clock, so time spent
+measuring, encoding and sending never accumulates into drift like sleeping
+for one period after the work does.
+
+    scheduler = FrameScheduler(cfg.get_data_rate(), cfg.get_time_base())
+    while True:
+        soc, frasec = scheduler.wait()
+        pmu.send_to_PDC(encoder.encode(soc, frasec, ...))
+
+If sender falls behind by whole periods the missed grid points are skipped
+(and counted) instead of being sent late in a burst.
+"""
+from math import sqrt
+from time import time, monotonic, sleep as time_sleep
+
+
+class FrameScheduler(object):
+    """Absolute deadlines aligned to SOC/FRASEC grid.
+    `data_rate`     - DATA_RATE from configuration, > 0 frames per second,
+                      < 0 seconds per frame
+    `time_base`     - TIME_BASE from configuration, FRASEC resolution
+    `spin`          - seconds before deadline to stop sleeping and busy wait,
+                      0 only sleeps (less CPU, more jitter)
+    """
+
+    def __init__(self, data_rate=30, time_base=1000000, spin=0.0005):
+        self.time_base = time_base
+        self.spin = spin
+
+        # Wall clock is sampled once - deadlines follow monotonic clock even if wall clock is stepped
+        self._wall_offset = time() - monotonic()
+        self.set_data_rate(data_rate)
+
+        self.frames = 0
+        self.skipped = 0        # Grid points missed because sender was more than a period late
+        self.max_lateness = 0.0
+        self._lateness_mean = 0.0
+        self._lateness_m2 = 0.0
+        self._first_sent = None
+        self._last_sent = None
+
+    def set_data_rate(self, data_rate):
+        """Switch to grid of new DATA_RATE from next frame on (e.g. rate change command from PDC)."""
+        if data_rate == 0:
+            raise ValueError("DATA_RATE must not be 0")
+
+        # Grid point k is at k * num / den seconds since epoch - kept as integers so it never drifts
+        self._num, self._den = (1, data_rate) if data_rate > 0 else (-data_rate, 1)
+        self.data_rate = data_rate
+        self.period = self._num / self._den
+
+        # First grid point from now on
+        self._next = int((monotonic() + self._wall_offset) * self._den) // self._num + 1
+
+    def timestamp(self, tick):
+        """(SOC, FRASEC) of grid point `tick`."""
+        soc, remainder = divmod(tick * self._num, self._den)
+        frasec = (2 * remainder * self.time_base + self._den) // (2 * self._den)  # Rounded to nearest
+
+        return soc, frasec
+
+    def deadline(self, tick):
+        """Monotonic time of grid point `tick`."""
+        return tick * self._num / self._den - self._wall_offset
+
+    def wait(self):
+        """Sleep until next grid point, returns its (SOC, FRASEC)."""
+        tick = self._next
+        deadline = self.deadline(tick)
+
+        remaining = deadline - monotonic()
+        if remaining > self.spin:
+            time_sleep(remaining - self.spin)
+        while monotonic() < deadline:
+            pass
+
+        lateness = monotonic() - deadline
+
+        # Whole periods late - jump to newest grid point, PDC can't use stale timestamps anyway
+        if lateness >= self.period:
+            missed = int(lateness / self.period)
+            tick += missed
+            self.skipped += missed
+            lateness -= missed * self.period
+
+        self._next = tick + 1
+        self._account(lateness)
+
+        self._last_sent = monotonic()
+        if self._first_sent is None:
+            self._first_sent = self._last_sent
+
+        return self.timestamp(tick)
+
+    def _account(self, lateness):
+        # Welford's running mean and variance of lateness
+        self.frames += 1
+        delta = lateness - self._lateness_mean
+        self._lateness_mean += delta / self.frames
+        self._lateness_m2 += delta * (lateness - self._lateness_mean)
+
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+    def get_stats(self):
+        """Lateness behind deadlines in microseconds, jitter is its standard deviation."""
+        elapsed = self._last_sent - self._first_sent if self.frames > 1 else 0.0
+        jitter = sqrt(self._lateness_m2 / (self.frames - 1)) if self.frames > 1 else 0.0
+
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'rate': round((self.frames - 1) / elapsed, 2) if elapsed > 0 else 0.0,
+            'lateness_mean_us': round(self._lateness_mean * 1e6, 1),
+            'lateness_max_us': round(self.max_lateness * 1e6, 1),
+            'jitter_us': round(jitter * 1e6, 1),
+        }
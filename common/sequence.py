@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Per-PMU sequence tracking of data frames.
+
+C37.118 frames carry no sequence number, but every data stream reports on
+grid defined by DATA_RATE, so timestamp of frame gives its position on grid:
+
+    tick = round((SOC + FRASEC / TIME_BASE) * frames per second)
+
+Tracker keeps the highest tick received from each IDCODE and bitmap of
+ticks received in the last ``window`` grid points behind it. Every arrival
+is classified from header bytes only, before frame is decoded:
+
+* ``in_order``  - next tick,
+* ``gap``       - newer than next tick, frames in between are counted lost,
+* ``duplicate`` - tick already received, caller drops frame,
+* ``reordered`` - older tick missing from bitmap, was counted lost before,
+* ``late``      - older than bitmap or than restart of tracking, duplicates
+                  can't be told apart,
+* ``first``     - first frame of stream or frame after outage / rate change.
+
+Gaps longer than ``max_gap_sec`` (PMU stopped, restarted or clock stepped)
+are counted as outages instead of lost frames.
+"""
+from struct import Struct
+from time import monotonic
+
+FIRST = 'first'
+IN_ORDER = 'in_order'
+GAP = 'gap'
+DUPLICATE = 'duplicate'
+REORDERED = 'reordered'
+LATE = 'late'
+
+HEADER_FORMAT = Struct("!HII")  # IDCODE, SOC, time quality + FRASEC - from offset 4 of frame
+COUNTERS = ('received', IN_ORDER, GAP, 'lost', DUPLICATE, REORDERED, LATE, 'outages')
+
+
+def new_counters():
+    return dict.fromkeys(COUNTERS, 0)
+
+
+def loss_pct(counters):
+    """Lost frames as percentage of expected (received without duplicates + lost)."""
+    expected = counters['received'] - counters[DUPLICATE] + counters['lost']
+    return round(100.0 * counters['lost'] / expected, 3) if expected > 0 else 0.0
+
+
+class SequenceTracker(object):
+    """PDC side - classifies data frames of every IDCODE on its reporting grid.
+    `window`        - grid points behind newest frame remembered for duplicate
+                      and reorder detection
+    `max_gap_sec`   - longer gaps (either direction) are outages, not lost frames
+    `interval_sec`  - length of rolling interval reported next to totals
+    `data_rate`     - DATA_RATE assumed for IDCODEs without configuration
+    `time_base`     - TIME_BASE assumed for IDCODEs without configuration
+    """
+
+    def __init__(self, window=256, max_gap_sec=5.0, interval_sec=10.0, data_rate=30, time_base=1000000):
+        self.window = window
+        self._window_mask = (1 << window) - 1
+        self.max_gap_sec = max_gap_sec
+        self.interval_sec = interval_sec
+        self.default_grid = self._grid(data_rate, time_base)
+
+        # IDCODE -> [highest tick, bitmap of received ticks (bit n is highest tick - n), counters,
+        #            tick tracking (re)started at]
+        self._streams = {}
+        # IDCODE -> grid from its CFG-2
+        self._grids = {}
+
+        self.totals = new_counters()
+        self.interval = new_counters()        # Interval in progress
+        self.last_interval = new_counters()   # Last complete interval
+        self._interval_start = monotonic()
+
+    def _grid(self, data_rate, time_base):
+        # Tick is (SOC * TIME_BASE + FRASEC) * num / den rounded - integers, so grid never drifts
+        if data_rate > 0:
+            num, den = data_rate, time_base
+        else:
+            num, den = 1, -data_rate * time_base
+        max_gap = max(1, int(self.max_gap_sec * num * time_base / den))
+        return time_base, num, den, max_gap
+
+    def set_config(self, pmu_id_code, data_rate, time_base):
+        """Configuration (CFG-2) of IDCODE - new DATA_RATE restarts tracking on new grid."""
+        grid = self._grid(data_rate, time_base)
+        if self._grids.get(pmu_id_code, self.default_grid) != grid:
+            stream = self._streams.get(pmu_id_code)
+            if stream is not None:
+                stream[0] = None
+        self._grids[pmu_id_code] = grid
+
+    def classify(self, byte_data, offset=0, now=None):
+        """Classify data frame by its header, returns (IDCODE, class)."""
+        pmu_id_code, soc, frasec = HEADER_FORMAT.unpack_from(byte_data, offset + 4)
+        time_base, num, den, max_gap = self._grids.get(pmu_id_code, self.default_grid)
+        tick = (2 * (soc * time_base + (frasec & 0xffffff)) * num + den) // (2 * den)
+
+        stream = self._streams.get(pmu_id_code)
+        if stream is None:
+            stream = self._streams[pmu_id_code] = [None, 0, new_counters(), None]
+
+        highest = stream[0]
+        lost = 0
+        if highest is None:
+            kind = FIRST
+        else:
+            ahead = tick - highest
+            if ahead == 1:
+                kind = IN_ORDER
+            elif ahead > max_gap or -ahead > max_gap:
+                kind = FIRST
+                self._count(stream[2], 'outages', 1)
+            elif ahead > 1:
+                kind = GAP
+                lost = ahead - 1
+            elif -ahead >= self.window or tick < stream[3]:
+                kind = LATE
+            elif stream[1] >> -ahead & 1:
+                kind = DUPLICATE
+            else:
+                kind = REORDERED
+                lost = -1
+
+        if kind is FIRST:
+            stream[0], stream[1], stream[3] = tick, 1, tick
+        elif kind is IN_ORDER or kind is GAP:
+            stream[0] = tick
+            stream[1] = (stream[1] << (tick - highest) | 1) & self._window_mask
+        elif kind is REORDERED:
+            stream[1] |= 1 << (highest - tick)
+
+        counters = stream[2]
+        self._count(counters, 'received', 1)
+        if kind is not FIRST:
+            self._count(counters, kind, 1)
+        if lost:
+            self._count(counters, 'lost', lost)
+
+        now = monotonic() if now is None else now
+        if now - self._interval_start >= self.interval_sec:
+            self._interval_start = now
+            self.last_interval, self.interval = self.interval, new_counters()
+
+        return pmu_id_code, kind
+
+    def _count(self, counters, key, value):
+        counters[key] += value
+        self.totals[key] += value
+        self.interval[key] += value
+
+    def get_stream_stats(self, pmu_id_code):
+        """Counters of one IDCODE, None if it never sent data."""
+        stream = self._streams.get(pmu_id_code)
+        return None if stream is None else dict(stream[2], loss_pct=loss_pct(stream[2]))
+
+    def get_stats(self):
+        """Totals over all IDCODEs, last complete interval and IDCODEs which lost or duplicated frames."""
+        return {
+            'streams': len(self._streams),
+            'totals': dict(self.totals, loss_pct=loss_pct(self.totals)),
+            'interval': dict(self.last_interval, loss_pct=loss_pct(self.last_interval)),
+            'lossy_streams': sorted(pmu_id_code for pmu_id_code, stream in self._streams.items()
+                                    if stream[2]['lost'] or stream[2][DUPLICATE]),
+        }
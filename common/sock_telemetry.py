@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Socket buffer sizing and kernel drop telemetry for UDP receivers.
+
+Datagrams which arrive while socket receive queue is full are dropped by
+kernel before PDC sees them. Two Linux counters tell those drops apart from
+loss on the network:
+
+* ``SO_RXQ_OVFL`` - kernel attaches number of datagrams dropped on socket so
+  far as ancillary data to every received datagram.
+* ``/proc/net/udp`` (``/proc/net/udp6``) - ``drops`` column of socket row,
+  found by socket inode, together with bytes waiting in receive queue.
+
+On other platforms both counters are reported as None.
+"""
+import os
+import socket
+import sys
+from struct import unpack_from
+from time import monotonic
+
+LINUX = sys.platform.startswith("linux")
+SO_RXQ_OVFL = getattr(socket, "SO_RXQ_OVFL", 40 if LINUX else None)
+SO_RCVBUFFORCE = getattr(socket, "SO_RCVBUFFORCE", 33 if LINUX else None)
+SO_SNDBUFFORCE = getattr(socket, "SO_SNDBUFFORCE", 32 if LINUX else None)
+
+# Room for one SO_RXQ_OVFL control message (uint32 counter)
+RXQ_OVFL_ANCBUFSIZE = socket.CMSG_SPACE(4) if hasattr(socket, "CMSG_SPACE") else 0
+
+
+def set_socket_buffers(sock, rcvbuf=None, sndbuf=None):
+    """Request receive/send buffer sizes in bytes, None keeps kernel default.
+    Sizes above net.core.rmem_max/wmem_max are forced when process has
+    CAP_NET_ADMIN, otherwise kernel caps them silently.
+    Return effective (rcvbuf, sndbuf) - Linux reports double of requested size
+    as it accounts bookkeeping overhead.
+    """
+    for size, option, force_option in ((rcvbuf, socket.SO_RCVBUF, SO_RCVBUFFORCE),
+                                       (sndbuf, socket.SO_SNDBUF, SO_SNDBUFFORCE)):
+        if size is None:
+            continue
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, force_option, size)
+        except (OSError, TypeError):
+            sock.setsockopt(socket.SOL_SOCKET, option, size)
+
+    return (sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+            sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF))
+
+
+def enable_rxq_ovfl(sock):
+    """Ask kernel to attach drop counter to received datagrams, returns False if not supported."""
+    if SO_RXQ_OVFL is None or not RXQ_OVFL_ANCBUFSIZE:
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+    except OSError:
+        return False
+    return True
+
+
+def rxq_ovfl_counter(ancdata):
+    """SO_RXQ_OVFL counter from ancillary data of recvmsg(), None if not attached.
+    Kernel attaches it only after first drop on socket.
+    """
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == SO_RXQ_OVFL and len(data) >= 4:
+            return unpack_from("=I", data)[0]
+    return None
+
+
+def proc_net_udp(sock):
+    """Row of socket in /proc/net/udp as {'rx_queue': bytes, 'tx_queue': bytes, 'drops': n},
+    None if not available.
+    """
+    if not LINUX:
+        return None
+
+    try:
+        inode = str(os.fstat(sock.fileno()).st_ino)
+        table = "/proc/net/udp6" if sock.family == socket.AF_INET6 else "/proc/net/udp"
+        with open(table) as f:
+            next(f)  # Header
+            for line in f:
+                fields = line.split()
+                # sl local rem st tx_queue:rx_queue tr:tm retrnsmt uid timeout inode ref pointer drops
+                if len(fields) >= 13 and fields[9] == inode:
+                    tx_queue, rx_queue = fields[4].split(":")
+                    return {'rx_queue': int(rx_queue, 16), 'tx_queue': int(tx_queue, 16),
+                            'drops': int(fields[12])}
+    except (OSError, ValueError, StopIteration):
+        pass
+
+    return None
+
+
+class SocketTelemetry(object):
+    """Buffer sizes and kernel drop counters of one bound UDP socket.
+    `sock`          - bound UDP socket
+    `rcvbuf`        - requested SO_RCVBUF in bytes, None keeps default
+    `sndbuf`        - requested SO_SNDBUF in bytes, None keeps default
+    `rxq_ovfl`      - enable SO_RXQ_OVFL, receivers must then use recvmsg_into()
+                      with `ancbufsize` and pass ancdata to on_ancdata()
+    """
+
+    def __init__(self, sock, rcvbuf=None, sndbuf=None, rxq_ovfl=True):
+        self.sock = sock
+        self.rcvbuf, self.sndbuf = set_socket_buffers(sock, rcvbuf, sndbuf)
+        self.rxq_ovfl = rxq_ovfl and enable_rxq_ovfl(sock)
+        self.ancbufsize = RXQ_OVFL_ANCBUFSIZE if self.rxq_ovfl else 0
+
+        self.rxq_drops = 0      # Last SO_RXQ_OVFL counter - datagrams dropped before reaching us
+        self.drop_events = 0    # Received datagrams which had new drops queued before them
+
+        # /proc/net/udp lists every UDP socket of host, it's read at most once per proc_interval
+        self.proc_interval = 1.0
+        self._proc = None
+        self._proc_time = None
+
+    def on_ancdata(self, ancdata):
+        """Account ancillary data of received datagram, returns datagrams dropped right before it."""
+        if not ancdata:
+            return 0
+
+        counter = rxq_ovfl_counter(ancdata)
+        if counter is None:
+            return 0
+
+        dropped = (counter - self.rxq_drops) & 0xffffffff
+        if dropped:
+            self.rxq_drops = counter
+            self.drop_events += 1
+        return dropped
+
+    def get_stats(self):
+        """Buffer sizes, SO_RXQ_OVFL drops and /proc/net/udp drops (None where not available)."""
+        now = monotonic()
+        if self._proc_time is None or now - self._proc_time >= self.proc_interval:
+            self._proc = proc_net_udp(self.sock)
+            self._proc_time = now
+        proc = self._proc
+
+        return {
+            'rcvbuf': self.rcvbuf,
+            'sndbuf': self.sndbuf,
+            'rxq_ovfl_drops': self.rxq_drops if self.rxq_ovfl else None,
+            'proc_drops': proc['drops'] if proc else None,
+            'rx_queue_bytes': proc['rx_queue'] if proc else None,
+        }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Streaming statistics of PMU measurements.
+
+Every value updates running statistics in O(1) time and memory, so reading
+them costs the same however long PDC runs and however many rows are stored:
+
+* mean and variance - Welford's single pass, numerically stable,
+* EWMA              - recent level, `alpha` is weight of newest value,
+* min / max.
+
+Statistics are kept per IDCODE and over all IDCODEs:
+
+    stats = StreamStats(('frequency', 'comm_delay'))
+    stats.update(pmu_id, (frame_data['frequency'], comm_delay))
+    stats.get_stream_stats(pmu_id)['frequency']['ewma']
+"""
+from math import sqrt
+
+
+class RunningStats(object):
+    """Welford mean/variance, EWMA and min/max of one value stream.
+    `alpha`     - EWMA weight of newest value, 0 < alpha <= 1
+    """
+    __slots__ = ('alpha', 'count', 'mean', '_m2', 'ewma', 'min', 'max')
+
+    def __init__(self, alpha=0.1):
+        if not 0 < alpha <= 1:
+            raise ValueError("EWMA alpha must be in (0, 1], got {}".format(alpha))
+
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.ewma = None
+        self.min = None
+        self.max = None
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if self.ewma is None:
+            self.ewma, self.min, self.max = value, value, value
+        else:
+            self.ewma += self.alpha * (value - self.ewma)
+            if value < self.min:
+                self.min = value
+            elif value > self.max:
+                self.max = value
+
+    def variance(self):
+        """Sample variance, 0 below two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return sqrt(self.variance())
+
+    def get_stats(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std(),
+            'ewma': self.ewma,
+            'min': self.min,
+            'max': self.max,
+        }
+
+
+class StreamStats(object):
+    """Running statistics of fixed fields per IDCODE and over all IDCODEs.
+    `fields`    - names of values passed to update, in order
+    `alpha`     - EWMA weight of newest value
+    """
+
+    def __init__(self, fields, alpha=0.1):
+        self.fields = tuple(fields)
+        self.alpha = alpha
+
+        # IDCODE -> RunningStats per field, in order of fields
+        self._streams = {}
+        self.totals = [RunningStats(alpha) for _ in self.fields]
+
+    def update(self, pmu_id_code, values):
+        """Values of one frame, in order of fields."""
+        stream = self._streams.get(pmu_id_code)
+        if stream is None:
+            stream = self._streams[pmu_id_code] = [RunningStats(self.alpha) for _ in self.fields]
+
+        for field_stats, total_stats, value in zip(stream, self.totals, values):
+            field_stats.update(value)
+            total_stats.update(value)
+
+    def __len__(self):
+        return len(self._streams)
+
+    def get_stream_stats(self, pmu_id_code):
+        """Field -> statistics of one IDCODE, None if it never sent data."""
+        stream = self._streams.get(pmu_id_code)
+        if stream is None:
+            return None
+        return {field: field_stats.get_stats() for field, field_stats in zip(self.fields, stream)}
+
+    def get_stats(self):
+        """Field -> statistics over all IDCODEs."""
+        return {field: total_stats.get_stats() for field, total_stats in zip(self.fields, self.totals)}
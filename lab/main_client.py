@@ -11,6 +11,8 @@ from cl_inherited_comms import Pmu_Client
 from utils import check_sudo
 from frame import DataFrame
 from frame import ConfigFrame2
+from frame import DataFrameEncoder
+from ack import AckWindow
 
 MAX_16_BIT = (2**16 - 1)
 ms_20 = 20 * ( 10 ** (-3) )
@@ -48,6 +50,11 @@ def send_data_frame(pmu : Pmu_Client):
     loop_send_time  = int(time()) + 1    
     begin_send_time = int(time())
     duration_in_sec = 60 * 10
+    #frame template , header fixed once
+    encoder = DataFrameEncoder(ieee_cfg2_sample, 1000)
+    stat = DataFrame._stat2int("ok", True, "timestamp", False, False, False, 0, "<10", 0)
+    #frames in flight , loss accounting
+    ack_window = AckWindow(window=64)
     while loop_send_time - begin_send_time < duration_in_sec :
         #create payload
         ct = time() 
@@ -55,21 +62,22 @@ def send_data_frame(pmu : Pmu_Client):
         FRASEC = int (  (ct - SOC) * (10**6) )
         # pack time calc
         pack_time_start = time()
-        ieee_data_sample = DataFrame(   1000 , 
-                                ("ok", True, "timestamp", False, False, False, 0, "<10", 0),
-                                [(14635, 0), (-7318, -12676), (-7318, 12675), (1092, 0)], 
-                                2500, 
-                                0,
-                                [100, 1000, 10000],
-                                [0x3c12], 
-                                ieee_cfg2_sample)
-        payload = ieee_data_sample.convert2bytes()
+        payload = encoder.encode(   SOC ,
+                                    FRASEC ,
+                                    stat ,
+                                    [(14635, 0), (-7318, -12676), (-7318, 12675), (1092, 0)], 
+                                    2500, 
+                                    0,
+                                    [100, 1000, 10000],
+                                    [0x3c12])
         pack_time_end = time()
         #print(pack_time_end - pack_time_start)
         #send to PDC
         pmu.send_to_PDC(payload)
-        #recv from pdc
-        data_recv = pmu.recv_frm_PDC()
+        ack_window.on_send(SOC , FRASEC)
+        #cumulative acks from pdc , never wait for them
+        for data_recv in pmu.poll_frm_PDC():
+            ack_window.on_ack(data_recv)
         #print ("Server says " + str (data_recv.decode('utf-8')))
         packet_num = packet_num + 1
         loop_send_time = int(time())
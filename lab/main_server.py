@@ -12,8 +12,10 @@ from cl_inherited_comms import PDC_server
 from cl_utils import db_client_cls as db_client
 from cl_utils import Thread_safe_queue as TH_Queue
 
+from frame import CommonFrame
 from frame import ConfigFrame2
-from frame import DataFrame
+from frame import ConfigRegistry
+from ack import CumulativeAck
 #c
 
 pmu_id_ip_table = {
@@ -36,6 +38,8 @@ ieee_cfg2_sample = ConfigFrame2(1000, 1000000, 1, "Station A", 7734, (False, Fal
                                         [(915527, "v"), (915527, "v"), (915527, "v"), (45776, "i")],
                                         [(1, "pow"), (1, "rms"), (1, "peak")], [(0x0000, 0xffff)],
                                         60, 22, data_rate)
+#configs learned from CFG-2 frames , sample config for PMUs which never send one
+cfg_registry = ConfigRegistry(default_cfg=ieee_cfg2_sample)
 
 def upload_func(pmu34_db    : db_client , th_Q : TH_Queue):
     while True:
@@ -61,20 +65,26 @@ def recv_data_frame(   th_Q        : TH_Queue              ,
             pdc         : PDC_server            , 
             pmu_IP      : str = '10.64.37.34'   , 
             pmu_port    : int = 9991           ,
-            table       : dict= pmu_id_ip_table     
+            table       : dict= pmu_id_ip_table     ,
+            registry    : ConfigRegistry = cfg_registry
         ):
     sqn_num = int(0)
+    #one binary cumulative ack per pmu every 10 frames or 100 ms
+    acker = CumulativeAck(every_frames=10 , every_ms=100)
     while True:
         #recv
         #loop_start_time = time()
-        data_recvd , addr_of_client = pdc.recv()
+        data_recvd , addr_of_client = pdc.recv_view()
         #        
         server_ct = time()
         SOC_server = int(server_ct)
         FRASEC_server = int (  (server_ct - SOC_server) * (10**6) )
 
         #print(DataFrame.extract_frame_type(data_recvd))
-        frame = DataFrame.convert2frame(data_recvd,ieee_cfg2_sample)
+        if CommonFrame.extract_frame_type(data_recvd) == "cfg2":
+            registry.register_frame(data_recvd, check_crc=False)
+            continue
+        frame = registry.decode(data_recvd, check_crc=False)
         #print(frame)
         #SOC_Client = frame.get_soc()
         FRASEC_Client = frame.get_frasec()[0]
@@ -90,10 +100,16 @@ def recv_data_frame(   th_Q        : TH_Queue              ,
         #print(f"upload time -> {db_end_time - db_start_time}")
         #send
         sqn_num = sqn_num + 1
-        msg = str(sqn_num)
+        #kernel drops next to frame count , tells own ingest loss from network loss
+        if sqn_num % 1000 == 0:
+            sock_stats = pdc.get_socket_stats()
+            print("frames {} | kernel drops {} (SO_RXQ_OVFL) {} (/proc/net/udp) | rx queue {} B".format(
+                    sqn_num , sock_stats['rxq_ovfl_drops'] , sock_stats['proc_drops'] , sock_stats['rx_queue_bytes'] ))
         pmu_id = frame.get_id_code()
         pmu_ip_addr = table[pmu_id]
-        pdc.send_to(pmu_IP=pmu_ip_addr , pmu_port= 9991, payload = msg.encode() )
+        ack = acker.on_frame(pmu_id , frame.get_soc() , FRASEC_Client , (pmu_ip_addr , 9991))
+        if ack is not None:
+            pdc.send_to(pmu_IP=pmu_ip_addr , pmu_port= 9991, payload = ack )
         #loop_end_time = time()
         
         #print( (loop_end_time-loop_start_time) , (db_end_time - db_start_time) , ((loop_end_time-loop_start_time) / (db_end_time - db_start_time)) )
@@ -107,6 +123,8 @@ if __name__ == "__main__":
     PDC = PDC_server (  ip_server_is_binding = IP_to_bind , 
                         port_opening         = port       , 
                         buffer_size          = buffer_size        ,
+                        rcvbuf               = 4 * 1024 * 1024    ,
+                        drop_telemetry       = True               ,
                         trans_logging_level  = 'DEBUG'               ,
                         to_log_trans         = True        ,
                         
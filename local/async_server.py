@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+asyncio PDC Server - receive never waits for storage or analytics
+
+Datagrams are received by DatagramProtocol on the socket bound by
+LocalPdcServer. Frames are decoded inline, measurements are stored in
+batches and analyzed in executors so slow SQLite writes never stall PMUs.
+"""
+import asyncio
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'common'))
+
+from comms import PDC_server
+from config import get_pdc_config, get_pdc_runtime_config
+from server import (EnhancedDatabase, FrameAnalyzer, extract_frame_data, measurement_row, sample_config,
+                    make_acker, ack_payload, socket_stats_line, make_load_controller, make_publisher,
+                    make_tracker, sequence_stats_line, make_concentrator, concentrator_stats_line,
+                    add_member, publish_frames, frame_lateness)
+
+# Import frame classes from common
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'common'))
+from frame import CommonFrame, ConfigRegistry, DataFramePool, FrameError
+from sequence import DUPLICATE
+
+class AsyncPdcProtocol(asyncio.DatagramProtocol):
+    """Forwards datagrams to PDC engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def connection_made(self, transport):
+        self.engine.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.engine.handle_datagram(data, addr)
+
+    def error_received(self, exc):
+        self.engine.stats['socket_errors'] += 1
+
+class AsyncPdcEngine:
+    """Decode inline, store and analyze in executors"""
+
+    def __init__(self, pdc, db, analyzer, registry, batch_size=100, flush_interval=0.5, max_pending_batches=32,
+                 frame_pool_size=64, acker=None, controller=None, publisher=None,
+                 tracker=None, concentrator=None):
+        self.pdc = pdc
+        self.acker = acker  # None - text ACK for every frame
+        self.controller = controller  # None - PMUs are never throttled
+        self.publisher = publisher  # None - no multicast fan-out
+        self.tracker = tracker  # None - no loss/duplicate tracking
+        self.concentrator = concentrator  # None - frames are published as received
+        self.db = db
+        self.analyzer = analyzer
+        self.registry = registry
+        self.frame_pool = DataFramePool(registry, frame_pool_size)
+        self.transport = None
+
+        # Rows are written in batches, one executor job per batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending_batches = max_pending_batches
+        self._rows = []
+        self._analysis = []
+        self._pending_batches = 0
+
+        # Single writer thread - SQLite serializes writes anyway
+        self.storage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdc_storage')
+        self.analytics_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdc_analytics')
+
+        self.stats = {
+            'received': 0, 'decoded': 0, 'configs': 0, 'errors': 0, 'socket_errors': 0,
+            'stored': 0, 'dropped_rows': 0, 'anomalies': 0
+        }
+        self.last_error = None  # Latest frame parsing error, printed with statistics
+
+    def handle_datagram(self, data, addr):
+        """Called by event loop for every datagram"""
+        self.stats['received'] += 1
+        packet_count = self.stats['received']
+
+        server_ct = time()
+        FRASEC_server = int((server_ct - int(server_ct)) * (10**6))
+
+        try:
+            # Frame type check also validates CRC
+            frame_type = CommonFrame.extract_frame_type(data)
+            if frame_type == "cfg2":
+                pmu_id, cfg_count = self.registry.register_frame(data, check_crc=False)
+                self.stats['configs'] += 1
+                print(f"🧩 CFG-2 from PMU {pmu_id} (CFG_CNT={cfg_count}), {len(self.registry)} configs known")
+                self.transport.sendto(f"CFG_ACK_{pmu_id}".encode(), addr)
+                cfg = self.registry.configs[(pmu_id, cfg_count)]
+                if self.tracker is not None:
+                    self.tracker.set_config(pmu_id, cfg.get_data_rate(), cfg.get_time_base())
+                if self.controller is not None:
+                    self.controller.on_config(pmu_id, addr, cfg.get_data_rate())
+                if self.concentrator is not None:
+                    add_member(self.concentrator, self.publisher, cfg)
+                elif self.publisher is not None:
+                    self.publisher.publish_config(pmu_id, data)
+                return
+
+            # Duplicates are dropped before decode
+            if self.tracker is not None and frame_type == "data" and self.tracker.classify(data)[1] is DUPLICATE:
+                return
+            if self.concentrator is not None and frame_type == "data":
+                publish_frames(self.publisher, self.concentrator.add(data))
+
+            frame = self.frame_pool.decode(data, check_crc=False)
+            pmu_id = frame.get_id_code()
+            comm_delay = FRASEC_server - frame.get_frasec()[0]
+            frame_data = extract_frame_data(frame)
+            response = ack_payload(self.acker, frame, addr, packet_count)
+            if self.controller is not None:
+                self.controller.on_frame(pmu_id, addr, frame_lateness(frame, server_ct),
+                                         self.registry.needs_config(pmu_id))
+            self.frame_pool.release(frame)
+        except (FrameError, Exception) as e:  # FrameError derives from BaseException
+            self.stats['errors'] += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            if self.acker is None:
+                self.transport.sendto(f"ERROR_{packet_count}".encode(), addr)
+            return
+
+        self.stats['decoded'] += 1
+        if response:
+            self.transport.sendto(response, addr)
+        if self.publisher is not None and self.concentrator is None:
+            self.publisher.publish(data)
+
+        self._rows.append(measurement_row(frame_data, pmu_id, comm_delay, len(data), server_ct))
+        self._analysis.append((frame_data, pmu_id, comm_delay))
+
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Hand collected rows to storage and analytics executors"""
+        if not self._rows:
+            return
+
+        rows, self._rows = self._rows, []
+        analysis, self._analysis = self._analysis, []
+
+        # Storage can't keep up - drop instead of growing memory and stalling receive
+        if self._pending_batches >= self.max_pending_batches:
+            self.stats['dropped_rows'] += len(rows)
+            return
+
+        loop = asyncio.get_running_loop()
+        self._pending_batches += 1
+        loop.run_in_executor(self.storage_executor, self.db.store_measurements, rows).add_done_callback(self._stored)
+        loop.run_in_executor(self.analytics_executor, self.analyze_batch, analysis)
+
+    def _stored(self, future):
+        self._pending_batches -= 1
+        if future.exception() is None:
+            self.stats['stored'] += future.result()
+        else:
+            print(f"❌ Storage error: {future.exception()}")
+
+    def analyze_batch(self, analysis):
+        """Runs in analytics executor"""
+        for frame_data, pmu_id, comm_delay in analysis:
+            result = self.analyzer.analyze_frame(frame_data, pmu_id, comm_delay)
+            for anomaly in result['anomalies']:
+                self.stats['anomalies'] += 1
+                self.db.store_event(result['timestamp'], anomaly['type'], pmu_id, anomaly['severity'],
+                                    anomaly['description'], result['ml_score'])
+
+    async def serve(self, stats_interval=5.0):
+        """Receive until cancelled"""
+        loop = asyncio.get_running_loop()
+
+        # Reuse socket bound by LocalPdcServer
+        self.pdc.server_sock.setblocking(False)
+        transport, _ = await loop.create_datagram_endpoint(lambda: AsyncPdcProtocol(self),
+                                                           sock=self.pdc.server_sock)
+
+        # Concentrator slots are polled within their wait window, rows are flushed every flush_interval
+        tick = min(self.flush_interval, self.concentrator.wait / 2) if self.concentrator is not None else \
+            self.flush_interval
+        last_stats = last_flush = loop.time()
+        try:
+            while True:
+                await asyncio.sleep(tick)
+                if self.concentrator is not None:
+                    publish_frames(self.publisher, self.concentrator.poll())
+                if loop.time() - last_flush < self.flush_interval:
+                    continue
+                last_flush = loop.time()
+                self.flush()
+
+                if self.acker is not None:
+                    for addr, response in self.acker.due():
+                        transport.sendto(response, addr)
+
+                # Storage backlog is our queue depth - throttle PMUs before rows are dropped
+                if self.controller is not None:
+                    socket_stats = self.pdc.get_socket_stats()
+                    self.controller.on_batch(self._pending_batches / self.max_pending_batches,
+                                             socket_stats['proc_drops'])
+                    for addr, command in self.controller.commands():
+                        transport.sendto(command, addr)
+
+                if loop.time() - last_stats >= stats_interval:
+                    last_stats = loop.time()
+                    self.print_stats()
+        finally:
+            self.flush()
+            transport.close()
+            self.storage_executor.shutdown(wait=True)
+            self.analytics_executor.shutdown(wait=True)
+
+    def print_stats(self):
+        """Print ingest statistics"""
+        s = self.stats
+        print(f"📈 STATISTICS: {s['received']} received | {s['decoded']} decoded | {s['errors']} errors | "
+              f"{s['stored']} stored | {s['dropped_rows']} dropped | {s['anomalies']} anomalies | "
+              f"{self._pending_batches} batches pending")
+        if self.last_error is not None:
+            print(f"  ❌ Last frame parsing error: {self.last_error}")
+        print(f"  {socket_stats_line(self.pdc.get_socket_stats())}")
+        if self.tracker is not None:
+            print(f"  {sequence_stats_line(self.tracker.get_stats())}")
+        if self.concentrator is not None:
+            print(f"  {concentrator_stats_line(self.concentrator.get_stats())}")
+        if self.publisher is not None:
+            print(f"  📡 Multicast: {self.publisher.stats['published']} published | "
+                  f"{self.publisher.stats['send_errors']} send errors")
+
+def main():
+    """asyncio PDC server main function"""
+
+    print("🏭 asyncio PDC Server")
+    print("="*50)
+
+    db = EnhancedDatabase()
+    analyzer = FrameAnalyzer(db)
+
+    pdc_config = get_pdc_config()
+    runtime_config = get_pdc_runtime_config()
+
+    print(f"🔗 Binding to: {pdc_config['ip']}:{pdc_config['port']}")
+    print(f"📊 Database: {db.db_name}")
+    print("="*50)
+
+    # Same configuration as blocking server, socket is handed over to event loop. Event loop receives
+    # with recvfrom, so kernel drops come from /proc/net/udp only
+    pdc = PDC_server(
+        ip_server_is_binding=pdc_config['ip'],
+        port_opening=pdc_config['port'],
+        buffer_size=1024,
+        rcvbuf=runtime_config['rcvbuf'],
+        sndbuf=runtime_config['sndbuf']
+    )
+
+    registry = ConfigRegistry(default_cfg=sample_config())
+    engine = AsyncPdcEngine(pdc, db, analyzer, registry, frame_pool_size=runtime_config['frame_pool_size'],
+                            acker=make_acker(runtime_config), controller=make_load_controller(runtime_config),
+                            publisher=make_publisher(runtime_config),
+                            tracker=make_tracker(runtime_config, registry.default_cfg),
+                            concentrator=make_concentrator(runtime_config))
+
+    print("\n🎯 Waiting for synchrophasor data...")
+
+    try:
+        asyncio.run(engine.serve())
+    except KeyboardInterrupt:
+        engine.print_stats()
+        print(f"\n\n🛑 PDC Server stopped. Processed {engine.stats['decoded']} frames.")
+        print(f"💾 Data saved to: {db.db_name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+IEEE C37.118.2 Codec Throughput Benchmark
+
+Measures encode/decode speed of frame.py for every frame type, every data
+format and single/multi-stream data frames. Results are written as JSON so
+codec versions can be compared before deployment:
+
+    python3 benchmark.py                        # JSON to stdout
+    python3 benchmark.py results.json 20000     # JSON to file, 20000 frames per case
+"""
+import gc
+import sys
+import os
+import json
+import platform
+import tracemalloc
+from datetime import datetime
+from time import perf_counter_ns
+
+# Import frame classes from common
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'common'))
+from frame import (CommonFrame, ConfigFrame2, DataFrame, LazyDataFrame, CommandFrame, HeaderFrame,
+                   DataFrameEncoder, np)
+
+SOC = 1700000000
+FRASEC = 500000
+STREAMS_MULTI = 4       # Data streams in multi-stream frames
+PHASORS = 4             # VA, VB, VC, I1 as in local PMU client
+ANALOGS = 3
+DIGITALS = 1
+
+
+def format_label(data_format):
+    """Human readable data format, e.g. polar/float phasors, int analogs, float freq"""
+    polar, phasor_float, analogs_float, freq_float = CommonFrame._int2format(data_format)
+    return (f"{'polar' if polar else 'rect'}/{'float' if phasor_float else 'int'} phasors, "
+            f"{'float' if analogs_float else 'int'} analogs, {'float' if freq_float else 'int'} freq")
+
+
+def build_config(data_format, num_streams=1):
+    """ConfigFrame2 with local PMU layout, repeated num_streams times"""
+    channel_names = ["VA", "VB", "VC", "I1", "ANALOG1", "ANALOG2", "ANALOG3"] + \
+                    [f"BREAKER {i:X} STATUS" for i in range(16)]
+    ph_units = [(915527, "v"), (915527, "v"), (915527, "v"), (45776, "i")]
+    an_units = [(1, "pow"), (1, "rms"), (1, "peak")]
+    dig_units = [(0x0000, 0xffff)]
+
+    if num_streams == 1:
+        return ConfigFrame2(1000, 1000000, 1, "Station A", 7734, data_format, PHASORS, ANALOGS, DIGITALS,
+                            channel_names, ph_units, an_units, dig_units, 60, 22, 30, SOC, FRASEC)
+
+    n = num_streams
+    return ConfigFrame2(1000, 1000000, n, [f"Station {i}" for i in range(n)], list(range(7734, 7734 + n)),
+                        [data_format] * n, [PHASORS] * n, [ANALOGS] * n, [DIGITALS] * n,
+                        [channel_names] * n, [ph_units] * n, [an_units] * n, [dig_units] * n,
+                        [60] * n, [22] * n, 30, SOC, FRASEC)
+
+
+def stream_measurements(data_format):
+    """Measurements of single stream valid for data format"""
+    polar, phasor_float, analogs_float, freq_float = CommonFrame._int2format(data_format)
+
+    if phasor_float:
+        phasors = [(14635.0, 0.0), (14635.0, -2.094), (14635.0, 2.094), (1092.0, -0.5)] if polar else \
+                  [(14635.0, 0.0), (-7318.0, -12676.0), (-7318.0, 12675.0), (1092.0, 0.0)]
+    else:
+        phasors = [(14635, 0), (14635, -20944), (14635, 20944), (1092, -5000)] if polar else \
+                  [(14635, 0), (-7318, -12676), (-7318, 12675), (1092, 0)]
+
+    freq, dfreq = (0.002, 0.01) if freq_float else (2, 1)  # FREQ is deviation from nominal
+    analog = [100.0, 1000.0, 10000.0] if analogs_float else [100, 1000, 10000]
+
+    return phasors, freq, dfreq, analog, [0x3c12]
+
+
+def frame_measurements(cfg):
+    """STAT and measurements of all streams as (stat, phasors, freq, dfreq, analog, digital)"""
+    stat = DataFrame._stat2int("ok", True, "timestamp", False, False, False, 0, "<10", 0)
+
+    if cfg.get_num_pmu() == 1:
+        return (stat,) + stream_measurements(cfg._data_format)
+
+    streams = [stream_measurements(data_format) for data_format in cfg._data_format]
+    return ([stat] * len(streams),) + tuple([stream[i] for stream in streams] for i in range(5))
+
+
+def check_stat_round_trip():
+    """STAT words of every measurement status survive encode/decode - benchmarked codec must be correct"""
+    cfg = build_config(15)
+    phasors, freq, dfreq, analog, digital = stream_measurements(15)
+
+    for measurement_status in DataFrame.MEASUREMENT_STATUS:
+        for sync in (True, False):
+            stat = DataFrame._stat2int(measurement_status, sync, "arrival", True, True, False, "<1ms", "<100", 0)
+            frame = DataFrame(1000, stat, phasors, freq, dfreq, analog, digital, cfg, SOC, FRASEC)
+            decoded = DataFrame.convert2frame(frame.convert2bytes(), cfg).get_stat()
+
+            if decoded[:2] != (measurement_status, sync) or DataFrame._stat2int(*decoded) != stat:
+                raise RuntimeError(f"STAT round trip failed: {measurement_status}, sync={sync} "
+                                   f"(0x{stat:04X}) decoded as {decoded}")
+
+
+def measure(func, iterations, repeats=5):
+    """Time and allocations of single call, best of repeats"""
+    func()  # Warm up caches (compiled decoders, encoder templates)
+
+    gc.disable()
+    try:
+        best_ns = None
+        for _ in range(repeats):
+            start = perf_counter_ns()
+            for _ in range(iterations):
+                func()
+            elapsed = perf_counter_ns() - start
+            best_ns = elapsed if best_ns is None else min(best_ns, elapsed)
+
+        # Objects kept by caller per frame - results are held so nothing is freed in between
+        alloc_iterations = min(iterations, 1000)
+        kept = []
+        tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        for _ in range(alloc_iterations):
+            kept.append(func())
+        blocks = sys.getallocatedblocks() - blocks_before
+        traced_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+
+    # Result list itself is not part of codec cost
+    list_bytes = sys.getsizeof(kept)
+    ns_per_frame = best_ns / iterations
+
+    return {
+        'frames_per_sec': round(1e9 / ns_per_frame, 1),
+        'ns_per_frame': round(ns_per_frame, 1),
+        'allocs_per_frame': round(max(blocks - 1, 0) / alloc_iterations, 2),
+        'bytes_per_frame': round(max(traced_bytes - list_bytes, 0) / alloc_iterations, 1),
+    }
+
+
+def bench_data_frames(iterations):
+    """DataFrame encode/decode for every data format, single and multi-stream"""
+    results = []
+
+    for num_streams in (1, STREAMS_MULTI):
+        for data_format in range(16):
+            cfg = build_config(data_format, num_streams)
+            measurements = frame_measurements(cfg)
+            frame = DataFrame(1000, *measurements, cfg, SOC, FRASEC)
+            raw = frame.convert2bytes()
+            encoder = DataFrameEncoder(cfg, 1000)
+            decoder = cfg.get_data_decoder()
+
+            cases = [
+                ('convert2bytes', frame.convert2bytes),
+                ('convert2frame', lambda: DataFrame.convert2frame(raw, cfg)),
+                ('convert2frame_lazy', lambda: LazyDataFrame.convert2frame(raw, cfg)),
+                ('encoder', lambda: encoder.encode(SOC, FRASEC, *measurements)),
+            ]
+
+            if np is not None:
+                batch = raw * 1000
+                cases.append(('decode_batch_1000', lambda: decoder.decode_batch(batch)))
+
+            for operation, func in cases:
+                batch_size = 1000 if operation == 'decode_batch_1000' else 1
+                result = measure(func, max(iterations // batch_size, 10))
+                result['frames_per_sec'] = round(result['frames_per_sec'] * batch_size, 1)
+                result['ns_per_frame'] = round(result['ns_per_frame'] / batch_size, 1)
+                result['allocs_per_frame'] = round(result['allocs_per_frame'] / batch_size, 4)
+                result['bytes_per_frame'] = round(result['bytes_per_frame'] / batch_size, 1)
+
+                results.append(dict({
+                    'frame': 'DataFrame',
+                    'operation': operation,
+                    'data_format': data_format,
+                    'format': format_label(data_format),
+                    'streams': num_streams,
+                    'frame_size': len(raw),
+                }, **result))
+
+    return results
+
+
+def bench_other_frames(iterations):
+    """ConfigFrame2, CommandFrame and HeaderFrame encode/decode"""
+    frames = [
+        ('ConfigFrame2', build_config(15, 1), ConfigFrame2.convert2frame),
+        ('ConfigFrame2', build_config(15, STREAMS_MULTI), ConfigFrame2.convert2frame),
+        ('CommandFrame', CommandFrame(1000, "start", None, SOC, FRASEC), CommandFrame.convert2frame),
+        ('CommandFrame', CommandFrame(1000, "extended", b"\x00\x01" * 8, SOC, FRASEC), CommandFrame.convert2frame),
+        ('HeaderFrame', HeaderFrame(1000, "Station A - local PMU simulation", SOC, FRASEC), HeaderFrame.convert2frame),
+    ]
+
+    results = []
+    for name, frame, convert2frame in frames:
+        raw = frame.convert2bytes()
+        streams = frame.get_num_pmu() if isinstance(frame, ConfigFrame2) else 1
+
+        for operation, func in (('convert2bytes', frame.convert2bytes),
+                                ('convert2frame', lambda: convert2frame(raw))):
+            results.append(dict({
+                'frame': name,
+                'operation': operation,
+                'streams': streams,
+                'frame_size': len(raw),
+            }, **measure(func, iterations)))
+
+    return results
+
+
+def run_benchmarks(iterations=10000):
+    """Run all benchmarks and return JSON serializable report"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'numpy': np.__version__ if np is not None else None,
+        'iterations': iterations,
+        'results': bench_data_frames(iterations) + bench_other_frames(iterations),
+    }
+
+
+def main():
+    """Codec benchmark main function"""
+
+    output = sys.argv[1] if len(sys.argv) > 1 else None
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    check_stat_round_trip()
+    report = run_benchmarks(iterations)
+
+    if output is None:
+        print(json.dumps(report, indent=2))
+        return
+
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"📊 {len(report['results'])} benchmark cases, {iterations} frames each")
+    for result in report['results']:
+        if result['frame'] != 'DataFrame' or result['data_format'] == 15:
+            print(f"  {result['frame']:<13} {result['operation']:<18} streams={result['streams']} "
+                  f"{result['ns_per_frame']:>10.1f} ns/frame {result['allocs_per_frame']:>7.2f} allocs/frame")
+    print(f"💾 Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,14 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'common'))
 
 from comms import Pmu_Client
-from config import get_pdc_config, LOCAL_CONFIG
+from config import get_pmu_target_config, get_pmu_runtime_config, get_all_pmu_configs
 
 # Import frame classes from common
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'common'))
-from frame import DataFrame, ConfigFrame2
+from frame import DataFrame, ConfigFrame2, CommandFrame, DataFrameEncoder, FrameError
+from ack import AckWindow
+from scheduler import FrameScheduler
+from rate_control import is_command, command_rate
 
 class PowerSystemSimulator:
     """Realistic power system simulation for synchrophasor data"""
@@ -202,12 +205,163 @@ class PowerSystemSimulator:
         
         return (measurement_status, sync_ok, "timestamp", False, False, False, 0, "<10", time_quality)
 
+class VectorizedPowerSystemSimulator:
+    """PowerSystemSimulator for fleet of PMUs - state and measurements are NumPy arrays, one row per PMU"""
+    
+    EVENTS = ('frequency_event', 'voltage_sag', 'load_step', 'breaker_trip')
+    
+    def __init__(self, pmu_ids, seed=42):
+        self.pmu_ids = np.asarray(pmu_ids)
+        self.num_pmus = len(self.pmu_ids)
+        self.base_frequency = 60.0  # 60 Hz
+        self.base_voltage = 120.0   # 120 kV (scaled down)
+        self.base_current = 1000.0  # 1000 A
+        
+        # System state per PMU
+        self.frequency_drift = np.zeros(self.num_pmus)
+        self.voltage_variation = np.zeros(self.num_pmus)
+        self.load_variation = np.zeros(self.num_pmus)
+        self.events = {k: np.zeros(self.num_pmus, dtype=bool) for k in self.EVENTS}
+        
+        # Same seed gives same fleet behaviour
+        self.rng = np.random.default_rng(seed)
+        
+        # PMUs don't hit events on the same frame
+        self.phase = self.rng.integers(0, 1200, self.num_pmus)
+        
+    def simulate_event(self, frame_count):
+        """Simulate power system events, same schedule as PowerSystemSimulator per PMU"""
+        n = self.num_pmus
+        count = frame_count + self.phase
+        
+        # Reset events periodically
+        reset = count % 100 == 0
+        for active in self.events.values():
+            active[reset] = False
+        
+        # Frequency events (every ~30 seconds at 30fps)
+        hit = (count % 900 == 0) & (self.rng.random(n) > 0.7)
+        self.events['frequency_event'] |= hit
+        self.frequency_drift[hit] = self.rng.uniform(-0.3, 0.3, hit.sum())
+        
+        # Voltage sag events
+        hit = (count % 600 == 0) & (self.rng.random(n) > 0.8)
+        self.events['voltage_sag'] |= hit
+        self.voltage_variation[hit] = self.rng.uniform(-0.15, -0.05, hit.sum())
+        
+        # Load step events
+        hit = (count % 450 == 0) & (self.rng.random(n) > 0.6)
+        self.events['load_step'] |= hit
+        self.load_variation[hit] = self.rng.uniform(0.1, 0.4, hit.sum())
+        
+        # Breaker trip simulation
+        self.events['breaker_trip'] |= (count % 1200 == 0) & (self.rng.random(n) > 0.9)
+    
+    def generate(self, t):
+        """Measurements of all PMUs at time t in engineering units"""
+        n = self.num_pmus
+        rng = self.rng
+        trip = self.events['breaker_trip']
+        
+        # Slightly unbalanced 3-phase voltages, 120° apart
+        voltage_factor = 1.0 + self.voltage_variation + rng.uniform(-0.01, 0.01, n)
+        voltage_mag = self.base_voltage * (1.0 + rng.uniform(-0.02, 0.02, (n, 3))) * [1.0, 0.98, 0.99]
+        voltage_mag *= voltage_factor[:, None]
+        voltage_angle = np.array([0.0, -120.0, 120.0]) + rng.uniform(-2, 2, (n, 3))
+        
+        # Current lagging voltage by 25-40°, very low after trip
+        load_factor = 1.0 + self.load_variation + rng.uniform(-0.05, 0.05, n)
+        current_mag = self.base_current * load_factor * np.where(trip, 0.1, 1.0)
+        current_angle = voltage_angle[:, 0] - rng.uniform(25, 40, n) + np.where(trip, rng.uniform(-10, 10, n), 0.0)
+        
+        frequency = (self.base_frequency + rng.uniform(-0.005, 0.005, n) + self.frequency_drift +
+                     0.02 * math.sin(t * 0.5))
+        rocof = np.where(self.events['frequency_event'], rng.uniform(-0.5, 0.5, n), rng.uniform(-0.05, 0.05, n))
+        
+        # Power (MW), RMS and peak current (A)
+        power = (100 + rng.uniform(-5, 5, n)) * (1.0 + self.load_variation) * np.where(trip, 0.05, 1.0)
+        rms_current = 1000 + rng.uniform(-50, 50, n)
+        peak_current = rms_current * 1.414 + rng.uniform(-20, 20, n)
+        
+        # Breaker states - tripped PMUs open one of first 8 breakers
+        digital = np.full(n, 0x7FFF, dtype=np.uint16)
+        digital[trip] &= ~(np.uint16(1) << rng.integers(0, 8, trip.sum()).astype(np.uint16))
+        
+        return {
+            'voltage_mag': voltage_mag, 'voltage_angle': voltage_angle,
+            'current_mag': current_mag, 'current_angle': current_angle,
+            'frequency': frequency, 'rocof': rocof,
+            'analogs': np.column_stack((power, rms_current, peak_current)),
+            'digital': digital
+        }
+
+class PdcCommandHandler:
+    """Applies command frames from PDC - stop/start sending, send CFG-2, rate change"""
+    
+    def __init__(self, pmu_client, pmu_id, cfg, scheduler):
+        self.pmu_client = pmu_client
+        self.pmu_id = pmu_id
+        self.cfg = cfg
+        self.scheduler = scheduler
+        self.sending = True
+        self.counts = {'stop': 0, 'start': 0, 'cfg2': 0, 'rate': 0}
+    
+    def send_config(self):
+        self.pmu_client.send_to_PDC(self.cfg.convert2bytes())
+    
+    def handle(self, response):
+        """Apply response if it's command frame, returns False for ACKs and other responses"""
+        if not is_command(response):
+            return False
+        
+        try:
+            command = CommandFrame.convert2frame(response)
+        except FrameError as e:
+            print(f"❌ Invalid command from PDC: {e}")
+            return True
+        
+        if command.get_id_code() != self.pmu_id:
+            return True
+        
+        word = command.get_command()
+        if word == 'stop':
+            self.counts['stop'] += 1
+            if self.sending:
+                print("⏸️  PDC: stop sending")
+            self.sending = False
+        elif word == 'start':
+            self.counts['start'] += 1
+            if not self.sending:
+                print("▶️  PDC: start sending")
+            self.sending = True
+        elif word == 'cfg2':
+            self.counts['cfg2'] += 1
+            self.send_config()
+        elif word == 'extended':
+            data_rate = command_rate(command)
+            if data_rate is None:
+                return True
+            self.counts['rate'] += 1
+            if data_rate != self.cfg.get_data_rate():
+                self.cfg.set_data_rate(data_rate)
+                self.scheduler.set_data_rate(data_rate)
+                print(f"🎚️  PDC: data rate {data_rate} fps")
+            # CFG-2 with new DATA_RATE confirms rate change
+            self.send_config()
+        
+        return True
+
 def send_realistic_data(pmu_client, pmu_id, station_name, duration_sec=60):
     """Send realistic synchrophasor data with power system simulation"""
     
     # Initialize simulator
     simulator = PowerSystemSimulator(pmu_id)
     
+    # Pipelined mode never waits for PDC, cumulative ACKs are accounted in window
+    runtime_config = get_pmu_runtime_config()
+    pipelined = runtime_config['ack_mode'] == 'cumulative'
+    ack_window = AckWindow(runtime_config['ack_window'])
+    
     # Create IEEE configuration
     ieee_cfg2_sample = ConfigFrame2(pmu_id, 1000000, 1, station_name, 7734, (False, False, True, False),
                                    4, 3, 1,
@@ -222,21 +376,43 @@ def send_realistic_data(pmu_client, pmu_id, station_name, duration_sec=60):
                                    [(1, "pow"), (1, "rms"), (1, "peak")], [(0x0000, 0xffff)],
                                    60, 22, 30)
     
+    # Frame template - header is fixed, only timestamp, measurements and CHK change per tick
+    encoder = DataFrameEncoder(ieee_cfg2_sample, pmu_id)
+    working_stat = DataFrame._stat2int("ok", True, "timestamp", False, False, False, 0, "<10", 0)
+    
+    # Announce configuration so PDC decodes our data frames with it
+    try:
+        pmu_client.send_to_PDC(ieee_cfg2_sample.convert2bytes())
+        print(f"🧩 CFG-2 sent, PDC: {pmu_client.recv_frm_PDC().decode('utf-8')}")
+    except Exception as e:
+        print(f"❌ CFG-2 not acknowledged: {e}")
+    
     print(f"🔌 Starting realistic power system simulation")
     print(f"⚡ Base frequency: {simulator.base_frequency} Hz")
     print(f"🔋 Base voltage: {simulator.base_voltage} kV")
     print(f"⚙️  Duration: {duration_sec} seconds")
     print("="*50)
     
+    # Frames are sent on DATA_RATE grid, deadlines don't drift with time spent per frame
+    scheduler = FrameScheduler(ieee_cfg2_sample.get_data_rate(), ieee_cfg2_sample.get_time_base())
+    
+    # PDC throttles us with command frames when it's overloaded
+    commands = PdcCommandHandler(pmu_client, pmu_id, ieee_cfg2_sample, scheduler)
+    
     frame_count = 0
     start_time = time()
     
     while time() - start_time < duration_sec:
         try:
-            # Current timestamp - use same approach as working client
-            ct = time()
-            SOC = int(ct)
-            FRASEC = int((ct - SOC) * (10**6))
+            # Timestamp of reporting grid point PDC aligns on
+            SOC, FRASEC = scheduler.wait()
+            
+            # Stopped by PDC - only listen for start
+            if not commands.sending:
+                for response in pmu_client.poll_frm_PDC():
+                    if not commands.handle(response) and pipelined:
+                        ack_window.on_ack(response)
+                continue
             
             # Simulate power system events
             simulator.simulate_event(frame_count)
@@ -249,34 +425,40 @@ def send_realistic_data(pmu_client, pmu_id, station_name, duration_sec=60):
             digital = simulator.generate_digital_status()
             status = simulator.generate_status_word()
             
-            # Create IEEE data frame - use working values for frame, simulation values for display
+            # Encode IEEE data frame - use working values for frame, simulation values for display
             try:
-                ieee_data_frame = DataFrame(
-                    pmu_id,
-                    ("ok", True, "timestamp", False, False, False, 0, "<10", 0),
+                payload = encoder.encode(
+                    SOC,
+                    FRASEC,
+                    working_stat,
                     [(14635, 0), (-7318, -12676), (-7318, 12675), (1092, 0)],  # Working values
                     2500,  # Working frequency value
                     0,     # Working ROCOF
                     [100, 1000, 10000],  # Working analog values
-                    [0x3c12],  # Working digital value
-                    ieee_cfg2_sample,
-                    SOC,
-                    FRASEC
+                    [0x3c12]  # Working digital value
                 )
                 # Note: We use simulation values (phasors, frequency, analogs, etc.) only for display
-            except Exception as e:
+            except FrameError as e:
                 print(f"❌ Frame generation error: {e}")
                 continue
             
-            payload = ieee_data_frame.convert2bytes()
-            
             # Send to PDC
             pmu_client.send_to_PDC(payload)
             
             # Receive response
             try:
-                response = pmu_client.recv_frm_PDC()
-                response_str = response.decode('utf-8')
+                if pipelined:
+                    ack_window.on_send(SOC, FRASEC)
+                    for response in pmu_client.poll_frm_PDC():
+                        if not commands.handle(response):
+                            ack_window.on_ack(response)
+                    ack_stats = ack_window.get_stats()
+                    response_str = f"ACK {ack_stats['acked']}/{ack_stats['sent']} lost {ack_stats['lost']}"
+                else:
+                    response = pmu_client.recv_frm_PDC()
+                    while commands.handle(response):
+                        response = pmu_client.recv_frm_PDC()
+                    response_str = response.decode('utf-8')
                 
                 # Display summary every 10 frames using realistic simulation values
                 if frame_count % 10 == 0:
@@ -297,9 +479,6 @@ def send_realistic_data(pmu_client, pmu_id, station_name, duration_sec=60):
             
             frame_count += 1
             
-            # Maintain 30 Hz data rate
-            time_sleep(1.0 / 30.0)
-            
         except KeyboardInterrupt:
             break
         except Exception as e:
@@ -307,16 +486,31 @@ def send_realistic_data(pmu_client, pmu_id, station_name, duration_sec=60):
             break
     
     print(f"\n✅ Simulation completed: {frame_count} frames sent")
-    print(f"📊 Average rate: {frame_count/duration_sec:.1f} fps")
+    if pipelined:
+        # Collect ACKs of frames still in flight - they waited out the drain sleep, so no RTT sample
+        time_sleep(runtime_config['ack_drain_sec'])
+        for response in pmu_client.poll_frm_PDC():
+            ack_window.on_ack(response, measure_rtt=False)
+        ack_stats = ack_window.get_stats()
+        print(f"📨 Delivery: {ack_stats['acked']} acked | {ack_stats['lost']} lost | "
+              f"{ack_stats['in_flight']} unacked | {ack_stats['expired']} expired | RTT {ack_stats['rtt_ms']} ms")
+    if any(commands.counts.values()):
+        print(f"🎛️  PDC commands: {commands.counts['rate']} rate | {commands.counts['stop']} stop | "
+              f"{commands.counts['start']} start | {commands.counts['cfg2']} cfg2")
+    sched_stats = scheduler.get_stats()
+    print(f"📊 Average rate: {sched_stats['rate']:.1f} fps (target {scheduler.data_rate}) | "
+          f"{sched_stats['skipped']} skipped")
+    print(f"⏱️  Lateness: mean {sched_stats['lateness_mean_us']} µs | max {sched_stats['lateness_max_us']} µs | "
+          f"jitter {sched_stats['jitter_us']} µs")
 
 def main():
     """Enhanced PMU client main function"""
     
     if len(sys.argv) > 1:
         pmu_name = sys.argv[1]
-        if pmu_name not in LOCAL_CONFIG:
+        if pmu_name not in get_all_pmu_configs():
             print(f"❌ Unknown PMU name '{pmu_name}'")
-            print("Available PMUs:", list(LOCAL_CONFIG.keys()))
+            print("Available PMUs:", list(get_all_pmu_configs().keys()))
             return
     else:
         pmu_name = 'pmu_34'  # Default
@@ -324,8 +518,8 @@ def main():
     duration = int(sys.argv[2]) if len(sys.argv) > 2 else 60
     
     # Get configurations
-    pmu_config = LOCAL_CONFIG[pmu_name]
-    pdc_config = get_pdc_config()
+    pmu_config = get_all_pmu_configs()[pmu_name]
+    pdc_config = get_pmu_target_config()
     
     # Extract PMU ID from name
     pmu_number = int(pmu_name.split('_')[1])
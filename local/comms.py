@@ -3,16 +3,24 @@
 Local communication classes for testing - no sudo required
 """
 import socket
+import errno
 import threading
 import logging
+import multiprocessing
+import queue
 import sys
 import os
-from time import time, sleep as time_sleep
+from time import time, monotonic, sleep as time_sleep
 
 # Add common directory to path for shared utilities
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'common'))
 
 from local_utils import get_my_ipv4, check_sudo
+from frame import CommonFrame, ConfigRegistry, FrameError, StreamFramer
+from sock_telemetry import SocketTelemetry
+
+# Non-blocking receive for single call, not available on all platforms
+MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
 
 class LocalPmuClient:
     """Simplified PMU Client for local testing"""
@@ -49,6 +57,23 @@ class LocalPmuClient:
             print(f"Receive error: {e}")
             raise
     
+    def poll_frm_PDC(self) -> list:
+        """Return all responses already queued from PDC, never blocks"""
+        responses = []
+        # Socket timeout would make recv wait even with MSG_DONTWAIT, poll in non-blocking mode
+        timeout = self.cl_sock.gettimeout()
+        self.cl_sock.settimeout(0.0)
+        try:
+            while True:
+                try:
+                    data_recvd, server_addr = self.cl_sock.recvfrom(self.BUFFER_SIZE)
+                except BlockingIOError:
+                    break
+                responses.append(data_recvd)
+        finally:
+            self.cl_sock.settimeout(timeout)
+        return responses
+    
     def get_time_offset(self):
         """Mock time offset for local testing"""
         return self._time_offset
@@ -59,38 +84,212 @@ class LocalPmuClient:
         except:
             pass
 
+class LocalMulticastSubscriber:
+    """Consumer of PDC multicast stream - historian, dashboard or analytics joined to group"""
+    
+    def __init__(self, group='239.255.37.118', port=4713, interface='127.0.0.1', buffer=65536, timeout=10.0):
+        self.group = group
+        self.port = port
+        self.BUFFER_SIZE = buffer
+        
+        # Any number of subscribers on one host share group port
+        self.sub_sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        self.sub_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            self.sub_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.sub_sock.bind(('', port))
+        self.sub_sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                 socket.inet_aton(group) + socket.inet_aton(interface))
+        self.sub_sock.settimeout(timeout)
+        
+        # Configurations are re-published periodically, data of unknown streams is skipped until then
+        self.registry = ConfigRegistry()
+        self.stats = {'received': 0, 'configs': 0, 'decoded': 0, 'skipped': 0}
+        
+        print(f"Local multicast subscriber joined: {group}:{port} on {interface}")
+    
+    def recv(self) -> bytes:
+        """Receive next datagram of stream"""
+        data_recvd, publisher_addr = self.sub_sock.recvfrom(self.BUFFER_SIZE)
+        self.stats['received'] += 1
+        return data_recvd
+    
+    def recv_frame(self):
+        """Receive and decode next data frame, CFG-2 frames update registry on the way"""
+        while True:
+            data_recvd = self.recv()
+            try:
+                if CommonFrame.extract_frame_type(data_recvd) == "cfg2":
+                    self.registry.register_frame(data_recvd, check_crc=False)
+                    self.stats['configs'] += 1
+                    continue
+                frame = self.registry.decode(data_recvd, check_crc=False)
+            except (FrameError, Exception):
+                self.stats['skipped'] += 1
+                continue
+            self.stats['decoded'] += 1
+            return frame
+    
+    def close(self):
+        try:
+            self.sub_sock.setsockopt(socket.IPPROTO_IP, socket.IP_DROP_MEMBERSHIP,
+                                     socket.inet_aton(self.group) + socket.inet_aton('0.0.0.0'))
+        except OSError:
+            pass
+        self.sub_sock.close()
+
+class LocalPmuFleetClient:
+    """Few non-blocking UDP sockets shared by many logical PMUs"""
+    
+    def __init__(self, IP_to_send='127.0.0.1', port_to_send=9995, num_sockets=4, buffer=1024):
+        self.PDC_IP = IP_to_send
+        self.PDC_port = port_to_send
+        self.BUFFER_SIZE = buffer
+        
+        # PMU sends from socket slot % num_sockets, PDC answers to address frames came from
+        self.sockets = []
+        for _ in range(num_sockets):
+            sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            self.sockets.append(sock)
+        
+        self.send_errors = 0
+        
+        print(f"Local PMU fleet client created: {IP_to_send}:{port_to_send} over {num_sockets} sockets")
+    
+    def send_to_PDC(self, payload, slot=0) -> bool:
+        """Send data to PDC, False when socket buffer is full - frame is dropped, never waits"""
+        try:
+            self.sockets[slot % len(self.sockets)].sendto(payload, (self.PDC_IP, self.PDC_port))
+            return True
+        except (BlockingIOError, InterruptedError):
+            self.send_errors += 1
+            return False
+        except OSError as e:
+            if e.errno != errno.ENOBUFS:
+                raise
+            self.send_errors += 1
+            return False
+    
+    def poll_frm_PDC(self) -> list:
+        """Return all responses already queued on all sockets, never blocks"""
+        responses = []
+        for sock in self.sockets:
+            while True:
+                try:
+                    data_recvd, server_addr = sock.recvfrom(self.BUFFER_SIZE)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except ConnectionRefusedError:
+                    continue  # ICMP port unreachable of earlier send, PDC not up yet
+                responses.append(data_recvd)
+        return responses
+    
+    def close(self):
+        for sock in self.sockets:
+            sock.close()
+
 class LocalPdcServer:
     """Simplified PDC Server for local testing"""
     
-    def __init__(self, ip_server_is_binding='127.0.0.1', port_opening=9995, buffer_size=1024):
+    def __init__(self, ip_server_is_binding='127.0.0.1', port_opening=9995, buffer_size=1024, max_batch=64,
+                 reuse_port=False, rcvbuf=None, sndbuf=None, drop_telemetry=False):
         # Mock sudo check (always passes)
         check_sudo()
         
         self.ip_server_is_binding = ip_server_is_binding
         self.port_opening = port_opening
         self.buffer_size = buffer_size
+        self.max_batch = max_batch
+        self.reuse_port = reuse_port
         self._time_offset = 0.0
         
+        # Preallocated receive buffer reused by recv_view()
+        self._recv_buffer = bytearray(buffer_size)
+        self._recv_view = memoryview(self._recv_buffer)
+        
+        # Pool of preallocated datagram buffers reused by recv_batch()
+        self._batch_buffer = bytearray(buffer_size * max_batch)
+        self._batch_views = [memoryview(self._batch_buffer)[i * buffer_size:(i + 1) * buffer_size]
+                             for i in range(max_batch)]
+        
         # Create UDP socket
         self.server_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         
+        # Several processes bind same port, kernel spreads PMU flows across them
+        if reuse_port:
+            self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        
         try:
             self.server_sock.bind((self.ip_server_is_binding, self.port_opening))
             print(f"Local PDC Server bound to: {ip_server_is_binding}:{port_opening}")
         except socket.error as err:
             print(f"Bind error: {err}")
             raise
+        
+        # Buffer sizing and kernel drop counters - with drop_telemetry datagrams are received with recvmsg
+        self.telemetry = SocketTelemetry(self.server_sock, rcvbuf, sndbuf, rxq_ovfl=drop_telemetry)
+        self._ancbufsize = self.telemetry.ancbufsize
+    
+    def _recv_into(self, view, flags=0):
+        """recvfrom_into, or recvmsg_into accounting SO_RXQ_OVFL drop counter"""
+        if not self._ancbufsize:
+            return self.server_sock.recvfrom_into(view, 0, flags)
+        
+        nbytes, ancdata, _, addr_of_client = self.server_sock.recvmsg_into([view], self._ancbufsize, flags)
+        if ancdata:
+            self.telemetry.on_ancdata(ancdata)
+        return nbytes, addr_of_client
     
     def recv(self):
         """Receive data from PMU"""
         try:
+            if self._ancbufsize:
+                nbytes, addr_of_client = self._recv_into(self._recv_buffer)
+                return bytes(self._recv_view[:nbytes]), addr_of_client
             data_recvd, addr_of_client = self.server_sock.recvfrom(self.buffer_size)
             return data_recvd, addr_of_client
         except Exception as e:
             print(f"Receive error: {e}")
             raise
     
+    def recv_view(self):
+        """Receive data from PMU into preallocated buffer without allocating bytes.
+        
+        Returned memoryview is only valid until next call - copy it with bytes()
+        if datagram must outlive current iteration.
+        """
+        try:
+            nbytes, addr_of_client = self._recv_into(self._recv_buffer)
+            return self._recv_view[:nbytes], addr_of_client
+        except Exception as e:
+            print(f"Receive error: {e}")
+            raise
+    
+    def recv_batch(self):
+        """Wait for datagram, then drain every queued datagram without blocking.
+        
+        Returns list of (memoryview, addr) with at most max_batch entries. Views
+        point into preallocated buffers and are only valid until next call.
+        """
+        views = self._batch_views
+        try:
+            nbytes, addr_of_client = self._recv_into(views[0])
+            batch = [(views[0][:nbytes], addr_of_client)]
+            
+            for view in views[1:] if MSG_DONTWAIT else ():
+                try:
+                    nbytes, addr_of_client = self._recv_into(view, MSG_DONTWAIT)
+                except BlockingIOError:
+                    break
+                batch.append((view[:nbytes], addr_of_client))
+            
+            return batch
+        except Exception as e:
+            print(f"Receive error: {e}")
+            raise
+    
     def send_to(self, payload: bytes, pmu_IP='127.0.0.1', pmu_port=9991):
         """Send response to PMU"""
         try:
@@ -103,6 +302,273 @@ class LocalPdcServer:
         """Mock time offset for local testing"""
         return self._time_offset
     
+    def get_socket_stats(self):
+        """Socket buffer sizes and datagrams dropped by kernel before they were received"""
+        return self.telemetry.get_stats()
+    
+    @classmethod
+    def spawn_workers(cls, num_workers, worker_main, ip_server_is_binding='127.0.0.1', port_opening=9995,
+                      buffer_size=1024, max_batch=64, rcvbuf=None, sndbuf=None, drop_telemetry=False):
+        """Start num_workers processes, each binding same port with SO_REUSEPORT.
+        
+        Each worker calls worker_main(pdc, worker_id, report) with its own server.
+        report(stats) sends dict of counters to coordinator, which is returned.
+        """
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise OSError("SO_REUSEPORT is not supported on this platform")
+        
+        coordinator = LocalPdcCoordinator()
+        for worker_id in range(num_workers):
+            process = multiprocessing.Process(
+                target=_pdc_worker,
+                args=(cls, worker_id, worker_main, coordinator.stats_queue,
+                      dict(ip_server_is_binding=ip_server_is_binding, port_opening=port_opening,
+                           buffer_size=buffer_size, max_batch=max_batch, rcvbuf=rcvbuf, sndbuf=sndbuf,
+                           drop_telemetry=drop_telemetry)),
+                name=f"pdc_worker_{worker_id}",
+                daemon=True
+            )
+            process.start()
+            coordinator.workers.append(process)
+        
+        print(f"Started {num_workers} PDC workers on: {ip_server_is_binding}:{port_opening}")
+        return coordinator
+    
+    def __del__(self):
+        try:
+            self.server_sock.close()
+        except:
+            pass
+
+class LocalMulticastPublisher:
+    """PDC side of fan-out - one send per frame reaches every subscriber of group"""
+    
+    def __init__(self, group='239.255.37.118', port=4713, ttl=1, interface='127.0.0.1', loopback=True,
+                 sndbuf=None, config_interval=5.0):
+        self.group = group
+        self.port = port
+        self.config_interval = config_interval
+        
+        # TTL 1 keeps stream on local subnet, every router hop needs one more
+        self.pub_sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        self.pub_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+        self.pub_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1 if loopback else 0)
+        self.pub_sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(interface))
+        if sndbuf is not None:
+            self.pub_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+        self.pub_sock.setblocking(False)
+        
+        # IDCODE -> latest CFG-2 bytes, re-published so late subscribers can decode
+        self.configs = {}
+        self._last_configs = monotonic()
+        
+        self.stats = {'published': 0, 'bytes': 0, 'configs': 0, 'send_errors': 0}
+        
+        print(f"Local multicast publisher: {group}:{port} (TTL {ttl}) via {interface}")
+    
+    def _send(self, payload) -> bool:
+        try:
+            self.pub_sock.sendto(payload, (self.group, self.port))
+        except (BlockingIOError, InterruptedError):
+            self.stats['send_errors'] += 1
+            return False
+        except OSError as e:
+            if e.errno not in (errno.ENOBUFS, errno.ENETUNREACH):
+                raise
+            self.stats['send_errors'] += 1
+            return False
+        return True
+    
+    def publish_config(self, pmu_id, payload) -> bool:
+        """Publish CFG-2 of stream (single PMU or concentrated) and keep it for re-publishing"""
+        self.configs[pmu_id] = bytes(payload)
+        self.stats['configs'] += 1
+        return self._send(payload)
+    
+    def publish(self, payload) -> bool:
+        """Publish data frame as received or concentrated, False when dropped - never waits for socket"""
+        if self.configs and monotonic() - self._last_configs >= self.config_interval:
+            self._last_configs = monotonic()
+            for config in self.configs.values():
+                self._send(config)
+        
+        if not self._send(payload):
+            return False
+        self.stats['published'] += 1
+        self.stats['bytes'] += len(payload)
+        return True
+    
+    def close(self):
+        self.pub_sock.close()
+
+def _pdc_worker(server_cls, worker_id, worker_main, stats_queue, server_args):
+    """Entry point of worker process"""
+    pdc = server_cls(reuse_port=True, **server_args)
+    
+    def report(stats):
+        try:
+            stats_queue.put_nowait((worker_id, dict(stats)))
+        except queue.Full:
+            pass
+    
+    try:
+        worker_main(pdc, worker_id, report)
+    except KeyboardInterrupt:
+        pass
+
+class LocalPdcCoordinator:
+    """Collects and merges statistics reported by PDC worker processes"""
+    
+    def __init__(self, max_reports=10000):
+        self.workers = []
+        self.stats_queue = multiprocessing.Queue(max_reports)
+        self.worker_stats = {}  # Latest report of each worker
+    
+    def poll(self, timeout=0.0):
+        """Read pending worker reports, returns number of reports read"""
+        count = 0
+        try:
+            while True:
+                worker_id, stats = self.stats_queue.get(timeout=timeout) if count == 0 and timeout else \
+                                   self.stats_queue.get_nowait()
+                self.worker_stats[worker_id] = stats
+                count += 1
+        except queue.Empty:
+            pass
+        return count
+    
+    def merged_stats(self):
+        """Sum of numeric counters over all workers"""
+        merged = {}
+        for stats in self.worker_stats.values():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)):
+                    merged[key] = merged.get(key, 0) + value
+        merged['workers_reporting'] = len(self.worker_stats)
+        merged['workers_alive'] = sum(process.is_alive() for process in self.workers)
+        return merged
+    
+    def stop(self, timeout=2.0):
+        """Terminate worker processes"""
+        for process in self.workers:
+            if process.is_alive():
+                process.terminate()
+        for process in self.workers:
+            process.join(timeout)
+        self.poll()
+
+class LocalTcpConnection:
+    """C37.118 frames over TCP stream - one connected socket with its framer"""
+    
+    def __init__(self, sock, addr, buffer_size=65536):
+        self.sock = sock
+        self.addr = addr
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
+        # Stream is received straight into framer buffer, frames are views into it
+        self.framer = StreamFramer(buffer_size)
+    
+    def send(self, payload: bytes):
+        """Send complete frame"""
+        try:
+            self.sock.sendall(payload)
+        except Exception as e:
+            print(f"Send error: {e}")
+            raise
+    
+    def recv_frames(self):
+        """Receive available bytes and return list of complete frames (may be empty).
+        
+        Frames are memoryviews valid only until next call - copy them with bytes()
+        if they must outlive current iteration.
+        """
+        try:
+            if not self.framer.recv_into(self.sock):
+                raise ConnectionError(f"Connection closed by {self.addr[0]}:{self.addr[1]}")
+            return list(self.framer)
+        except Exception as e:
+            print(f"Receive error: {e}")
+            raise
+    
+    def recv_frame(self):
+        """Receive next complete frame, blocks until whole frame arrives"""
+        frame = self.framer.next_frame()
+        while frame is None:
+            if not self.framer.recv_into(self.sock):
+                raise ConnectionError(f"Connection closed by {self.addr[0]}:{self.addr[1]}")
+            frame = self.framer.next_frame()
+        return frame
+    
+    def close(self):
+        try:
+            self.sock.close()
+        except:
+            pass
+    
+    def __del__(self):
+        self.close()
+
+class LocalTcpPmuClient(LocalTcpConnection):
+    """PMU Client sending frames to PDC over TCP"""
+    
+    def __init__(self, IP_to_send='127.0.0.1', port_to_send=4712, buffer=65536):
+        # Mock sudo check (always passes)
+        check_sudo()
+        
+        self.PDC_IP = IP_to_send
+        self.PDC_port = port_to_send
+        self._time_offset = 0.0
+        
+        sock = socket.create_connection((IP_to_send, port_to_send), timeout=10.0)
+        super().__init__(sock, (IP_to_send, port_to_send), buffer)
+        
+        print(f"Local TCP PMU Client connected: {IP_to_send}:{port_to_send}")
+    
+    def send_to_PDC(self, payload: bytes):
+        """Send frame to PDC"""
+        self.send(payload)
+    
+    def recv_frm_PDC(self) -> bytes:
+        """Receive next frame from PDC"""
+        return bytes(self.recv_frame())
+    
+    def get_time_offset(self):
+        """Mock time offset for local testing"""
+        return self._time_offset
+
+class LocalTcpPdcServer:
+    """PDC Server accepting PMU connections over TCP"""
+    
+    def __init__(self, ip_server_is_binding='127.0.0.1', port_opening=4712, buffer_size=65536, backlog=16):
+        # Mock sudo check (always passes)
+        check_sudo()
+        
+        self.ip_server_is_binding = ip_server_is_binding
+        self.port_opening = port_opening
+        self.buffer_size = buffer_size
+        self._time_offset = 0.0
+        
+        self.server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        
+        try:
+            self.server_sock.bind((self.ip_server_is_binding, self.port_opening))
+            self.server_sock.listen(backlog)
+            print(f"Local TCP PDC Server listening on: {ip_server_is_binding}:{port_opening}")
+        except socket.error as err:
+            print(f"Bind error: {err}")
+            raise
+    
+    def accept(self) -> LocalTcpConnection:
+        """Wait for PMU connection"""
+        sock, addr_of_client = self.server_sock.accept()
+        print(f"PMU connected from: {addr_of_client[0]}:{addr_of_client[1]}")
+        return LocalTcpConnection(sock, addr_of_client, self.buffer_size)
+    
+    def get_time_offset(self):
+        """Mock time offset for local testing"""
+        return self._time_offset
+    
     def __del__(self):
         try:
             self.server_sock.close()
@@ -30,6 +30,90 @@ LOCAL_PMU_ID_PORT_MAP = {
     4000: {'ip': '127.0.0.1', 'port': 9994}   # PMU 34
 }
 
+# PDC receive loop tuning
+PDC_RUNTIME_CONFIG = {
+    'frame_pool_size': 64,  # Reusable DataFrame instances
+    'gc_freeze': True,      # Freeze objects created at startup before receive loop
+    'workers': 1,           # >1 starts SO_REUSEPORT ingest worker processes
+    'worker_batch_size': 100,  # Rows written per transaction by each worker
+    'ack_mode': 'cumulative',  # 'cumulative' binary ACK every N frames / T ms or 'per_frame' text ACK
+    'ack_every_frames': 10,
+    'ack_every_ms': 100,
+    'rcvbuf': 4 * 1024 * 1024,  # SO_RCVBUF request in bytes, None keeps kernel default
+    'sndbuf': None,             # SO_SNDBUF request in bytes
+    'drop_telemetry': True,     # SO_RXQ_OVFL drop counter on every received datagram (Linux)
+    'rate_control': True,       # Throttle PMUs with command frames when PDC falls behind
+    'rate_steps': (30, 15, 10), # DATA_RATE cap per load level, stop/start shedding below last step
+    'high_lateness_ms': 100,    # Processing lateness behind frame timestamp meaning overload
+    'low_lateness_ms': 20,
+    'high_queue_depth': 0.75,   # Receive batch fill meaning overload
+    'low_queue_depth': 0.25,
+    'control_hold_sec': 2.0,    # Minimum time between load level changes
+    'shed_fraction': 0.25,      # Part of streams stopped per step at lowest rate
+    'multicast_group': None,    # e.g. '239.255.37.118' re-publishes frames to downstream subscribers
+    'multicast_port': 4713,
+    'multicast_ttl': 1,         # 1 stays on local subnet
+    'multicast_interface': '127.0.0.1',
+    'sequence_window': 256,     # Grid points per PMU remembered for duplicate/reorder detection
+    'max_gap_sec': 5.0,         # Longer gaps in a stream are outages, not lost frames
+    'concentrator': False,      # Align PMUs into multi-stream frames, multicast then carries concentrated stream
+    'concentrator_id_code': 35, # IDCODE of concentrated stream
+    'concentrator_rate': 30,    # DATA_RATE of concentrated stream
+    'wait_ms': 100,             # Slot waits this long for missing PMUs after its first frame
+    'max_slots': 64,            # Open slots at most - bounds concentrator memory
+    'late_policy': 'drop',      # 'drop' frames of emitted slots or 'emit' them flagged as sorted by arrival
+    'stage_queues': {           # Stage -> (queue capacity in items, policy when full: 'drop', 'drop_oldest', 'block')
+        'decode': (8192, 'drop'),          # Fed by socket reads - never 'block'
+        'align': (4096, 'block'),
+        'store': (16384, 'block'),         # Slow commit backs up decode, not socket reads
+        'analyze': (1024, 'drop_oldest'),  # Anomaly bursts and console lag skip to latest frames
+        'publish': (4096, 'drop')
+    },
+    'store_batch_size': 500,    # Rows per transaction at most, store stage writes everything queued
+    'console': 'dashboard',     # 'dashboard' refreshed per-PMU view or 'headless' status lines only
+    'dashboard_refresh_hz': 2,
+    'dashboard_rows': 10,       # PMUs shown at most, most anomalies first
+    'headless_stats_sec': 10.0, # Status lines interval in headless mode
+    'stats_ewma_alpha': 0.1     # Weight of newest frame in per-PMU running averages
+}
+
+# PMU send loop tuning
+PMU_RUNTIME_CONFIG = {
+    'ack_mode': 'cumulative',  # Must match PDC - 'cumulative' never waits, 'per_frame' is stop-and-wait
+    'ack_window': 64,          # Frames in flight before oldest is accounted as unacknowledged
+    'ack_drain_sec': 0.5,      # Wait for last ACKs after sending
+    'via_proxy': False         # Send to impairment proxy instead of PDC
+}
+
+# Fleet load generator (load_generator.py)
+LOAD_GENERATOR_CONFIG = {
+    'first_id_code': 2000,  # IDCODEs of logical PMUs start here, clear of pmu_31..pmu_34
+    'num_pmus': 1000,
+    'processes': 1,         # Logical PMUs are split across generator processes
+    'sockets': 4,           # UDP sockets shared by PMUs of one process
+    'data_rate': 30,
+    'seed': 42
+}
+
+# Impairment proxy profiles - delays in ms, probabilities per datagram
+IMPAIRMENT_PROFILES = {
+    'none': {},
+    'lan': {'latency_ms': 1, 'jitter_ms': 0.2, 'distribution': 'normal'},
+    'wan': {'latency_ms': 40, 'jitter_ms': 5, 'distribution': 'normal', 'loss': 0.001},
+    'lossy': {'latency_ms': 20, 'jitter_ms': 10, 'distribution': 'pareto', 'loss': 0.02, 'loss_correlation': 0.25,
+              'duplicate': 0.01, 'reorder': 0.02, 'reorder_ms': 50},
+    'congested': {'latency_ms': 30, 'jitter_ms': 5, 'distribution': 'exponential', 'bandwidth_kbps': 512,
+                  'queue_ms': 200}
+}
+
+IMPAIRMENT_CONFIG = {
+    'proxy': {'ip': '127.0.0.1', 'port': 9996},  # impairment_proxy.py listens here, in front of PDC
+    'profile': 'wan',           # PMU -> PDC direction
+    'reverse_profile': 'none',  # PDC -> PMU (ACKs, commands)
+    'seed': 1,                  # Same seed, same impairment decisions for same traffic
+    'idle_sec': 60              # PMU flows without traffic are forgotten
+}
+
 # IP name mapping for local testing
 LOCAL_IP_NAME_DICT = {
     '127.0.0.1': 'localhost_all_pmus'
@@ -43,6 +127,26 @@ def get_pdc_config():
     """Get PDC server configuration for local testing"""
     return LOCAL_CONFIG['pdc_35']
 
+def get_pmu_target_config():
+    """Address PMUs send to - impairment proxy when enabled, otherwise PDC"""
+    return IMPAIRMENT_CONFIG['proxy'] if PMU_RUNTIME_CONFIG['via_proxy'] else get_pdc_config()
+
+def get_pdc_runtime_config():
+    """Get PDC receive loop tuning"""
+    return PDC_RUNTIME_CONFIG
+
+def get_pmu_runtime_config():
+    """Get PMU send loop tuning"""
+    return PMU_RUNTIME_CONFIG
+
+def get_load_generator_config():
+    """Get fleet load generator settings"""
+    return LOAD_GENERATOR_CONFIG
+
+def get_impairment_config():
+    """Get impairment proxy settings"""
+    return IMPAIRMENT_CONFIG
+
 def get_all_pmu_configs():
     """Get all PMU configurations"""
     return {k: v for k, v in LOCAL_CONFIG.items() if k.startswith('pmu_')}
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Live PDC console - fixed-refresh dashboard instead of per-frame dumps
+
+Decode stage records every frame into PmuBoard in O(1): latest values,
+frames of current rate window and ring of recent latencies. Analyze stage
+adds anomaly counters - its queue drops oldest items under load, so it
+never feeds frame counts or rates. Dashboard thread renders the board at fixed refresh and shows at
+most `max_rows` PMUs - the ones with most anomalies - so console output
+costs the same at 10 PMUs or 10,000:
+
+    📟 PDC 12:00:01 | 4 PMUs (4 live) | 3600 frames, 120.0 fps | latency p50 420 p95 900 p99 1900 μs
+       PMU    fps  freq Hz    σ Hz  VA kV  sync  p50 μs  p99 μs  anomalies  last anomaly
+        31   30.0   60.012  0.0021  1.002    OK     420    1900          3  frequency_deviation
+       ...
+    <status lines - kernel, streams, stages, load>
+
+Headless mode prints only header and status lines at a slow interval and
+never clears the screen, for logs and launchers reading PDC output.
+"""
+import sys
+import heapq
+import threading
+from datetime import datetime
+from time import monotonic
+
+CONSOLE_MODES = ('dashboard', 'headless')
+
+
+def ring_append(ring, position, value, size):
+    """Append to fixed-size ring, returns next position"""
+    if len(ring) < size:
+        ring.append(value)
+    else:
+        ring[position] = value
+    return (position + 1) % size
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Nearest-rank percentiles of samples, None for empty samples"""
+    if not samples:
+        return [None] * len(points)
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return [ordered[min(last, int(round(point / 100 * last)))] for point in points]
+
+
+class PmuRow:
+    """Dashboard state of one PMU"""
+    __slots__ = ('frames', 'measurements', 'sync', 'last_seen', 'fps', 'window_frames', 'window_start',
+                 'latencies', 'latency_position', 'anomalies', 'last_anomaly')
+
+    def __init__(self, now):
+        self.frames = 0
+        self.measurements = None   # Latest frame data
+        self.sync = True           # Time sync OK
+        self.last_seen = now
+        self.fps = 0.0             # Rate of last complete window
+        self.window_frames = 0     # Frames in current window
+        self.window_start = now
+        self.latencies = []        # Ring of recent latencies
+        self.latency_position = 0
+        self.anomalies = 0
+        self.last_anomaly = None   # Type of last anomaly
+
+
+class PmuBoard:
+    """Per-PMU state shown by dashboard - frames written by decode stage, anomalies by analyze stage,
+    read by dashboard thread"""
+
+    def __init__(self, latency_samples=128, total_latency_samples=4096, rate_window_sec=1.0):
+        self.latency_samples = latency_samples
+        self.total_latency_samples = total_latency_samples
+        self.rate_window_sec = rate_window_sec
+
+        self.pmus = {}  # IDCODE -> PmuRow
+
+        self.frames = 0
+        self.anomalies = {}  # Anomaly type -> count over all PMUs
+        self.latencies = []  # Ring of recent latencies over all PMUs
+        self._latency_position = 0
+
+    def on_frame(self, pmu_id, frame_data, sync, comm_delay, now=None):
+        """Record decoded frame"""
+        now = monotonic() if now is None else now
+        pmu = self.pmus.get(pmu_id)
+        if pmu is None:
+            pmu = self.pmus[pmu_id] = PmuRow(now)
+
+        pmu.frames += 1
+        pmu.measurements, pmu.sync, pmu.last_seen = frame_data, sync, now
+
+        # Rate of last complete window
+        pmu.window_frames += 1
+        if now - pmu.window_start >= self.rate_window_sec:
+            pmu.fps = pmu.window_frames / (now - pmu.window_start)
+            pmu.window_frames, pmu.window_start = 0, now
+
+        pmu.latency_position = ring_append(pmu.latencies, pmu.latency_position, comm_delay, self.latency_samples)
+        self._latency_position = ring_append(self.latencies, self._latency_position, comm_delay,
+                                             self.total_latency_samples)
+        self.frames += 1
+
+    def on_anomalies(self, pmu_id, anomalies):
+        """Record anomalies of analyzed frame, PMU row exists since its frame was decoded"""
+        pmu = self.pmus.get(pmu_id)
+        if pmu is None:
+            return
+        for anomaly in anomalies:
+            pmu.anomalies += 1
+            pmu.last_anomaly = anomaly['type']
+            self.anomalies[anomaly['type']] = self.anomalies.get(anomaly['type'], 0) + 1
+
+class Dashboard:
+    """Renders PmuBoard and status lines from its own thread at fixed refresh
+    `status_lines` - callable returning list of status lines (kernel, streams, stages ...)
+    `refresh_sec`  - seconds between renders
+    `max_rows`     - PMU rows shown at most
+    `headless`     - no PMU table and no screen clearing
+    `stale_sec`    - PMUs silent this long are not live, their rate shows 0
+    `stream_stats` - StreamStats with 'frequency' field, adds frequency σ of every shown PMU
+    """
+
+    def __init__(self, board, status_lines=None, refresh_sec=0.5, max_rows=10, headless=False, stale_sec=2.0,
+                 out=None, stream_stats=None):
+        self.board = board
+        self.stream_stats = stream_stats
+        self.status_lines = status_lines
+        self.refresh_sec = refresh_sec
+        self.max_rows = max_rows
+        self.headless = headless
+        self.stale_sec = stale_sec
+        self.out = sys.stdout if out is None else out
+        self.clear = not headless and self.out.isatty()
+
+        self.renders = 0
+        self._last_frames = 0
+        self._last_render = monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dashboard", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(self.refresh_sec + 1.0)
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_sec):
+            try:
+                text = "\n".join(self.render())
+            except Exception as e:
+                # Board and stats change under the reader, next refresh sees consistent state again
+                text = f"⚠️  Dashboard render error: {e}"
+            self.out.write(("\033[H\033[J" if self.clear else "\n") + text + "\n")
+            self.out.flush()
+            self.renders += 1
+
+    def render(self, now=None):
+        """Lines of one refresh"""
+        now = monotonic() if now is None else now
+        board = self.board
+        pmus = list(board.pmus.items())
+
+        elapsed = now - self._last_render
+        frames = board.frames
+        fps = (frames - self._last_frames) / elapsed if elapsed > 0 else 0.0
+        self._last_frames, self._last_render = frames, now
+
+        live = sum(1 for _, pmu in pmus if now - pmu.last_seen < self.stale_sec)
+        p50, p95, p99 = percentiles(list(board.latencies))
+        latency = f"latency p50 {p50} p95 {p95} p99 {p99} μs" if p50 is not None else "no frames yet"
+        lines = [f"📟 PDC {datetime.now().strftime('%H:%M:%S')} | {len(pmus)} PMUs ({live} live) | "
+                 f"{frames} frames, {fps:.1f} fps | {latency}"]
+
+        if board.anomalies:
+            lines.append("🚨 Anomalies: " + " | ".join(f"{kind} {count}"
+                                                       for kind, count in sorted(board.anomalies.items())))
+
+        if not self.headless:
+            lines.append(f"{'PMU':>7} {'fps':>6} {'freq Hz':>8} {'σ Hz':>7} {'VA kV':>6} {'sync':>5} {'p50 μs':>7} "
+                         f"{'p99 μs':>7} {'anomalies':>10}  last anomaly")
+            for pmu_id, pmu in heapq.nsmallest(self.max_rows, pmus, key=lambda item: (-item[1].anomalies, item[0])):
+                lines.append(self.pmu_row(pmu_id, pmu, now))
+            if len(pmus) > self.max_rows:
+                lines.append(f"{'':>7} ... {len(pmus) - self.max_rows} more PMUs")
+
+        if self.status_lines is not None:
+            lines.extend(self.status_lines())
+        return lines
+
+    def pmu_row(self, pmu_id, pmu, now):
+        frame_data = pmu.measurements
+        fps = pmu.fps if now - pmu.last_seen < self.stale_sec else 0.0
+        p50, p99 = percentiles(list(pmu.latencies), (50, 99))
+        stats = self.stream_stats.get_stream_stats(pmu_id) if self.stream_stats is not None else None
+        freq_std = f"{stats['frequency']['std']:>7.4f}" if stats is not None else f"{'-':>7}"
+        return (f"{pmu_id:>7} {fps:>6.1f} {frame_data['frequency']:>8.3f} {freq_std} {frame_data['va_mag']:>6.3f} "
+                f"{'OK' if pmu.sync else 'ERR':>5} {p50:>7} {p99:>7} {pmu.anomalies:>10}  {pmu.last_anomaly or '-'}")
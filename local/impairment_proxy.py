@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Network Impairment Proxy - WAN conditions between PMUs and PDC on localhost
+
+UDP proxy listening on proxy address of IMPAIRMENT_CONFIG and forwarding to PDC.
+Every PMU address gets its own upstream socket, so PDC answers (ACKs,
+commands) find their way back. Each direction applies one impairment
+profile from IMPAIRMENT_PROFILES, in netem order:
+
+    loss -> duplication -> bandwidth queue -> latency/jitter -> reordering
+
+Every decision comes from one seeded random generator, so the same traffic
+gets the same impairments and benchmarks of alignment, loss tracking and
+backpressure are repeatable. What the proxy did is counted exactly:
+
+    received + duplicated = lost + queue_drops + delivered + send_errors + pending
+
+Set 'via_proxy' in PMU_RUNTIME_CONFIG to route client.py and
+load_generator.py through the proxy.
+
+    python3 impairment_proxy.py [profile] [duration] [report.json] [reverse_profile]
+"""
+import sys
+import os
+import json
+import heapq
+import random
+import select
+import socket
+from math import sqrt
+from time import time, monotonic
+
+# Add common directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'common'))
+
+from config import IMPAIRMENT_PROFILES, get_pdc_config, get_impairment_config
+
+DISTRIBUTIONS = ('constant', 'uniform', 'normal', 'exponential', 'pareto')
+PARETO_ALPHA = 2.5  # Heavy tail which still has finite variance
+
+class Impairment:
+    """Fate of datagrams in one direction"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, distribution='constant', loss=0.0, loss_correlation=0.0,
+                 duplicate=0.0, reorder=0.0, reorder_ms=None, bandwidth_kbps=None, queue_ms=100.0, rng=None):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}', use one of {DISTRIBUTIONS}")
+
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.distribution = distribution
+        self.loss = loss
+        self.loss_correlation = loss_correlation  # Probability of loss right after loss - bursts
+        self.duplicate = duplicate
+        self.reorder = reorder
+        # Reordered datagram is held back so that later ones overtake it
+        self.reorder_delay = (reorder_ms if reorder_ms is not None else max(2 * jitter_ms, 10.0)) / 1000.0
+        self.bytes_per_sec = bandwidth_kbps * 125.0 if bandwidth_kbps else None
+        self.queue_limit = queue_ms / 1000.0
+        self.rng = rng or random.Random()
+
+        self._last_lost = False
+        self._link_free = 0.0  # When link finishes serializing queued datagrams
+        self._next_seq = 0
+        self._max_delivered = -1
+
+        self.counters = {'received': 0, 'bytes_in': 0, 'lost': 0, 'duplicated': 0, 'queue_drops': 0,
+                         'reorder_delayed': 0, 'delivered': 0, 'bytes_out': 0, 'out_of_order': 0,
+                         'send_errors': 0}
+        self._delay_n = 0
+        self._delay_mean = 0.0
+        self._delay_m2 = 0.0
+        self._delay_max = 0.0
+
+    @classmethod
+    def from_profile(cls, profile, rng):
+        return cls(rng=rng, **profile)
+
+    def _delay(self):
+        """Latency of one datagram in seconds"""
+        rng = self.rng
+        if self.distribution == 'constant' or not self.jitter:
+            return self.latency
+        if self.distribution == 'uniform':
+            delay = self.latency + rng.uniform(-self.jitter, self.jitter)
+        elif self.distribution == 'normal':
+            delay = rng.gauss(self.latency, self.jitter)
+        elif self.distribution == 'exponential':
+            delay = self.latency + rng.expovariate(1.0 / self.jitter)
+        else:
+            # Mean of pareto - 1 is 1 / (alpha - 1), scaled so mean extra delay is jitter
+            delay = self.latency + self.jitter * (PARETO_ALPHA - 1) * (rng.paretovariate(PARETO_ALPHA) - 1)
+        return max(0.0, delay)
+
+    def schedule(self, now, size):
+        """Decide fate of datagram received at `now`, returns list of (delivery time, sequence number)"""
+        counters = self.counters
+        counters['received'] += 1
+        counters['bytes_in'] += size
+        seq = self._next_seq
+        self._next_seq += 1
+
+        loss = self.loss_correlation if self._last_lost and self.loss_correlation > self.loss else self.loss
+        self._last_lost = loss > 0 and self.rng.random() < loss
+        if self._last_lost:
+            counters['lost'] += 1
+            return []
+
+        copies = 1
+        if self.duplicate and self.rng.random() < self.duplicate:
+            copies = 2
+            counters['duplicated'] += 1
+
+        deliveries = []
+        for _ in range(copies):
+            departure = now
+            if self.bytes_per_sec:
+                start = max(now, self._link_free)
+                if start - now > self.queue_limit:
+                    counters['queue_drops'] += 1
+                    continue
+                self._link_free = start + size / self.bytes_per_sec
+                departure = self._link_free
+
+            delay = self._delay()
+            if self.reorder and self.rng.random() < self.reorder:
+                delay += self.reorder_delay
+                counters['reorder_delayed'] += 1
+            deliveries.append((departure + delay, seq))
+
+        return deliveries
+
+    def on_delivered(self, seq, size, delay):
+        """Account datagram handed to socket `delay` seconds after it was received"""
+        counters = self.counters
+        counters['delivered'] += 1
+        counters['bytes_out'] += size
+        if seq < self._max_delivered:
+            counters['out_of_order'] += 1
+        else:
+            self._max_delivered = seq
+
+        # Welford's running mean and variance of achieved delay
+        self._delay_n += 1
+        diff = delay - self._delay_mean
+        self._delay_mean += diff / self._delay_n
+        self._delay_m2 += diff * (delay - self._delay_mean)
+        if delay > self._delay_max:
+            self._delay_max = delay
+
+    def get_stats(self):
+        jitter = sqrt(self._delay_m2 / (self._delay_n - 1)) if self._delay_n > 1 else 0.0
+        return dict(self.counters, delay_mean_ms=round(self._delay_mean * 1000, 3),
+                    delay_max_ms=round(self._delay_max * 1000, 3), jitter_ms=round(jitter * 1000, 3))
+
+class ImpairmentProxy:
+    """UDP proxy between PMUs and PDC"""
+
+    def __init__(self, listen_ip, listen_port, pdc_ip, pdc_port, upstream, downstream, idle_sec=60,
+                 buffer=65536):
+        self.pdc_addr = (pdc_ip, pdc_port)
+        self.upstream = upstream      # PMU -> PDC
+        self.downstream = downstream  # PDC -> PMU
+        self.idle_sec = idle_sec
+        self.BUFFER_SIZE = buffer
+
+        self.listen_sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        self.listen_sock.bind((listen_ip, listen_port))
+        self.listen_sock.setblocking(False)
+
+        # PMU address -> [upstream socket, last activity], upstream socket -> PMU address
+        self.flows = {}
+        self.pmu_of = {}
+        self.flows_opened = 0
+
+        # (delivery time, tiebreak, impairment, sequence number, socket, destination, payload, received at)
+        self._pending = []
+        self._tiebreak = 0
+
+    def _flow_socket(self, pmu_addr, now):
+        flow = self.flows.get(pmu_addr)
+        if flow is None:
+            sock = socket.socket(family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            sock.connect(self.pdc_addr)
+            flow = self.flows[pmu_addr] = [sock, now]
+            self.pmu_of[sock] = pmu_addr
+            self.flows_opened += 1
+        flow[1] = now
+        return flow[0]
+
+    def _expire_flows(self, now):
+        for pmu_addr, (sock, last_activity) in list(self.flows.items()):
+            if now - last_activity >= self.idle_sec and not any(item[4] is sock for item in self._pending):
+                del self.flows[pmu_addr]
+                del self.pmu_of[sock]
+                sock.close()
+
+    def _receive(self, sock, now):
+        """Drain socket and schedule every datagram"""
+        while True:
+            try:
+                payload, addr = sock.recvfrom(self.BUFFER_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionRefusedError:
+                continue  # ICMP port unreachable of earlier send, PDC not up yet
+
+            if sock is self.listen_sock:
+                impairment, out_sock, destination = self.upstream, self._flow_socket(addr, now), None
+            else:
+                pmu_addr = self.pmu_of[sock]
+                self.flows[pmu_addr][1] = now
+                impairment, out_sock, destination = self.downstream, self.listen_sock, pmu_addr
+
+            for deliver_at, seq in impairment.schedule(now, len(payload)):
+                self._tiebreak += 1
+                heapq.heappush(self._pending, (deliver_at, self._tiebreak, impairment, seq, out_sock, destination,
+                                               payload, now))
+
+    def _deliver(self, now):
+        """Send datagrams whose delivery time has come"""
+        pending = self._pending
+        while pending and pending[0][0] <= now:
+            _, _, impairment, seq, sock, destination, payload, received_at = heapq.heappop(pending)
+            try:
+                if destination is None:
+                    sock.send(payload)
+                else:
+                    sock.sendto(payload, destination)
+            except OSError:
+                impairment.counters['send_errors'] += 1
+                continue
+            impairment.on_delivered(seq, len(payload), now - received_at)
+
+    def run(self, duration_sec=None):
+        """Forward until `duration_sec` passed (None - until interrupted), then flush pending datagrams"""
+        start = monotonic()
+        last_expire = start
+
+        while duration_sec is None or monotonic() - start < duration_sec:
+            now = monotonic()
+            timeout = min(max(self._pending[0][0] - now, 0.0), 0.5) if self._pending else 0.5
+            ready, _, _ = select.select([self.listen_sock] + list(self.pmu_of), [], [], timeout)
+
+            now = monotonic()
+            for sock in ready:
+                self._receive(sock, now)
+            self._deliver(monotonic())
+
+            if now - last_expire >= 1.0:
+                last_expire = now
+                self._expire_flows(now)
+
+        # Datagrams already in flight are still delivered
+        while self._pending:
+            self._deliver(monotonic())
+            if self._pending:
+                select.select([], [], [], max(self._pending[0][0] - monotonic(), 0.0))
+
+    def get_stats(self):
+        return {
+            'flows': len(self.flows),
+            'flows_opened': self.flows_opened,
+            'pending': len(self._pending),
+            'upstream': self.upstream.get_stats(),
+            'downstream': self.downstream.get_stats(),
+        }
+
+    def close(self):
+        for sock, _ in self.flows.values():
+            sock.close()
+        self.listen_sock.close()
+
+def print_report(report):
+    """What proxy did in each direction"""
+    print("="*50)
+    print(f"🔀 {report['flows_opened']} PMU flows | profile '{report['profile']}' up, "
+          f"'{report['reverse_profile']}' down | seed {report['seed']}")
+    for direction, arrow in (('upstream', 'PMU → PDC'), ('downstream', 'PDC → PMU')):
+        stats = report[direction]
+        print(f"📦 {arrow}: {stats['received']} received | {stats['delivered']} delivered | "
+              f"{stats['lost']} lost | {stats['queue_drops']} queue drops | {stats['duplicated']} duplicated | "
+              f"{stats['reorder_delayed']} reorder delayed ({stats['out_of_order']} out of order) | "
+              f"{stats['send_errors']} send errors")
+        print(f"   ⏱️  Delay: mean {stats['delay_mean_ms']} ms | max {stats['delay_max_ms']} ms | "
+              f"jitter {stats['jitter_ms']} ms")
+
+def main():
+    """Impairment proxy main function"""
+
+    impairment_config = get_impairment_config()
+    proxy_config = impairment_config['proxy']
+    pdc_config = get_pdc_config()
+
+    profile = sys.argv[1] if len(sys.argv) > 1 else impairment_config['profile']
+    duration = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    output = sys.argv[3] if len(sys.argv) > 3 else None
+    reverse_profile = sys.argv[4] if len(sys.argv) > 4 else impairment_config['reverse_profile']
+
+    for name in (profile, reverse_profile):
+        if name not in IMPAIRMENT_PROFILES:
+            print(f"❌ Unknown profile '{name}', available: {', '.join(IMPAIRMENT_PROFILES)}")
+            return
+
+    # One generator for both directions - run is repeatable for same seed and traffic
+    rng = random.Random(impairment_config['seed'])
+    upstream = Impairment.from_profile(IMPAIRMENT_PROFILES[profile], rng)
+    downstream = Impairment.from_profile(IMPAIRMENT_PROFILES[reverse_profile], rng)
+
+    proxy = ImpairmentProxy(proxy_config['ip'], proxy_config['port'], pdc_config['ip'], pdc_config['port'],
+                            upstream, downstream, impairment_config['idle_sec'])
+
+    print(f"🔀 Network Impairment Proxy")
+    print(f"📍 Listening: {proxy_config['ip']}:{proxy_config['port']} → PDC {pdc_config['ip']}:{pdc_config['port']}")
+    print(f"🌐 PMU → PDC: {profile} {IMPAIRMENT_PROFILES[profile]}")
+    print(f"🌐 PDC → PMU: {reverse_profile} {IMPAIRMENT_PROFILES[reverse_profile]}")
+    print(f"⏱️  Duration: {f'{duration} seconds' if duration else 'until Ctrl+C'}")
+    print("="*50)
+
+    try:
+        proxy.run(duration)
+    except KeyboardInterrupt:
+        print("\n🛑 Proxy stopped")
+
+    report = dict(proxy.get_stats(), timestamp=time(), profile=profile, reverse_profile=reverse_profile,
+                  seed=impairment_config['seed'], duration=duration)
+    proxy.close()
+    print_report(report)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Fleet Load Generator - thousands of logical PMUs from one or few processes
+
+Every logical PMU has its own IDCODE and CFG-2. PMUs of one process share a
+few UDP sockets, measurements of the whole fleet are simulated with NumPy and
+encoded into one preallocated buffer per tick, so one process drives far more
+PMUs than one client.py process per PMU.
+
+    python3 load_generator.py [num_pmus] [duration] [processes] [report.json]
+
+Achieved send rate of every PMU and rate confirmed by PDC cumulative ACKs are
+reported. ACK COUNT is counted by PDC since it first saw IDCODE - restart PDC
+between runs for exact delivery numbers.
+"""
+import sys
+import os
+import json
+import multiprocessing
+import numpy as np
+from time import time, monotonic, sleep as time_sleep
+
+# Add common directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'common'))
+
+from comms import LocalPmuFleetClient
+from config import get_pmu_target_config, get_load_generator_config
+from client import VectorizedPowerSystemSimulator
+
+# Import frame classes from common
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'common'))
+from frame import ConfigFrame2, DataFrame, DataFrameBatchEncoder
+from ack import decode_ack
+from scheduler import FrameScheduler
+
+# Wire scaling of local PMU layout - words in range of client.py frames (VA 14635), FREQ/DFREQ as
+# server.extract_frame_data reads them
+PHASOR_SCALE = 120
+FREQ_SCALE = 40
+ROCOF_SCALE = 10
+CURRENT_UNIT = 100  # I1 is sent in hundreds of A like PowerSystemSimulator
+
+STAT_OK = DataFrame._stat2int("ok", True, "timestamp", False, False, False, 0, "<10", 0)
+STAT_TEST = DataFrame._stat2int("test", True, "timestamp", False, False, False, 0, "<10", 0)
+
+def fleet_config(pmu_id, data_rate=30):
+    """CFG-2 of logical PMU - local PMU layout with own IDCODE and station name"""
+    return ConfigFrame2(pmu_id, 1000000, 1, f"FLEET {pmu_id}", pmu_id, (False, False, True, False),
+                        4, 3, 1,
+                        ["VA", "VB", "VC", "I1", "ANALOG1", "ANALOG2", "ANALOG3"] +
+                        [f"BREAKER {i:X} STATUS" for i in range(1, 17)],
+                        [(915527, "v"), (915527, "v"), (915527, "v"), (45776, "i")],
+                        [(1, "pow"), (1, "rms"), (1, "peak")], [(0x0000, 0xffff)],
+                        60, 22, data_rate)
+
+def rate_summary(rates):
+    """Min/mean/max of per PMU rates"""
+    if not len(rates):
+        return {'min': 0.0, 'mean': 0.0, 'max': 0.0}
+    return {'min': round(float(np.min(rates)), 2), 'mean': round(float(np.mean(rates)), 2),
+            'max': round(float(np.max(rates)), 2)}
+
+class FleetGenerator:
+    """Logical PMUs of one process - shared sockets, one batch encoder, one simulator"""
+
+    def __init__(self, pmu_ids, pdc_ip, pdc_port, data_rate=30, num_sockets=4, seed=42):
+        self.pmu_ids = list(pmu_ids)
+        self.num_pmus = len(self.pmu_ids)
+        self.data_rate = data_rate
+        self.index = {pmu_id: i for i, pmu_id in enumerate(self.pmu_ids)}
+
+        self.configs = [fleet_config(pmu_id, data_rate) for pmu_id in self.pmu_ids]
+        self.encoder = DataFrameBatchEncoder(self.configs[0], self.pmu_ids)
+        self.simulator = VectorizedPowerSystemSimulator(self.pmu_ids, seed)
+        self.client = LocalPmuFleetClient(pdc_ip, pdc_port, num_sockets)
+
+        # Per PMU accounting
+        self.sent = np.zeros(self.num_pmus, dtype=np.int64)
+        self.acked = np.zeros(self.num_pmus, dtype=np.int64)  # Cumulative ACK COUNT from PDC
+        self.cfg_acked = set()
+
+        # Wire arrays refilled every tick
+        self._phasors = np.zeros((self.num_pmus, 4, 2))
+        self._stat = np.full(self.num_pmus, STAT_OK, dtype=np.uint16)
+
+    def handle_responses(self):
+        """Account all queued PDC responses"""
+        for response in self.client.poll_frm_PDC():
+            ack = decode_ack(response)
+            if ack is not None:
+                i = self.index.get(ack[0])
+                if i is not None and ack[3] > self.acked[i]:
+                    self.acked[i] = ack[3]
+            elif response.startswith(b"CFG_ACK_"):
+                self.cfg_acked.add(int(response[8:]))
+
+    def announce(self, timeout=3.0):
+        """Send CFG-2 of every PMU, wait up to timeout for PDC to acknowledge all"""
+        for i, cfg in enumerate(self.configs):
+            self.client.send_to_PDC(cfg.convert2bytes(), i)
+            # Don't overflow socket buffers with thousands of configs at once
+            if i % 256 == 255:
+                time_sleep(0.01)
+                self.handle_responses()
+
+        deadline = monotonic() + timeout
+        while len(self.cfg_acked) < self.num_pmus and monotonic() < deadline:
+            time_sleep(0.01)
+            self.handle_responses()
+
+        return len(self.cfg_acked)
+
+    def tick(self, soc, frasec, frame_count):
+        """Simulate, encode and send one frame of every PMU"""
+        self.simulator.simulate_event(frame_count)
+        m = self.simulator.generate(soc + frasec / 1e6)
+
+        # Polar engineering units to rectangular integer phasors of local PMU layout
+        mag = np.column_stack((m['voltage_mag'], m['current_mag'] / CURRENT_UNIT)) * PHASOR_SCALE
+        angle = np.radians(np.column_stack((m['voltage_angle'], m['current_angle'])))
+        np.rint(mag * np.cos(angle), out=self._phasors[..., 0])
+        np.rint(mag * np.sin(angle), out=self._phasors[..., 1])
+
+        self._stat[:] = np.where(self.simulator.events['breaker_trip'], STAT_TEST, STAT_OK)
+
+        frames = self.encoder.encode(soc, frasec, self._stat, self._phasors,
+                                     np.rint(m['frequency'] * FREQ_SCALE), np.rint(m['rocof'] * ROCOF_SCALE),
+                                     m['analogs'], m['digital'][:, None])
+
+        send = self.client.send_to_PDC
+        self.sent += [send(frame, i) for i, frame in enumerate(frames)]
+
+        self.handle_responses()
+
+    def run(self, duration_sec, drain_sec=0.5):
+        """Send on DATA_RATE grid for duration, returns report"""
+        scheduler = FrameScheduler(self.data_rate)
+
+        frame_count = 0
+        start = monotonic()
+        while monotonic() - start < duration_sec:
+            soc, frasec = scheduler.wait()
+            self.tick(soc, frasec, frame_count)
+            frame_count += 1
+        elapsed = monotonic() - start
+
+        # Last cumulative ACKs are sent by PDC after every_ms
+        time_sleep(drain_sec)
+        self.handle_responses()
+        self.client.close()
+
+        return self.report(elapsed, scheduler.get_stats())
+
+    def report(self, elapsed, scheduler_stats):
+        """Per PMU sent and acknowledged rate"""
+        return {
+            'elapsed': round(elapsed, 3),
+            'scheduler': scheduler_stats,
+            'send_errors': self.client.send_errors,
+            'cfg_acked': len(self.cfg_acked),
+            'per_pmu': [{'id_code': pmu_id, 'sent': int(sent), 'acked': int(acked),
+                         'rate': round(sent / elapsed, 2), 'acked_rate': round(acked / elapsed, 2)}
+                        for pmu_id, sent, acked in zip(self.pmu_ids, self.sent, self.acked)]
+        }
+
+def fleet_worker(pmu_ids, duration_sec, pdc_config, load_config, reports):
+    """Generator process entry point, puts report to queue"""
+    generator = FleetGenerator(pmu_ids, pdc_config['ip'], pdc_config['port'], load_config['data_rate'],
+                               load_config['sockets'], load_config['seed'] + pmu_ids[0])
+    cfg_acked = generator.announce()
+    print(f"🧩 {cfg_acked}/{len(pmu_ids)} CFG-2 acknowledged (IDCODE {pmu_ids[0]}-{pmu_ids[-1]})")
+    reports.put(generator.run(duration_sec))
+
+def run_fleet(num_pmus, duration_sec, num_processes, pdc_config, load_config):
+    """Split PMUs across processes and merge their reports"""
+    first = load_config['first_id_code']
+    pmu_ids = list(range(first, first + num_pmus))
+    chunks = [chunk.tolist() for chunk in np.array_split(pmu_ids, num_processes) if len(chunk)]
+
+    reports = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=fleet_worker, name=f"fleet_{i}",
+                                         args=(chunk, duration_sec, pdc_config, load_config, reports))
+                 for i, chunk in enumerate(chunks)]
+    for process in processes:
+        process.start()
+
+    # Reports are collected before join - process with queued data doesn't exit until it's read
+    worker_reports = [reports.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    per_pmu = sorted((row for report in worker_reports for row in report['per_pmu']), key=lambda row: row['id_code'])
+
+    return {
+        'timestamp': time(),
+        'pmus': len(per_pmu),
+        'processes': len(processes),
+        'data_rate': load_config['data_rate'],
+        'duration': duration_sec,
+        'sent': sum(row['sent'] for row in per_pmu),
+        'acked': sum(row['acked'] for row in per_pmu),
+        'send_errors': sum(report['send_errors'] for report in worker_reports),
+        'cfg_acked': sum(report['cfg_acked'] for report in worker_reports),
+        'rate': rate_summary([row['rate'] for row in per_pmu]),
+        'acked_rate': rate_summary([row['acked_rate'] for row in per_pmu]),
+        'scheduler': [report['scheduler'] for report in worker_reports],
+        'per_pmu': per_pmu
+    }
+
+def print_report(report, slowest=5):
+    """Fleet summary and PMUs with lowest confirmed rate"""
+    rate, acked_rate = report['rate'], report['acked_rate']
+    print("="*50)
+    print(f"📊 {report['pmus']} PMUs | {report['processes']} processes | target {report['data_rate']} fps")
+    print(f"📤 Sent: {report['sent']} frames | {report['send_errors']} send errors | "
+          f"{report['cfg_acked']} CFG-2 acknowledged")
+    print(f"📨 Acked: {report['acked']} frames")
+    print(f"⚡ Rate per PMU: min {rate['min']} | mean {rate['mean']} | max {rate['max']} fps")
+    print(f"✅ Acked rate per PMU: min {acked_rate['min']} | mean {acked_rate['mean']} | max {acked_rate['max']} fps")
+    for i, stats in enumerate(report['scheduler']):
+        print(f"⏱️  Process {i}: {stats['rate']} ticks/s | {stats['skipped']} skipped | "
+              f"lateness mean {stats['lateness_mean_us']} µs | jitter {stats['jitter_us']} µs")
+
+    for row in sorted(report['per_pmu'], key=lambda row: row['acked_rate'])[:slowest]:
+        print(f"   🐢 PMU {row['id_code']}: sent {row['rate']} fps | acked {row['acked_rate']} fps")
+
+def main():
+    """Fleet load generator main function"""
+
+    load_config = get_load_generator_config()
+    pdc_config = get_pmu_target_config()
+
+    num_pmus = int(sys.argv[1]) if len(sys.argv) > 1 else load_config['num_pmus']
+    duration = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    num_processes = int(sys.argv[3]) if len(sys.argv) > 3 else load_config['processes']
+    output = sys.argv[4] if len(sys.argv) > 4 else None
+
+    last_id = load_config['first_id_code'] + num_pmus - 1
+    if num_pmus < 1 or last_id > 65534:
+        print(f"❌ IDCODE range {load_config['first_id_code']}-{last_id} out of range, max IDCODE is 65534")
+        return
+
+    print(f"🏭 Fleet Load Generator")
+    print(f"📍 PMUs: {num_pmus} (IDCODE {load_config['first_id_code']}-{last_id})")
+    print(f"🔗 PDC: {pdc_config['ip']}:{pdc_config['port']}")
+    print(f"⏱️  Duration: {duration} seconds at {load_config['data_rate']} fps, {num_processes} processes")
+    print("="*50)
+
+    try:
+        report = run_fleet(num_pmus, duration, num_processes, pdc_config, load_config)
+    except KeyboardInterrupt:
+        print("\n🛑 Load generator stopped")
+        return
+
+    print_report(report)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to: {output}")
+
+if __name__ == "__main__":
+    main()
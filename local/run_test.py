@@ -23,8 +23,9 @@ class EnhancedTestLauncher:
         """Start the enhanced PDC server"""
         print("🏭 Starting Enhanced PDC Server...")
         try:
+            # Headless - status lines every few seconds instead of live dashboard through a pipe
             pdc_process = subprocess.Popen([
-                sys.executable, 'server.py'
+                sys.executable, 'server.py', 'headless'
             ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
             self.processes.append(('Enhanced_PDC_Server', pdc_process))
             print("✓ Enhanced PDC Server started")
@@ -79,10 +80,10 @@ class EnhancedTestLauncher:
         def print_output(name, process):
             while self.running and process.poll() is None:
                 try:
+                    # readline blocks until next line - sleeping here only lets the pipe fill up
                     output = process.stdout.readline()
                     if output and output.strip():
                         print(f"[{name}] {output.strip()}")
-                    time.sleep(0.1)
                 except:
                     break
         
@@ -186,7 +187,7 @@ class EnhancedTestLauncher:
         print_local_setup()
         print(f"\n🎯 Testing: {pmu_name.upper()}")
         print(f"🕐 Duration: {duration} seconds") 
-        print("📈 Features: Detailed frame visualization, real-time ML analysis")
+        print("📈 Features: Live PMU status, real-time ML analysis")
         print(f"\n{'='*60}")
 
         # Start enhanced PDC server
@@ -242,7 +243,7 @@ def show_usage():
     print("  🏭 Real database storage (SQLite)")
     print("  🤖 Machine Learning analysis")
     print("  ⚡ Realistic power system events")
-    print("  📊 Detailed frame visualization")
+    print("  📊 Live PDC dashboard (headless under launcher)")
     print("  🔮 Event prediction")
     print("\nUsage:")
     print("  python3 run_enhanced_test.py [mode] [duration]")
@@ -2,23 +2,31 @@
 """
 Enhanced PDC Server with Real Database and Frame Visualization
 """
+import gc
+import select
 import threading
 import json
 import sqlite3
 import pandas as pd
-from datetime import datetime
 from time import time, sleep as time_sleep
 
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'common'))
 
-from comms import PDC_server
-from config import LOCAL_PMU_ID_PORT_MAP, get_pdc_config
+from comms import PDC_server, LocalMulticastPublisher
+from config import LOCAL_PMU_ID_PORT_MAP, get_pdc_config, get_pdc_runtime_config
 
 # Import frame classes from common
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'common'))
-from frame import ConfigFrame2, DataFrame
+from frame import CommonFrame, ConfigFrame2, ConfigRegistry, DataFramePool, FrameError
+from ack import CumulativeAck
+from rate_control import LoadController
+from sequence import SequenceTracker, DUPLICATE
+from concentrator import Concentrator
+from pipeline import Stage, Pipeline, BLOCK
+from dashboard import PmuBoard, Dashboard, CONSOLE_MODES
+from stream_stats import StreamStats
 
 class EnhancedDatabase:
     """Real SQLite database for storing synchrophasor data"""
@@ -99,6 +107,25 @@ class EnhancedDatabase:
         conn.commit()
         conn.close()
     
+    def store_measurements(self, rows):
+        """Store batch of synchrophasor measurements in one transaction"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT INTO measurements (
+                timestamp, pmu_id, pmu_name,
+                va_mag, va_angle, vb_mag, vb_angle, vc_mag, vc_angle,
+                i1_mag, i1_angle, frequency, rocof,
+                analog1, analog2, analog3, digital_status,
+                comm_delay_us, frame_size_bytes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        
+        conn.commit()
+        conn.close()
+        return len(rows)
+    
     def store_event(self, timestamp, event_type, pmu_id, severity, description, ml_prediction=None):
         """Store system event for ML analysis"""
         conn = sqlite3.connect(self.db_name)
@@ -112,6 +139,20 @@ class EnhancedDatabase:
         conn.commit()
         conn.close()
     
+    def store_events(self, events):
+        """Store batch of system events in one transaction - rows in store_event argument order"""
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT INTO system_events (timestamp, event_type, pmu_id, severity, description, ml_prediction)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', events)
+        
+        conn.commit()
+        conn.close()
+        return len(events)
+    
     def get_recent_data(self, limit=100):
         """Get recent measurements for ML analysis"""
         conn = sqlite3.connect(self.db_name)
@@ -175,122 +216,553 @@ class FrameAnalyzer:
         
         return analysis
 
-def display_frame_data(frame, pmu_id, comm_delay, frame_size):
-    """Display detailed frame information"""
-    try:
-        # Extract phasor data
-        phasors = frame.get_phasors(convert2polar=True)
-        freq = frame.get_freq()
-        dfreq = frame.get_dfreq() 
-        analog = frame.get_analog()
-        digital = frame.get_digital()
-        stat = frame.get_stat()
-        
-        print(f"\n{'='*60}")
-        print(f"PMU {pmu_id} - {datetime.now().strftime('%H:%M:%S.%f')[:-3]}")
-        print(f"{'='*60}")
-        
-        # Phasor data (Voltage and Current)
-        print("🔌 PHASOR MEASUREMENTS:")
-        phasor_names = ["VA", "VB", "VC", "I1"]
-        for i, (mag, angle) in enumerate(phasors):
-            if i < 3:  # Voltage phasors
-                unit = "V"
-                scaled_mag = mag / 120  # Account for realistic scaling in client (mag*12/10)
-            else:  # Current phasors
-                unit = "A"
-                scaled_mag = mag / 120  # Account for realistic scaling in client
-            print(f"  {phasor_names[i]}: {scaled_mag:.3f} k{unit} ∠ {angle:.1f}°")
-        
-        # Frequency measurements
-        print(f"\n⚡ FREQUENCY MEASUREMENTS:")
-        print(f"  Frequency: {freq/40:.3f} Hz")  # Account for realistic scaling in client (freq*4/10)
-        print(f"  ROCOF: {dfreq/10:.3f} Hz/s")  # Account for realistic scaling in client
-        
-        # Analog measurements
-        print(f"\n📊 ANALOG MEASUREMENTS:")
-        analog_names = ["Power", "RMS", "Peak"]
-        for i, value in enumerate(analog):
-            print(f"  {analog_names[i]}: {value}")
-        
-        # Digital status
-        print(f"\n🔘 DIGITAL STATUS:")
-        print(f"  Status Word: 0x{digital[0]:04X}")
-        print(f"  Binary: {digital[0]:016b}")
-        
-        # System status
-        print(f"\n📡 SYSTEM STATUS:")
-        print(f"  Measurement: {stat[0]}")
-        print(f"  Time Sync: {'OK' if stat[1] else 'ERROR'}")
-        print(f"  Time Quality: {stat[7]}")
-        
-        # Communication metrics
-        print(f"\n🌐 COMMUNICATION:")
-        print(f"  Delay: {comm_delay} μs")
-        print(f"  Frame Size: {frame_size} bytes")
-        
-        return {
-            'va_mag': phasors[0][0]/120, 'va_angle': phasors[0][1],
-            'vb_mag': phasors[1][0]/120, 'vb_angle': phasors[1][1],
-            'vc_mag': phasors[2][0]/120, 'vc_angle': phasors[2][1],
-            'i1_mag': phasors[3][0]/120, 'i1_angle': phasors[3][1],
-            'frequency': freq/40,  # Account for realistic scaling in client
-            'rocof': dfreq/10,     # Account for realistic scaling in client
-            'analog1': analog[0], 'analog2': analog[1], 'analog3': analog[2],
-            'digital_status': digital[0]
-        }
-        
-    except Exception as e:
-        print(f"Error displaying frame data: {e}")
-        return {}
-
-def enhanced_data_processing(db, analyzer, frame, pmu_id, comm_delay, frame_size):
-    """Enhanced data processing with ML analysis"""
-    
-    # Display frame data
-    frame_data = display_frame_data(frame, pmu_id, comm_delay, frame_size)
-    
-    if frame_data:
-        # Store in database
-        db_data = (
-            time(), pmu_id, f"PMU_{pmu_id}",
-            frame_data['va_mag'], frame_data['va_angle'],
-            frame_data['vb_mag'], frame_data['vb_angle'], 
-            frame_data['vc_mag'], frame_data['vc_angle'],
-            frame_data['i1_mag'], frame_data['i1_angle'],
-            frame_data['frequency'], frame_data['rocof'],
-            frame_data['analog1'], frame_data['analog2'], frame_data['analog3'],
-            frame_data['digital_status'],
-            comm_delay, frame_size
+def extract_frame_data(frame):
+    """Extract scaled measurements of local PMU layout from frame"""
+    phasors = frame.get_phasors(convert2polar=True)
+    freq = frame.get_freq()
+    dfreq = frame.get_dfreq()
+    analog = frame.get_analog()
+    digital = frame.get_digital()
+    
+    return {
+        'va_mag': phasors[0][0]/120, 'va_angle': phasors[0][1],
+        'vb_mag': phasors[1][0]/120, 'vb_angle': phasors[1][1],
+        'vc_mag': phasors[2][0]/120, 'vc_angle': phasors[2][1],
+        'i1_mag': phasors[3][0]/120, 'i1_angle': phasors[3][1],
+        'frequency': freq/40,  # Account for realistic scaling in client
+        'rocof': dfreq/10,     # Account for realistic scaling in client
+        'analog1': analog[0], 'analog2': analog[1], 'analog3': analog[2],
+        'digital_status': digital[0]
+    }
+
+def measurement_row(frame_data, pmu_id, comm_delay, frame_size, timestamp=None):
+    """Database row of measurements table"""
+    return (
+        time() if timestamp is None else timestamp, pmu_id, f"PMU_{pmu_id}",
+        frame_data['va_mag'], frame_data['va_angle'],
+        frame_data['vb_mag'], frame_data['vb_angle'], 
+        frame_data['vc_mag'], frame_data['vc_angle'],
+        frame_data['i1_mag'], frame_data['i1_angle'],
+        frame_data['frequency'], frame_data['rocof'],
+        frame_data['analog1'], frame_data['analog2'], frame_data['analog3'],
+        frame_data['digital_status'],
+        comm_delay, frame_size
+    )
+
+def sample_config():
+    """IEEE configuration of local PMU clients"""
+    return ConfigFrame2(1000, 1000000, 1, "Station A", 7734, (False, False, True, False),
+                        4, 3, 1,
+                        ["VA", "VB", "VC", "I1", "ANALOG1", "ANALOG2", "ANALOG3",
+                         "BREAKER 1 STATUS", "BREAKER 2 STATUS", "BREAKER 3 STATUS",
+                         "BREAKER 4 STATUS", "BREAKER 5 STATUS", "BREAKER 6 STATUS",
+                         "BREAKER 7 STATUS", "BREAKER 8 STATUS", "BREAKER 9 STATUS",
+                         "BREAKER A STATUS", "BREAKER B STATUS", "BREAKER C STATUS",
+                         "BREAKER D STATUS", "BREAKER E STATUS", "BREAKER F STATUS",
+                         "BREAKER G STATUS"],
+                        [(915527, "v"), (915527, "v"), (915527, "v"), (45776, "i")],
+                        [(1, "pow"), (1, "rms"), (1, "peak")], [(0x0000, 0xffff)],
+                        60, 22, 30)
+
+def make_acker(runtime_config):
+    """Cumulative ACK generator, None when PMUs expect text ACK for every frame"""
+    if runtime_config['ack_mode'] != 'cumulative':
+        return None
+    return CumulativeAck(runtime_config['ack_every_frames'], runtime_config['ack_every_ms'])
+
+def socket_stats_line(socket_stats):
+    """Kernel side of ingest - frames lost here never reached PDC, frames lost on network never reached kernel"""
+    def count(value):
+        return 'n/a' if value is None else value
+    
+    return (f"🧮 Kernel: rcvbuf {socket_stats['rcvbuf'] // 1024} KiB | "
+            f"drops {count(socket_stats['rxq_ovfl_drops'])} (SO_RXQ_OVFL) / "
+            f"{count(socket_stats['proc_drops'])} (/proc/net/udp) | "
+            f"rx queue {count(socket_stats['rx_queue_bytes'])} B")
+
+def make_load_controller(runtime_config):
+    """Command frame backpressure, None when PDC never throttles PMUs"""
+    if not runtime_config['rate_control']:
+        return None
+    return LoadController(runtime_config['rate_steps'], runtime_config['high_lateness_ms'],
+                          runtime_config['low_lateness_ms'], runtime_config['high_queue_depth'],
+                          runtime_config['low_queue_depth'], runtime_config['control_hold_sec'],
+                          runtime_config['shed_fraction'])
+
+def make_tracker(runtime_config, default_cfg):
+    """Per-PMU loss/duplicate/reorder tracking, PMUs without CFG-2 are tracked on grid of `default_cfg`"""
+    return SequenceTracker(runtime_config['sequence_window'], runtime_config['max_gap_sec'],
+                           data_rate=default_cfg.get_data_rate(), time_base=default_cfg.get_time_base())
+
+def sequence_stats_line(sequence_stats):
+    """Stream health - what reached PDC compared to reporting grid of every PMU"""
+    totals, interval = sequence_stats['totals'], sequence_stats['interval']
+    return (f"🩺 Streams: {sequence_stats['streams']} | lost {totals['lost']} ({totals['loss_pct']}%, "
+            f"last interval {interval['loss_pct']}%) | duplicates {totals['duplicate']} | "
+            f"reordered {totals['reordered']} | late {totals['late']} | outages {totals['outages']}")
+
+def make_concentrator(runtime_config):
+    """Timestamp alignment of PMU streams, None when PDC forwards frames as received"""
+    if not runtime_config['concentrator']:
+        return None
+    return Concentrator(runtime_config['concentrator_id_code'], runtime_config['concentrator_rate'],
+                        runtime_config['wait_ms'], runtime_config['max_slots'], runtime_config['late_policy'])
+
+def concentrator_stats_line(concentrator_stats):
+    """Alignment - how many concentrated frames waited out missing PMUs"""
+    return (f"🧷 Concentrator: {concentrator_stats['members']} PMUs | {concentrator_stats['emitted']} emitted "
+            f"({concentrator_stats['complete']} complete, {concentrator_stats['partial']} timed out, "
+            f"{concentrator_stats['forced']} forced) | {concentrator_stats['absent']} absent | "
+            f"{concentrator_stats['late']} late | {concentrator_stats['open_slots']} slots open")
+
+def add_member(concentrator, publisher, cfg):
+    """Add PMU to concentrated stream, slots open in old layout are published first"""
+    flushed = concentrator.set_member(cfg)
+    if flushed is None:
+        print(f"⚠️  PMU {cfg.get_id_code()} not concentrated - concentrated frame would exceed 65535 bytes")
+        return
+    publish_frames(publisher, flushed)
+    if publisher is not None:
+        publisher.publish_config(concentrator.pdc_id_code, concentrator.config_bytes)
+
+def publish_frames(publisher, frames):
+    """Multicast concentrated frames"""
+    if publisher is not None:
+        for frame in frames:
+            publisher.publish(frame)
+
+def make_publisher(runtime_config):
+    """Multicast fan-out to downstream consumers, None when no group is configured"""
+    if runtime_config['multicast_group'] is None:
+        return None
+    return LocalMulticastPublisher(runtime_config['multicast_group'], runtime_config['multicast_port'],
+                                   runtime_config['multicast_ttl'], runtime_config['multicast_interface'])
+
+def frame_lateness(frame, server_ct):
+    """Seconds between frame timestamp and its processing"""
+    return server_ct - frame.get_soc() - frame.get_frasec()[0] / frame.cfg.get_time_base()
+
+def send_commands(pdc, controller, depth, socket_stats=None):
+    """Feed queue fill (0..1) to load controller and send commands it decided"""
+    kernel_drops = None
+    if socket_stats is not None:
+        kernel_drops = socket_stats['rxq_ovfl_drops'] or socket_stats['proc_drops']
+    controller.on_batch(depth, kernel_drops)
+    
+    for addr_of_client, command in controller.commands():
+        pdc.send_to(command, *addr_of_client)
+
+def ack_payload(acker, frame, addr_of_client, packet_count):
+    """Response to decoded data frame, None while cumulative ACK is not due"""
+    if acker is None:
+        return f"ACK_{packet_count}".encode()
+    return acker.on_frame(frame.get_id_code(), frame.get_soc(), frame.get_frasec()[0], addr_of_client)
+
+def enhanced_data_processing(db, analyzer, board, frame_data, pmu_id, comm_delay):
+    """ML analysis of decoded frame - anomalies are stored as events, console shows them from board"""
+    
+    # Analyze for anomalies
+    analysis = analyzer.analyze_frame(frame_data, pmu_id, comm_delay)
+    
+    # Store anomaly events
+    for anomaly in analysis['anomalies']:
+        db.store_event(
+            analysis['timestamp'], 
+            anomaly['type'], 
+            pmu_id, 
+            anomaly['severity'],
+            anomaly['description'],
+            analysis['ml_score']
         )
-        db.store_measurement(db_data)
+    
+    # Anomaly counts for dashboard - frames, rates and latencies are recorded by decode stage
+    board.on_anomalies(pmu_id, analysis['anomalies'])
+
+STREAM_STATS_FIELDS = ('frequency', 'comm_delay')  # Running statistics per PMU
+
+def make_dashboard(runtime_config, board, status_lines, stream_stats=None):
+    """Live dashboard, or status lines only at slow interval in headless mode"""
+    if runtime_config['console'] == 'headless':
+        return Dashboard(board, status_lines, runtime_config['headless_stats_sec'], headless=True)
+    return Dashboard(board, status_lines, 1.0 / runtime_config['dashboard_refresh_hz'],
+                     runtime_config['dashboard_rows'], stream_stats=stream_stats)
+
+def stream_stats_line(stream_stats):
+    """Frequency and delay trend over all PMUs - lifetime mean/σ, recent level (EWMA) and extremes"""
+    freq, delay = stream_stats['frequency'], stream_stats['comm_delay']
+    return (f"📊 Frequency: EWMA {freq['ewma']:.3f} Hz | mean {freq['mean']:.3f} Hz (σ={freq['std']:.4f}) | "
+            f"min {freq['min']:.3f} max {freq['max']:.3f} | Comm Delay: EWMA {delay['ewma']:.1f} μs | "
+            f"mean {delay['mean']:.1f} μs (σ={delay['std']:.1f}) | max {delay['max']} μs")
+
+def make_stage(runtime_config, name, handler, batch=64, idle_sec=0.5):
+    """Stage with queue capacity and full-queue policy from runtime config"""
+    maxsize, policy = runtime_config['stage_queues'][name]
+    return Stage(name, handler, maxsize, policy, batch, idle_sec)
+
+def pipeline_stats_line(pipeline_stats):
+    """Stage queues - depth now / capacity, peak depth and items given up by queue policy"""
+    stages = []
+    for stage in pipeline_stats:
+        line = (f"{stage['name']} {stage['depth']}/{stage['maxsize']} (peak {stage['max_depth']}, "
+                f"{stage['dropped']} dropped")
+        if stage['blocked']:
+            line += f", blocked {stage['blocked_sec']} s"
+        if stage['errors']:
+            line += f", {stage['errors']} errors - {stage['last_error']}"
+        stages.append(line + ")")
+    return "🧵 Stages: " + " | ".join(stages)
+
+class StagePublisher:
+    """Publisher seen by decode and align stages - frames are queued, publish stage sends them"""
+    
+    def __init__(self, stage):
+        self.stage = stage
+    
+    def publish(self, payload):
+        self.stage.put((None, payload))
+    
+    def publish_config(self, pmu_id, payload):
+        self.stage.put((pmu_id, payload))
+
+class StagedPdc:
+    """Single-process PDC split into stages: receive -> decode -> align -> store -> analyze -> publish
+    
+    Receive (caller's thread) only copies datagrams into decode queue. Decode owns registry,
+    frame pool, tracker, ACKs and load controller; align owns concentrator; store, analyze and
+    publish own database writes, console and multicast socket. Stages exchange plain data, so
+    slow commit or burst of anomalies fills its own queue instead of delaying socket reads.
+    """
+    
+    def __init__(self, pdc, db, analyzer, registry, runtime_config):
+        self.pdc = pdc
+        self.db = db
+        self.analyzer = analyzer
+        self.registry = registry
         
-        # Analyze for anomalies
-        analysis = analyzer.analyze_frame(frame_data, pmu_id, comm_delay)
+        # Decoded frames are refilled in place instead of allocated per datagram
+        self.frame_pool = DataFramePool(registry, runtime_config['frame_pool_size'])
+        self.acker = make_acker(runtime_config)
+        self.controller = make_load_controller(runtime_config)
+        self.publisher = make_publisher(runtime_config)
+        self.tracker = make_tracker(runtime_config, registry.default_cfg)
+        self.concentrator = make_concentrator(runtime_config)
+        self.stream_stats = StreamStats(STREAM_STATS_FIELDS, runtime_config['stats_ewma_alpha'])
         
-        # Display anomalies
-        if analysis['anomalies']:
-            print(f"\n⚠️  ANOMALIES DETECTED:")
-            for anomaly in analysis['anomalies']:
-                print(f"  🚨 {anomaly['type'].upper()}: {anomaly['description']}")
+        self.packet_count = 0
+        self.batch_fill = 0.0  # Fill of last receive batch, written by receive thread
+        self.errors = 0        # Datagrams which failed to decode, shown in status lines instead of per frame
+        self.last_error = None
+        
+        # Console reads in-memory state at fixed refresh, never per frame
+        self.board = PmuBoard()
+        self.dashboard = make_dashboard(runtime_config, self.board, self.status_lines, self.stream_stats)
+        
+        stages = [make_stage(runtime_config, 'decode', self.decode, idle_sec=0.05)]
+        if self.concentrator is not None:
+            stages.append(make_stage(runtime_config, 'align', self.align, idle_sec=self.concentrator.wait / 2))
+        stages.append(make_stage(runtime_config, 'store', self.store, runtime_config['store_batch_size']))
+        stages.append(make_stage(runtime_config, 'analyze', self.analyze))
+        if self.publisher is not None:
+            stages.append(make_stage(runtime_config, 'publish', self.publish))
+        self.pipeline = Pipeline(stages)
+        
+        # Decode and align stages publish through queue of publish stage
+        self.outbox = StagePublisher(self.pipeline['publish']) if self.publisher is not None else None
+    
+    def start(self):
+        self.pipeline.start()
+        self.dashboard.start()
+    
+    def stop(self):
+        self.pipeline.stop()
+        self.dashboard.stop()
+    
+    def receive(self, batch):
+        """Receive stage - views of receive batch are copied, buffers are reused by next recv"""
+        decode_stage = self.pipeline['decode']
+        server_ct = time()
+        for data_recvd, addr_of_client in batch:
+            decode_stage.put((bytes(data_recvd), addr_of_client, server_ct))
+        self.batch_fill = len(batch) / self.pdc.max_batch
+    
+    def decode(self, items):
+        """Decode stage - frames to measurements, ACKs and PMU commands"""
+        for data_recvd, addr_of_client, server_ct in items:
+            self.packet_count += 1
+            try:
+                self.decode_datagram(data_recvd, addr_of_client, server_ct)
+            except (FrameError, Exception) as e:  # FrameError derives from BaseException
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                if self.acker is None:
+                    error_response = f"ERROR_{self.packet_count}"
+                    self.pdc.send_to(pmu_IP=addr_of_client[0], 
+                                     pmu_port=addr_of_client[1], 
+                                     payload=error_response.encode())
+        
+        # Acknowledge streams which went quiet
+        if self.acker is not None:
+            for addr_of_client, response in self.acker.due():
+                self.pdc.send_to(pmu_IP=addr_of_client[0], pmu_port=addr_of_client[1], payload=response)
+        
+        # Throttle PMUs at the source when socket batches or queues which can't shed load fill up -
+        # full 'drop'/'drop_oldest' queues (analyze, publish) shed by design and are no overload
+        if self.controller is not None:
+            depth = max(self.batch_fill, self.pipeline.max_fill((BLOCK,), ('decode',)))
+            send_commands(self.pdc, self.controller, depth, self.pdc.get_socket_stats())
+    
+    def decode_datagram(self, data_recvd, addr_of_client, server_ct):
+        registry, tracker, controller = self.registry, self.tracker, self.controller
+        
+        # Learn PMU configuration (frame type check also validates CRC)
+        frame_type = CommonFrame.extract_frame_type(data_recvd)
+        if frame_type == "cfg2":
+            pmu_id, cfg_count = registry.register_frame(data_recvd, check_crc=False)
+            cfg = registry.configs[(pmu_id, cfg_count)]
+            tracker.set_config(pmu_id, cfg.get_data_rate(), cfg.get_time_base())
+            print(f"\n🧩 CFG-2 from PMU {pmu_id} (CFG_CNT={cfg_count}, {cfg.get_data_rate()} fps), "
+                  f"{len(registry)} configs known")
+            self.pdc.send_to(pmu_IP=addr_of_client[0], 
+                             pmu_port=addr_of_client[1], 
+                             payload=f"CFG_ACK_{pmu_id}".encode())
+            if controller is not None:
+                controller.on_config(pmu_id, addr_of_client, cfg.get_data_rate())
+            if self.concentrator is not None:
+                self.pipeline['align'].put(cfg)
+            elif self.outbox is not None:
+                self.outbox.publish_config(pmu_id, data_recvd)
+            return
+        
+        # Place frame on reporting grid of its PMU, duplicates are dropped before decode
+        if frame_type == "data":
+            pmu_id, arrival = tracker.classify(data_recvd)
+            if arrival is DUPLICATE:
+                return
+            if self.concentrator is not None:
+                self.pipeline['align'].put(data_recvd)
+        
+        # Parse IEEE frame
+        frame = self.frame_pool.decode(data_recvd, check_crc=False)
+        try:
+            FRASEC_server = int((server_ct - int(server_ct)) * (10**6))
+            pmu_id = frame.get_id_code()
+            
+            # Calculate metrics
+            comm_delay = FRASEC_server - frame.get_frasec()[0]
+            frame_size = len(data_recvd)
+            
+            # Downstream stages get plain data, pooled frame is reused by next datagram
+            frame_data = extract_frame_data(frame)
+            self.stream_stats.update(pmu_id, (frame_data['frequency'], comm_delay))
+            self.pipeline['store'].put(measurement_row(frame_data, pmu_id, comm_delay, frame_size, server_ct))
+            self.board.on_frame(pmu_id, frame_data, frame.get_stat()[1], comm_delay)
+            self.pipeline['analyze'].put((pmu_id, frame_data, comm_delay))
+            
+            # Send response - cumulative ACK only every N frames / T ms
+            response = ack_payload(self.acker, frame, addr_of_client, self.packet_count)
+            if controller is not None:
+                controller.on_frame(pmu_id, addr_of_client, frame_lateness(frame, server_ct),
+                                    registry.needs_config(pmu_id))
+        finally:
+            self.frame_pool.release(frame)
+        
+        if response:
+            self.pdc.send_to(pmu_IP=addr_of_client[0], 
+                             pmu_port=addr_of_client[1], 
+                             payload=response)
+        
+        # Downstream consumers get the frame from one multicast send
+        if self.outbox is not None and self.concentrator is None:
+            self.outbox.publish(data_recvd)
+
+    
+    def align(self, items):
+        """Align stage - concentrates data frames, configurations change membership"""
+        concentrator = self.concentrator
+        for item in items:
+            if isinstance(item, bytes):
+                publish_frames(self.outbox, concentrator.add(item))
+            else:
+                add_member(concentrator, self.outbox, item)
+        
+        # Slots which waited out missing PMUs
+        publish_frames(self.outbox, concentrator.poll())
+    
+    def store(self, rows):
+        """Store stage - everything queued is written in one transaction"""
+        if rows:
+            self.db.store_measurements(rows)
+    
+    def analyze(self, items):
+        """Analyze stage - anomaly detection, events and dashboard anomaly counts"""
+        for pmu_id, frame_data, comm_delay in items:
+            enhanced_data_processing(self.db, self.analyzer, self.board, frame_data, pmu_id, comm_delay)
+    
+    def publish(self, items):
+        """Publish stage - multicast send, configurations are re-published by publisher"""
+        for pmu_id, payload in items:
+            if pmu_id is None:
+                self.publisher.publish(payload)
+            else:
+                self.publisher.publish_config(pmu_id, payload)
+    
+    def status_lines(self):
+        """Status lines under dashboard - read from dashboard thread, stage state is only sampled"""
+        lines = [socket_stats_line(self.pdc.get_socket_stats()),
+                 sequence_stats_line(self.tracker.get_stats()),
+                 pipeline_stats_line(self.pipeline.get_stats())]
+        if self.controller is not None:
+            control = self.controller.get_stats()
+            lines.append(f"🎛️  Load: level {control['level']} (cap {control['rate_cap']} fps) | "
+                         f"lateness {control['lateness_ms']} ms | queue fill {control['depth']} | "
+                         f"{control['stopped']}/{control['streams']} streams stopped")
+        if self.concentrator is not None:
+            lines.append(concentrator_stats_line(self.concentrator.get_stats()))
+        if self.publisher is not None:
+            lines.append(f"📡 Multicast: {self.publisher.stats['published']} published | "
+                         f"{self.publisher.stats['send_errors']} send errors")
+        if self.last_error is not None:
+            lines.append(f"❌ Frame parsing errors: {self.errors} | last: {self.last_error}")
+        
+        # Trend from running statistics of decode stage - no query over stored rows
+        if len(self.stream_stats):
+            lines.append(stream_stats_line(self.stream_stats.get_stats()))
+        return lines
+
+def ingest_worker(pdc, worker_id, report):
+    """SO_REUSEPORT worker - decodes and stores its share of PMU flows without console dumps"""
+    runtime_config = get_pdc_runtime_config()
+    
+    db = EnhancedDatabase()
+    analyzer = FrameAnalyzer(db)
+    registry = ConfigRegistry(default_cfg=sample_config())
+    frame_pool = DataFramePool(registry, runtime_config['frame_pool_size'])
+    acker = make_acker(runtime_config)
+    controller = make_load_controller(runtime_config)
+    publisher = make_publisher(runtime_config)
+    tracker = make_tracker(runtime_config, registry.default_cfg)
+    
+    stats = {'received': 0, 'decoded': 0, 'configs': 0, 'errors': 0, 'stored': 0, 'anomalies': 0}
+    rows = []
+    events = []  # Anomaly events, stored with rows
+    last_report = time()
+    
+    if runtime_config['gc_freeze']:
+        gc.collect()
+        gc.freeze()
+    
+    while True:
+        # Wake up at least every second to flush rows and report while PMUs are silent
+        ready, _, _ = select.select([pdc.server_sock], [], [], 1.0)
+        server_ct = time()
+        batch = pdc.recv_batch() if ready else ()
+        
+        for data_recvd, addr_of_client in batch:
+            stats['received'] += 1
+            server_ct = time()
+            FRASEC_server = int((server_ct - int(server_ct)) * (10**6))
+            
+            try:
+                frame_type = CommonFrame.extract_frame_type(data_recvd)
+                if frame_type == "cfg2":
+                    pmu_id, cfg_count = registry.register_frame(data_recvd, check_crc=False)
+                    stats['configs'] += 1
+                    pdc.send_to(f"CFG_ACK_{pmu_id}".encode(), *addr_of_client)
+                    cfg = registry.configs[(pmu_id, cfg_count)]
+                    tracker.set_config(pmu_id, cfg.get_data_rate(), cfg.get_time_base())
+                    if controller is not None:
+                        controller.on_config(pmu_id, addr_of_client, cfg.get_data_rate())
+                    if publisher is not None:
+                        publisher.publish_config(pmu_id, data_recvd)
+                    continue
+                
+                # Duplicates are dropped before decode
+                if frame_type == "data" and tracker.classify(data_recvd)[1] is DUPLICATE:
+                    continue
                 
-                # Store anomaly event
-                db.store_event(
-                    analysis['timestamp'], 
-                    anomaly['type'], 
-                    pmu_id, 
-                    anomaly['severity'],
-                    anomaly['description'],
-                    analysis['ml_score']
-                )
-        
-        # ML Risk Assessment
-        if analysis['ml_score'] > 0:
-            print(f"\n🤖 ML RISK SCORE: {analysis['ml_score']:.2f}/5.0")
-            if analysis['ml_score'] > 1.0:
-                print("  📋 RECOMMENDATION: Increase monitoring frequency")
-            if analysis['ml_score'] > 2.0:
-                print("  📋 RECOMMENDATION: Check equipment status")
+                frame = frame_pool.decode(data_recvd, check_crc=False)
+                try:
+                    pmu_id = frame.get_id_code()
+                    comm_delay = FRASEC_server - frame.get_frasec()[0]
+                    frame_data = extract_frame_data(frame)
+                    response = ack_payload(acker, frame, addr_of_client, stats['received'])
+                    if controller is not None:
+                        controller.on_frame(pmu_id, addr_of_client, frame_lateness(frame, server_ct),
+                                            registry.needs_config(pmu_id))
+                finally:
+                    frame_pool.release(frame)
+            except (FrameError, Exception):
+                stats['errors'] += 1
+                if acker is None:
+                    pdc.send_to(f"ERROR_{stats['received']}".encode(), *addr_of_client)
+                continue
+            
+            stats['decoded'] += 1
+            if response:
+                pdc.send_to(response, *addr_of_client)
+            if publisher is not None:
+                publisher.publish(data_recvd)
+            
+            rows.append(measurement_row(frame_data, pmu_id, comm_delay, len(data_recvd), server_ct))
+            analysis = analyzer.analyze_frame(frame_data, pmu_id, comm_delay)
+            stats['anomalies'] += len(analysis['anomalies'])
+            for anomaly in analysis['anomalies']:
+                events.append((analysis['timestamp'], anomaly['type'], pmu_id, anomaly['severity'],
+                               anomaly['description'], analysis['ml_score']))
+        
+        if len(rows) >= runtime_config['worker_batch_size'] or (rows and server_ct - last_report >= 1.0):
+            stats['stored'] += db.store_measurements(rows)
+            rows = []
+            if events:
+                db.store_events(events)
+                events = []
+        
+        if acker is not None:
+            for addr_of_client, response in acker.due():
+                pdc.send_to(response, *addr_of_client)
+        
+        if controller is not None:
+            send_commands(pdc, controller, len(batch) / pdc.max_batch, pdc.get_socket_stats())
+        
+        if server_ct - last_report >= 1.0:
+            last_report = server_ct
+            socket_stats = pdc.get_socket_stats()
+            stats['kernel_drops'] = socket_stats['rxq_ovfl_drops'] or socket_stats['proc_drops'] or 0
+            for key in ('lost', 'duplicate', 'reordered', 'late', 'outages'):
+                stats[key] = tracker.totals[key]
+            report(stats)
+
+def run_workers(num_workers, pdc_config):
+    """Coordinator - spawns ingest workers and prints merged statistics"""
+    runtime_config = get_pdc_runtime_config()
+    coordinator = PDC_server.spawn_workers(num_workers, ingest_worker,
+                                           ip_server_is_binding=pdc_config['ip'],
+                                           port_opening=pdc_config['port'],
+                                           buffer_size=1024,
+                                           rcvbuf=runtime_config['rcvbuf'],
+                                           sndbuf=runtime_config['sndbuf'],
+                                           drop_telemetry=runtime_config['drop_telemetry'])
+    try:
+        while True:
+            time_sleep(5.0)
+            coordinator.poll()
+            stats = coordinator.merged_stats()
+            if stats['workers_alive'] < num_workers:
+                print(f"⚠️  Only {stats['workers_alive']}/{num_workers} workers alive")
+            print(f"\n📈 STATISTICS ({stats['workers_reporting']} workers): {stats.get('received', 0)} received | "
+                  f"{stats.get('decoded', 0)} decoded | {stats.get('errors', 0)} errors | "
+                  f"{stats.get('stored', 0)} stored | {stats.get('anomalies', 0)} anomalies | "
+                  f"{stats.get('kernel_drops', 0)} kernel drops")
+            print(f"  🩺 Streams: lost {stats.get('lost', 0)} | duplicates {stats.get('duplicate', 0)} | "
+                  f"reordered {stats.get('reordered', 0)} | late {stats.get('late', 0)} | "
+                  f"outages {stats.get('outages', 0)}")
+            for worker_id, worker in sorted(coordinator.worker_stats.items()):
+                print(f"  👷 Worker {worker_id}: {worker['decoded']} decoded, {worker['stored']} stored, "
+                      f"{worker.get('kernel_drops', 0)} kernel drops")
+    except KeyboardInterrupt:
+        coordinator.stop()
+        stats = coordinator.merged_stats()
+        print(f"\n\n🛑 PDC workers stopped. Processed {stats.get('decoded', 0)} frames.")
 
 def main():
     """Enhanced PDC server main function"""
@@ -298,13 +770,26 @@ def main():
     print("🏭 Enhanced PDC Server with ML Analysis")
     print("="*50)
     
+    # Get PDC configuration
+    pdc_config = get_pdc_config()
+    runtime_config = get_pdc_runtime_config()
+    
+    # python3 server.py [workers] [dashboard|headless] - more than one worker is multi-process ingest
+    num_workers = runtime_config['workers']
+    for arg in sys.argv[1:]:
+        if arg in CONSOLE_MODES:
+            runtime_config['console'] = arg
+        else:
+            num_workers = int(arg)
+    if num_workers > 1:
+        print(f"🔗 Binding {num_workers} workers to: {pdc_config['ip']}:{pdc_config['port']} (SO_REUSEPORT)")
+        run_workers(num_workers, pdc_config)
+        return
+    
     # Initialize components
     db = EnhancedDatabase()
     analyzer = FrameAnalyzer(db)
     
-    # Get PDC configuration
-    pdc_config = get_pdc_config()
-    
     print(f"🔗 Binding to: {pdc_config['ip']}:{pdc_config['port']}")
     print(f"📊 Database: {db.db_name}")
     print(f"🤖 ML Analysis: Enabled")
@@ -314,79 +799,42 @@ def main():
     pdc = PDC_server(
         ip_server_is_binding=pdc_config['ip'],
         port_opening=pdc_config['port'],
-        buffer_size=1024
+        buffer_size=1024,
+        rcvbuf=runtime_config['rcvbuf'],
+        sndbuf=runtime_config['sndbuf'],
+        drop_telemetry=runtime_config['drop_telemetry']
     )
+    print(socket_stats_line(pdc.get_socket_stats()))
     
     # IEEE configuration
-    ieee_cfg2_sample = ConfigFrame2(1000, 1000000, 1, "Station A", 7734, (False, False, True, False),
-                                    4, 3, 1,
-                                    ["VA", "VB", "VC", "I1", "ANALOG1", "ANALOG2", "ANALOG3",
-                                     "BREAKER 1 STATUS", "BREAKER 2 STATUS", "BREAKER 3 STATUS",
-                                     "BREAKER 4 STATUS", "BREAKER 5 STATUS", "BREAKER 6 STATUS",
-                                     "BREAKER 7 STATUS", "BREAKER 8 STATUS", "BREAKER 9 STATUS",
-                                     "BREAKER A STATUS", "BREAKER B STATUS", "BREAKER C STATUS",
-                                     "BREAKER D STATUS", "BREAKER E STATUS", "BREAKER F STATUS",
-                                     "BREAKER G STATUS"],
-                                    [(915527, "v"), (915527, "v"), (915527, "v"), (45776, "i")],
-                                    [(1, "pow"), (1, "rms"), (1, "peak")], [(0x0000, 0xffff)],
-                                    60, 22, 30)
+    ieee_cfg2_sample = sample_config()
+    
+    # Configurations learned from CFG-2 frames, sample config decodes PMUs which never sent one
+    registry = ConfigRegistry(default_cfg=ieee_cfg2_sample)
     
+    # Decode, align, store, analyze and publish run in stage threads behind bounded queues
+    staged = StagedPdc(pdc, db, analyzer, registry, runtime_config)
+
+    if runtime_config['gc_freeze']:
+        # Long-lived objects (config, decoder, pool, db) are not scanned by GC in hot loop
+        gc.collect()
+        gc.freeze()
+        print(f"🧊 GC: {gc.get_freeze_count()} startup objects frozen")
+
     print("\n🎯 Waiting for synchrophasor data...")
     
-    packet_count = 0
+    staged.start()
     try:
         while True:
-            # Receive data
-            data_recvd, addr_of_client = pdc.recv()
-            packet_count += 1
-            
-            # Server timestamp
-            server_ct = time()
-            SOC_server = int(server_ct)
-            FRASEC_server = int((server_ct - SOC_server) * (10**6))
-            
-            try:
-                # Parse IEEE frame
-                frame = DataFrame.convert2frame(data_recvd, ieee_cfg2_sample)
-                FRASEC_Client = frame.get_frasec()[0]
-                pmu_id = frame.get_id_code()
-                
-                # Calculate metrics
-                comm_delay = FRASEC_server - FRASEC_Client
-                frame_size = len(data_recvd)
-                
-                # Enhanced processing with ML
-                enhanced_data_processing(db, analyzer, frame, pmu_id, comm_delay, frame_size)
-                
-                # Send response
-                response = f"ACK_{packet_count}"
-                pdc.send_to(pmu_IP=addr_of_client[0], 
-                          pmu_port=addr_of_client[1], 
-                          payload=response.encode())
-                
-                # Show statistics every 10 packets
-                if packet_count % 10 == 0:
-                    print(f"\n📈 STATISTICS: {packet_count} frames processed")
+            # Receive stage - every queued datagram in one wakeup goes to decode queue, stage timers
+            # (ACKs, commands, concentrator timeouts) run in stage threads
+            ready, _, _ = select.select([pdc.server_sock], [], [], 1.0)
+            if ready:
+                staged.receive(pdc.recv_batch())
                     
-                    # Get recent data for trend analysis
-                    recent_data = db.get_recent_data(limit=10)
-                    if not recent_data.empty:
-                        avg_freq = recent_data['frequency'].mean()
-                        freq_std = recent_data['frequency'].std()
-                        avg_delay = recent_data['comm_delay_us'].mean()
-                        
-                        print(f"  📊 Avg Frequency: {avg_freq:.3f} Hz (σ={freq_std:.4f})")
-                        print(f"  📊 Avg Comm Delay: {avg_delay:.1f} μs")
-                
-            except Exception as e:
-                print(f"\n❌ Frame parsing error: {e}")
-                error_response = f"ERROR_{packet_count}"
-                pdc.send_to(pmu_IP=addr_of_client[0], 
-                          pmu_port=addr_of_client[1], 
-                          payload=error_response.encode())
-                
     except KeyboardInterrupt:
-        print(f"\n\n🛑 PDC Server stopped. Processed {packet_count} frames.")
+        staged.stop()
+        print(f"\n\n🛑 PDC Server stopped. Processed {staged.packet_count} frames.")
         print(f"💾 Data saved to: {db.db_name}")
 
 if __name__ == "__main__":